@@ -0,0 +1,74 @@
+"""Authentication backend whose permission sets are cached across requests.
+
+``ModelBackend`` keeps the user's permissions on the user object, so every
+request pays for the user and group permission queries again. Here the set is
+also stored in the cache under a global permissions version, which is replaced
+whenever a group, a permission or a user's groups or permissions change.
+
+The version only reaches every gunicorn worker through a shared backend
+(file-based, Redis, Memcached). With the per-process ``LocMemCache`` a
+revoked permission could outlive the change in other workers, so the backend
+then behaves exactly like ``ModelBackend``.
+"""
+
+from __future__ import annotations
+
+import time
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+PERMISSIONS_VERSION_KEY = "auth:permissions:version"
+DEFAULT_TIMEOUT = 3600
+
+
+def get_permissions_version() -> int:
+    version = cache.get(PERMISSIONS_VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(PERMISSIONS_VERSION_KEY, version, timeout=None):
+            version = cache.get(PERMISSIONS_VERSION_KEY, version)
+    return version
+
+
+def invalidate_permissions() -> None:
+    """Drop every cached permission set, now and again after commit."""
+
+    def _bump() -> None:
+        cache.set(PERMISSIONS_VERSION_KEY, time.time_ns(), timeout=None)
+
+    _bump()
+    transaction.on_commit(_bump)
+
+
+def is_cache_shared() -> bool:
+    """Whether the default cache is seen by every process."""
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], LocMemCache)
+
+
+class CachedPermissionBackend(ModelBackend):
+    def get_all_permissions(self, user_obj, obj=None):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        if not is_cache_shared():
+            return super().get_all_permissions(user_obj)
+        if not hasattr(user_obj, "_perm_cache"):
+            # The flags are part of the key: ModelBackend grants every
+            # permission to superusers, and demoting one is a plain user save.
+            key = (
+                f"auth:permissions:{user_obj.pk}:{int(user_obj.is_superuser)}"
+                f"{int(user_obj.is_active)}:{get_permissions_version()}"
+            )
+            permissions = cache.get(key)
+            if permissions is None:
+                permissions = super().get_all_permissions(user_obj)
+                cache.set(
+                    key,
+                    permissions,
+                    timeout=getattr(settings, "PERMISSION_CACHE_TIMEOUT", DEFAULT_TIMEOUT),
+                )
+            user_obj._perm_cache = permissions
+        return user_obj._perm_cache
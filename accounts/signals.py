@@ -0,0 +1,46 @@
+"""Invalidate cached permission sets when groups or permissions change."""
+
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from .backends import invalidate_permissions
+
+
+def _invalidate_permissions(sender, action="post_save", **kwargs) -> None:
+    # m2m_changed also fires before the change (pre_add, pre_remove, ...).
+    if action.startswith("post_"):
+        invalidate_permissions()
+
+
+def _invalidate_for_user(sender, created=True, **kwargs) -> None:
+    # A new user may reuse the primary key of a deleted one.
+    if created:
+        invalidate_permissions()
+
+
+def connect_signals() -> None:
+    User = get_user_model()
+    post_save.connect(_invalidate_for_user, sender=User, dispatch_uid="invalidate-permissions-new-user")
+    post_delete.connect(
+        _invalidate_for_user, sender=User, dispatch_uid="invalidate-permissions-deleted-user"
+    )
+    for through in (User.groups.through, User.user_permissions.through, Group.permissions.through):
+        m2m_changed.connect(
+            _invalidate_permissions,
+            sender=through,
+            dispatch_uid=f"invalidate-permissions-{through.__name__}",
+        )
+    for model in (Group, Permission):
+        post_save.connect(
+            _invalidate_permissions,
+            sender=model,
+            dispatch_uid=f"invalidate-permissions-save-{model.__name__}",
+        )
+        post_delete.connect(
+            _invalidate_permissions,
+            sender=model,
+            dispatch_uid=f"invalidate-permissions-delete-{model.__name__}",
+        )
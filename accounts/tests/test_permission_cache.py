@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+
+class CachedPermissionBackendTests(TestCase):
+    def setUp(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        settings_override = override_settings(
+            CACHES={
+                "default": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": cache_dir.name,
+                }
+            }
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.group = Group.objects.create(name="Assinante")
+        self.group.permissions.set(
+            Permission.objects.filter(
+                content_type__app_label="apiary", codename__in=["view_hive", "change_hive"]
+            )
+        )
+        self.user = get_user_model().objects.create_user(
+            username="assinante", password="testpass123", is_staff=True
+        )
+        self.user.groups.add(self.group)
+
+    def _fresh_user(self):
+        return get_user_model().objects.get(pk=self.user.pk)
+
+    def _permission_queries(self, url) -> int:
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return sum("auth_permission" in query["sql"] for query in queries.captured_queries)
+
+    def test_admin_pages_reuse_the_cached_permissions(self):
+        self.client.force_login(self.user)
+        self.assertEqual(self._permission_queries(reverse("admin:index")), 2)
+        self.assertEqual(self._permission_queries(reverse("admin:index")), 0)
+        self.assertEqual(self._permission_queries(reverse("admin:apiary_hive_changelist")), 0)
+
+    def test_group_and_user_changes_invalidate_the_cache(self):
+        self.assertTrue(self._fresh_user().has_perm("apiary.change_hive"))
+
+        self.group.permissions.remove(Permission.objects.get(codename="change_hive"))
+        self.assertFalse(self._fresh_user().has_perm("apiary.change_hive"))
+
+        self.user.user_permissions.add(Permission.objects.get(codename="add_hive"))
+        self.assertTrue(self._fresh_user().has_perm("apiary.add_hive"))
+
+        self.user.groups.clear()
+        self.assertEqual(self._fresh_user().get_all_permissions(), {"apiary.add_hive"})
+
+    def test_demoted_superuser_loses_permissions(self):
+        self.user.is_superuser = True
+        self.user.save()
+        self.assertTrue(self._fresh_user().has_perm("auth.change_user"))
+
+        self.user.is_superuser = False
+        self.user.save()
+        self.assertFalse(self._fresh_user().has_perm("auth.change_user"))
+        self.assertTrue(self._fresh_user().has_perm("apiary.change_hive"))
+
+    def test_local_memory_cache_keeps_model_backend_behaviour(self):
+        backend = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+        with override_settings(CACHES=backend):
+            self.client.force_login(self.user)
+            self.assertEqual(self._permission_queries(reverse("admin:index")), 2)
+            self.assertEqual(self._permission_queries(reverse("admin:index")), 2)
+
+    def test_sessions_opened_with_model_backend_stay_valid(self):
+        self.client.force_login(
+            self.user, backend="django.contrib.auth.backends.ModelBackend"
+        )
+        self.assertEqual(self._permission_queries(reverse("admin:index")), 2)
+        self.assertEqual(self._permission_queries(reverse("admin:index")), 0)
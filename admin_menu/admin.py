@@ -5,6 +5,7 @@ from __future__ import annotations
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
 
+from .cache import invalidate_menu
 from .models import MenuConfig, MenuItem
 
 
@@ -65,3 +66,5 @@ class MenuConfigAdmin(admin.ModelAdmin):
             MenuConfig.objects.filter(scope=config.scope, active=True).exclude(pk=config.pk).update(active=False)
             config.active = True
             config.save(update_fields=["active", "updated_at"])
+        # The deactivating update() above sends no signals.
+        invalidate_menu()
@@ -0,0 +1,35 @@
+"""Version of the active admin menu, shared by every process.
+
+``ColmeiaAdminSite`` keeps the compiled menu in memory together with the
+version it was built for. Saving or deleting a ``MenuConfig`` or ``MenuItem``
+replaces the version stored in ``MenuVersion``, in the same transaction as
+the change, and each process rebuilds its menu the next time it reads a
+version it does not hold. The database is used instead of the cache because
+the default ``LocMemCache`` is not shared between gunicorn workers.
+"""
+
+from __future__ import annotations
+
+import time
+
+MENU_VERSION_PK = 1
+
+
+def get_menu_version() -> int:
+    from .models import MenuVersion
+
+    version = (
+        MenuVersion.objects.filter(pk=MENU_VERSION_PK).values_list("version", flat=True).first()
+    )
+    return version or 0
+
+
+def invalidate_menu() -> None:
+    """Drop the compiled menus of every process once the transaction commits."""
+    from .models import MenuVersion
+
+    # A timestamp rather than a counter: a version read inside a transaction
+    # that is rolled back is never handed out again.
+    MenuVersion.objects.update_or_create(
+        pk=MENU_VERSION_PK, defaults={"version": time.time_ns()}
+    )
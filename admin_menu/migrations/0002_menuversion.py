@@ -0,0 +1,30 @@
+# Generated by Django 4.2.16 on 2026-10-17 00:14
+
+from django.db import migrations, models
+
+
+def create_version_row(apps, schema_editor):
+    MenuVersion = apps.get_model("admin_menu", "MenuVersion")
+    MenuVersion.objects.get_or_create(pk=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_menu', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MenuVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveBigIntegerField(default=0, verbose_name='versão')),
+            ],
+            options={
+                'verbose_name': 'versão do menu',
+                'verbose_name_plural': 'versões do menu',
+            },
+        ),
+        migrations.RunPython(create_version_row, migrations.RunPython.noop),
+    ]
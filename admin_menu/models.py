@@ -6,8 +6,11 @@ from django.apps import apps
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
 from django.utils.translation import gettext_lazy as _
 
+from .cache import invalidate_menu
+
 
 class MenuConfig(models.Model):
     """Stores menu configurations that can be enabled per scope."""
@@ -154,3 +157,29 @@ class MenuItem(models.Model):
             return apps.get_model(self.app_label, self.model_name)
         except (LookupError, ValueError):
             return None
+
+
+class MenuVersion(models.Model):
+    """Single row holding the menu version, read by every process to drop stale menus."""
+
+    version = models.PositiveBigIntegerField(default=0, verbose_name=_("versão"))
+
+    class Meta:
+        verbose_name = _("versão do menu")
+        verbose_name_plural = _("versões do menu")
+
+    def __str__(self) -> str:  # pragma: no cover - human readable only
+        return str(self.version)
+
+
+def _invalidate_menu(sender, **kwargs) -> None:
+    invalidate_menu()
+
+
+for _model in (MenuConfig, MenuItem):
+    post_save.connect(
+        _invalidate_menu, sender=_model, dispatch_uid=f"invalidate-menu-save-{_model.__name__}"
+    )
+    post_delete.connect(
+        _invalidate_menu, sender=_model, dispatch_uid=f"invalidate-menu-delete-{_model.__name__}"
+    )
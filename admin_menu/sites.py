@@ -7,173 +7,212 @@ from collections import OrderedDict
 from dataclasses import dataclass
 
 from django.contrib.admin import AdminSite
+from django.contrib.admin.views.autocomplete import AutocompleteJsonView
 from django.core.exceptions import PermissionDenied
 from django.urls import NoReverseMatch, reverse
 from django.utils.text import slugify
 
+from .cache import get_menu_version
 from .models import MenuConfig, MenuItem
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
-class _MenuEntry:
-    app_key: str
-    app_label: str
-    app_name: str
-    model_dict: dict[str, object]
+@dataclass(frozen=True)
+class _CompiledItem:
+    """Request-independent part of a menu entry, resolved once per version."""
+
+    group_key: str
+    group_label: str
+    group_name: str
+    name: str
+    object_name: str
+    url: str
+    model: type | None = None
+    add_url: str | None = None
+    permission_codename: str = ""
+
+
+class ColmeiaAutocompleteJsonView(AutocompleteJsonView):
+    """Autocomplete that also serves users allowed to fill the source form.
+
+    Reference tables such as ``City`` are picked from apiary and creator forms
+    by users that have no view permission on them. The results still come from
+    the remote ``ModelAdmin.get_queryset``, so owner scoping is preserved.
+    """
+
+    def has_perm(self, request, obj=None):
+        if super().has_perm(request, obj=obj):
+            return True
+        source_admin = self.admin_site._registry.get(self.source_field.model)
+        if source_admin is None:
+            return False
+        return source_admin.has_add_permission(request) or source_admin.has_change_permission(
+            request
+        )
 
 
 class ColmeiaAdminSite(AdminSite):
     """Admin site that keeps the default behaviour with a configurable menu."""
 
+    def autocomplete_view(self, request):
+        return ColmeiaAutocompleteJsonView.as_view(admin_site=self)(request)
+
     def get_app_list(self, request):
-        base_app_list = super().get_app_list(request)
         user = getattr(request, "user", None)
         if not user or user.is_anonymous or user.is_superuser:
-            return base_app_list
+            return super().get_app_list(request)
 
         try:
-            config = (
-                MenuConfig.objects.prefetch_related("items")
-                .filter(scope=MenuConfig.Scope.NON_SUPERUSER, active=True)
-                .order_by("-updated_at")
-                .first()
-            )
+            items = self._get_compiled_menu()
         except Exception:  # pragma: no cover - defensive fallback
             logger.exception("Unable to load menu configuration; falling back to default menu.")
-            return base_app_list
+            return super().get_app_list(request)
 
-        if not config:
-            return base_app_list
+        app_list = _MenuBuilder(self, request, items).build() if items else []
+        if not app_list:
+            return super().get_app_list(request)
+        return app_list
 
-        builder = _MenuBuilder(self, request, config)
+    def _get_compiled_menu(self) -> tuple[_CompiledItem, ...]:
+        """Return the active menu, compiled at most once per menu version."""
+        version = get_menu_version()
+        compiled = getattr(self, "_compiled_menu", None)
+        if compiled is not None and compiled[0] == version:
+            return compiled[1]
+
+        config = (
+            MenuConfig.objects.prefetch_related("items")
+            .filter(scope=MenuConfig.Scope.NON_SUPERUSER, active=True)
+            .order_by("-updated_at")
+            .first()
+        )
+        items = _compile_menu(self, config) if config else ()
+        self._compiled_menu = (version, items)
+        return items
+
+
+def _compile_menu(site: ColmeiaAdminSite, config: MenuConfig) -> tuple[_CompiledItem, ...]:
+    compiled = []
+    for item in config.items.all():
         try:
-            app_list = builder.build()
+            entry = _compile_item(site, item)
         except Exception:  # pragma: no cover - defensive fallback
-            logger.exception("Error while building custom admin menu; falling back to default menu.")
-            return base_app_list
+            logger.exception("Error while compiling admin menu item %s; skipping it.", item.pk)
+            continue
+        if entry is not None:
+            compiled.append(entry)
+    return tuple(compiled)
 
-        if not app_list:
-            return base_app_list
-        return app_list
+
+def _compile_item(site: ColmeiaAdminSite, item: MenuItem) -> _CompiledItem | None:
+    if item.item_type == MenuItem.ItemType.MODEL:
+        model = item.get_model()
+        if model is None or model not in site._registry:
+            return None
+        model_meta = model._meta
+        changelist_url = _reverse_or_none(
+            f"admin:{model_meta.app_label}_{model_meta.model_name}_changelist"
+        )
+        if changelist_url is None:
+            return None
+        app_config = model_meta.app_config
+        group_name = item.group_label.strip() if item.group_label else app_config.verbose_name
+        return _CompiledItem(
+            group_key=slugify(group_name) or app_config.label,
+            group_label=app_config.label,
+            group_name=group_name,
+            name=item.label or model_meta.verbose_name_plural.title(),
+            object_name=model_meta.object_name,
+            url=changelist_url,
+            model=model,
+            add_url=_reverse_or_none(f"admin:{model_meta.app_label}_{model_meta.model_name}_add"),
+        )
+
+    if item.item_type == MenuItem.ItemType.URL:
+        url = None
+        if item.url_name:
+            url = _reverse_or_none(item.url_name)
+        if not url and item.absolute_url:
+            url = item.absolute_url
+        if not url:
+            return None
+        group_name = item.group_label.strip() if item.group_label else "Links"
+        group_key = slugify(group_name) or "links"
+        return _CompiledItem(
+            group_key=group_key,
+            group_label=group_key,
+            group_name=group_name,
+            name=item.label or item.url_name or item.absolute_url,
+            object_name="CustomLink",
+            url=url,
+            permission_codename=item.permission_codename.strip(),
+        )
+    return None
+
+
+def _reverse_or_none(name: str) -> str | None:
+    try:
+        return reverse(name)
+    except NoReverseMatch:
+        return None
+    except PermissionDenied:
+        return None
 
 
 class _MenuBuilder:
-    """Helper responsible for converting MenuConfig entries to admin app_list."""
+    """Filters the compiled menu by the request user's permissions."""
 
-    def __init__(self, site: ColmeiaAdminSite, request, config: MenuConfig) -> None:
+    def __init__(self, site: ColmeiaAdminSite, request, items: tuple[_CompiledItem, ...]) -> None:
         self.site = site
         self.request = request
-        self.config = config
+        self.items = items
 
     def build(self) -> list[dict[str, object]]:
-        items = self.config.items.all().order_by("order", "id")
         grouped: OrderedDict[str, dict[str, object]] = OrderedDict()
-        for item in items:
-            entry = self._build_entry(item)
-            if entry is None:
+        for item in self.items:
+            model_dict = self._model_dict(item)
+            if model_dict is None:
                 continue
             app_dict = grouped.setdefault(
-                entry.app_key,
+                item.group_key,
                 {
-                    "app_label": entry.app_label,
-                    "name": entry.app_name,
+                    "app_label": item.group_label,
+                    "name": item.group_name,
                     "app_url": "#",
                     "has_module_perms": True,
                     "models": [],
                 },
             )
-            app_dict["models"].append(entry.model_dict)
+            app_dict["models"].append(model_dict)
 
         return list(grouped.values())
 
-    # === Builders ===
-    def _build_entry(self, item: MenuItem) -> _MenuEntry | None:
-        if item.item_type == MenuItem.ItemType.MODEL:
-            return self._build_model_entry(item)
-        if item.item_type == MenuItem.ItemType.URL:
-            return self._build_link_entry(item)
-        return None
-
-    def _build_model_entry(self, item: MenuItem) -> _MenuEntry | None:
-        model = item.get_model()
-        if model is None:
+    def _model_dict(self, item: _CompiledItem) -> dict[str, object] | None:
+        if item.model is None:
+            if item.permission_codename and not self.request.user.has_perm(
+                item.permission_codename
+            ):
+                return None
+            return {
+                "name": item.name,
+                "object_name": item.object_name,
+                "perms": {"add": False, "change": False, "delete": False, "view": True},
+                "admin_url": item.url,
+                "view_only": True,
+            }
+
+        model_admin = self.site._registry.get(item.model)
+        if model_admin is None:
             return None
-        if model not in self.site._registry:
-            return None
-
-        model_admin = self.site._registry[model]
         perms = model_admin.get_model_perms(self.request)
         if not any(perms.values()):
             return None
-
-        model_meta = model._meta
-        label = item.label or model_meta.verbose_name_plural.title()
-        changelist_url = self._reverse_or_none(
-            f"admin:{model_meta.app_label}_{model_meta.model_name}_changelist"
-        )
-        if changelist_url is None:
-            return None
-        add_url = None
-        if perms.get("add"):
-            add_url = self._reverse_or_none(
-                f"admin:{model_meta.app_label}_{model_meta.model_name}_add"
-            )
-
-        app_config = model_meta.app_config
-        group_name = item.group_label.strip() if item.group_label else app_config.verbose_name
-        app_key = slugify(group_name) or app_config.label
-        model_dict = {
-            "name": label,
-            "object_name": model_meta.object_name,
+        return {
+            "name": item.name,
+            "object_name": item.object_name,
             "perms": perms,
-            "admin_url": changelist_url,
-            "add_url": add_url,
+            "admin_url": item.url,
+            "add_url": item.add_url if perms.get("add") else None,
             "view_only": not perms.get("change", False),
         }
-        return _MenuEntry(
-            app_key=app_key,
-            app_label=app_config.label,
-            app_name=group_name,
-            model_dict=model_dict,
-        )
-
-    def _build_link_entry(self, item: MenuItem) -> _MenuEntry | None:
-        permission_codename = item.permission_codename.strip()
-        if permission_codename and not self.request.user.has_perm(permission_codename):
-            return None
-
-        url = None
-        if item.url_name:
-            url = self._reverse_or_none(item.url_name)
-        if not url and item.absolute_url:
-            url = item.absolute_url
-        if not url:
-            return None
-
-        label = item.label or item.url_name or item.absolute_url
-        group_name = item.group_label.strip() if item.group_label else "Links"
-        app_key = slugify(group_name) or "links"
-        model_dict = {
-            "name": label,
-            "object_name": "CustomLink",
-            "perms": {"add": False, "change": False, "delete": False, "view": True},
-            "admin_url": url,
-            "view_only": True,
-        }
-        return _MenuEntry(
-            app_key=app_key,
-            app_label=app_key,
-            app_name=group_name,
-            model_dict=model_dict,
-        )
-
-    # === Helpers ===
-    def _reverse_or_none(self, name: str) -> str | None:
-        try:
-            return reverse(name)
-        except NoReverseMatch:
-            return None
-        except PermissionDenied:
-            return None
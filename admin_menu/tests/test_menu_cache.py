@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.db.models import F
+from django.test import RequestFactory, TestCase
+
+from admin_menu.admin import MenuConfigAdmin
+from admin_menu.cache import invalidate_menu
+from admin_menu.models import MenuConfig, MenuItem, MenuVersion
+
+
+class CompiledMenuTests(TestCase):
+    def setUp(self):
+        invalidate_menu()
+        self.user = get_user_model().objects.create_user(
+            username="menu", password="testpass123", is_staff=True
+        )
+        self.user.user_permissions.set(
+            Permission.objects.filter(
+                content_type__app_label="apiary", codename__in=["view_hive", "add_hive"]
+            )
+        )
+        self.config = MenuConfig.objects.create(active=True)
+        self.hive_item = MenuItem.objects.create(
+            config=self.config,
+            order=1,
+            item_type=MenuItem.ItemType.MODEL,
+            group_label="Criação",
+            label="Minhas colmeias",
+            app_label="apiary",
+            model_name="Hive",
+        )
+        MenuItem.objects.create(
+            config=self.config,
+            order=2,
+            item_type=MenuItem.ItemType.MODEL,
+            group_label="Criação",
+            app_label="apiary",
+            model_name="Apiary",
+        )
+        MenuItem.objects.create(
+            config=self.config,
+            order=3,
+            item_type=MenuItem.ItemType.URL,
+            group_label="Ajuda",
+            label="Política",
+            url_name="privacy-policy",
+        )
+
+    def _request(self, user=None):
+        request = RequestFactory().get("/admin/")
+        request.user = user or self.user
+        return request
+
+    def _names(self, request=None):
+        return [
+            (app["name"], [model["name"] for model in app["models"]])
+            for app in admin.site.get_app_list(request or self._request())
+        ]
+
+    def test_menu_is_filtered_per_user_and_cached(self):
+        request = self._request()
+        self.assertEqual(
+            self._names(request), [("Criação", ["Minhas colmeias"]), ("Ajuda", ["Política"])]
+        )
+        # Only the menu version is read once the menu is compiled.
+        with self.assertNumQueries(1):
+            app_list = admin.site.get_app_list(request)
+        hive_entry = app_list[0]["models"][0]
+        self.assertTrue(hive_entry["add_url"].endswith("/apiary/hive/add/"))
+        self.assertTrue(hive_entry["view_only"])
+
+    def test_item_changes_rebuild_the_menu(self):
+        self._names()
+        self.hive_item.label = "Colmeias"
+        self.hive_item.save()
+        self.assertEqual(self._names()[0], ("Criação", ["Colmeias"]))
+
+    def test_activate_action_switches_menu(self):
+        self._names()
+        other = MenuConfig.objects.create()
+        MenuItem.objects.create(
+            config=other,
+            item_type=MenuItem.ItemType.URL,
+            group_label="Outro",
+            label="Início",
+            url_name="home",
+        )
+        MenuConfigAdmin(MenuConfig, admin.site).activate(
+            self._request(), MenuConfig.objects.filter(pk=other.pk)
+        )
+        self.assertEqual(self._names(), [("Outro", ["Início"])])
+
+    def test_changes_from_another_process_are_picked_up(self):
+        self._names()
+        # Another worker edited the menu: only the shared version tells us.
+        MenuItem.objects.filter(pk=self.hive_item.pk).update(label="Colmeias")
+        self.assertEqual(self._names()[0], ("Criação", ["Minhas colmeias"]))
+
+        MenuVersion.objects.update(version=F("version") + 1)
+        self.assertEqual(self._names()[0], ("Criação", ["Colmeias"]))
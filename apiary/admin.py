@@ -1,19 +1,24 @@
 from django.contrib import admin
+from django.core.cache import cache
+from django.db import models
 
-from .forms import ColmeiaForm, RevisaoForm
+from .forms import ColmeiaForm, RenditionPreviewFileInput, RevisaoForm
 from .models import (
     Apiary,
     BoxModel,
     City,
     CreatorNetworkEntry,
     Hive,
+    ImageConversionJob,
     MellitophilousPlant,
+    PersonalDataDeletionJob,
     QuickObservation,
     Revision,
     RevisionAttachment,
     Season,
     Species,
 )
+from .utils.pagination import EstimatedCountPaginator
 
 
 class Select2AdminMixin:
@@ -32,18 +37,46 @@ class Select2AdminMixin:
         )
 
 
+IMAGE_FIELD_OVERRIDES = {models.ImageField: {"widget": RenditionPreviewFileInput}}
+
+
 class BaseAdmin(Select2AdminMixin, admin.ModelAdmin):
+    formfield_overrides = IMAGE_FIELD_OVERRIDES
+
     class Media(Select2AdminMixin.Media):
         pass
         # js = ("apiary/js/conditional-fields.js",)
 
 
 class BaseInline(admin.TabularInline):
+    formfield_overrides = IMAGE_FIELD_OVERRIDES
+
     class Media:
         pass
         # js = ("apiary/js/conditional-fields.js",)
 
 
+class CachedRelatedFieldListFilter(admin.RelatedFieldListFilter):
+    """Related list filter whose choices are cached for a few minutes."""
+
+    cache_timeout = 300
+
+    def field_choices(self, field, request, model_admin):
+        key = f"admin:filter-choices:{model_admin.opts.label_lower}:{self.field_path}"
+        choices = cache.get(key)
+        if choices is None:
+            choices = list(super().field_choices(field, request, model_admin))
+            cache.set(key, choices, self.cache_timeout)
+        return choices
+
+
+class LargeTableAdminMixin:
+    """Changelist settings for tables that grow with every user."""
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
 class OwnerRestrictedAdmin(BaseAdmin):
     owner_field_name = "owner"
 
@@ -68,7 +101,7 @@ class OwnerRestrictedAdmin(BaseAdmin):
         return tuple(
             item
             for item in list_filter
-            if item != self.owner_field_name
+            if (item[0] if isinstance(item, tuple) else item) != self.owner_field_name
         )
 
     def get_exclude(self, request, obj=None):
@@ -108,9 +141,17 @@ class BoxModelAdmin(BaseAdmin):
 
 @admin.register(City)
 class CityAdmin(BaseAdmin):
-    list_display = ("name",)
+    list_display = ("name", "state")
+    list_filter = ("state",)
     search_fields = ("name",)
 
+    def get_search_results(self, request, queryset, search_term):
+        # Also backs the city autocomplete of apiaries and creator entries:
+        # an indexed, accent-insensitive prefix match instead of icontains.
+        if not search_term.strip():
+            return queryset, False
+        return queryset.search(search_term), False
+
 
 @admin.register(Season)
 class SeasonAdmin(BaseAdmin):
@@ -139,8 +180,13 @@ class MellitophilousPlantAdmin(BaseAdmin):
 @admin.register(Apiary)
 class ApiaryAdmin(OwnerRestrictedAdmin):
     list_display = ("name", "city", "owner", "hive_count")
+    list_select_related = ("city", "owner")
     search_fields = ("name", "city__name", "owner__username")
-    list_filter = ("owner", "city")
+    list_filter = (
+        ("owner", CachedRelatedFieldListFilter),
+        ("city", CachedRelatedFieldListFilter),
+    )
+    autocomplete_fields = ("city",)
 
 
 class RevisionAttachmentInline(BaseInline):
@@ -149,7 +195,7 @@ class RevisionAttachmentInline(BaseInline):
 
 
 @admin.register(Hive)
-class ColmeiaAdmin(OwnerRestrictedAdmin):
+class ColmeiaAdmin(LargeTableAdminMixin, OwnerRestrictedAdmin):
     list_display = (
         "identification_number",
         "popular_name",
@@ -161,13 +207,15 @@ class ColmeiaAdmin(OwnerRestrictedAdmin):
         "acquisition_date",
         "last_review_date",
     )
+    list_select_related = ("species", "owner", "apiary")
     list_filter = (
         "status",
         "acquisition_method",
-        "species",
-        "owner",
+        ("species", CachedRelatedFieldListFilter),
+        ("owner", CachedRelatedFieldListFilter),
     )
     search_fields = ("identification_number", "popular_name", "origin")
+    autocomplete_fields = ("origin_hive",)
     form = ColmeiaForm
 
     def formfield_for_foreignkey(self, db_field, request, **kwargs):
@@ -178,7 +226,7 @@ class ColmeiaAdmin(OwnerRestrictedAdmin):
         return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
 @admin.register(Revision)
-class RevisaoAdmin(BaseAdmin):
+class RevisaoAdmin(LargeTableAdminMixin, BaseAdmin):
     list_display = (
         "hive",
         "review_date",
@@ -190,6 +238,7 @@ class RevisaoAdmin(BaseAdmin):
         "pollen_level",
         "colony_strength",
     )
+    list_select_related = ("hive",)
     list_filter = (
         "queen_seen",
         "review_type",
@@ -200,6 +249,7 @@ class RevisaoAdmin(BaseAdmin):
         "colony_strength",
     )
     search_fields = ("hive__identification_number", "hive__popular_name")
+    autocomplete_fields = ("hive",)
     inlines = [RevisionAttachmentInline]
     form = RevisaoForm
 
@@ -222,10 +272,12 @@ class RevisionAttachmentAdmin(BaseAdmin):
 
 
 @admin.register(QuickObservation)
-class QuickObservationAdmin(BaseAdmin):
+class QuickObservationAdmin(LargeTableAdminMixin, BaseAdmin):
     list_display = ("hive", "date", "internal_photo", "external_photo")
+    list_select_related = ("hive",)
     list_filter = ("date",)
     search_fields = ("hive__identification_number", "hive__popular_name")
+    autocomplete_fields = ("hive",)
 
     def get_queryset(self, request):
         queryset = super().get_queryset(request)
@@ -245,4 +297,108 @@ class CreatorNetworkEntryAdmin(OwnerRestrictedAdmin):
     list_display = ("name", "city", "phone", "is_opt_in")
     list_filter = ("is_opt_in",)
     search_fields = ("name", "phone", "city__name", "user__username")
+    autocomplete_fields = ("city",)
     filter_horizontal = ("species",)
+
+
+@admin.register(ImageConversionJob)
+class ImageConversionJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "__str__",
+        "status",
+        "attempts",
+        "created_at",
+        "finished_at",
+    )
+    list_filter = ("status", "content_type")
+    list_select_related = ("content_type",)
+    readonly_fields = (
+        "content_type",
+        "object_id",
+        "field_name",
+        "source_name",
+        "status",
+        "attempts",
+        "last_error",
+        "created_at",
+        "started_at",
+        "finished_at",
+    )
+    actions = ("retry_jobs",)
+
+    def has_module_permission(self, request):
+        return request.user.is_superuser
+
+    def has_view_permission(self, request, obj=None):
+        return request.user.is_superuser
+
+    def has_change_permission(self, request, obj=None):
+        return request.user.is_superuser
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description="Reenviar para a fila de conversão")
+    def retry_jobs(self, request, queryset):
+        updated = queryset.filter(
+            status__in=[ImageConversionJob.Status.FAILED, ImageConversionJob.Status.SKIPPED]
+        ).update(
+            status=ImageConversionJob.Status.PENDING,
+            attempts=0,
+            last_error="",
+            finished_at=None,
+        )
+        self.message_user(request, f"{updated} conversão(ões) reenviada(s) para a fila.")
+
+
+@admin.register(PersonalDataDeletionJob)
+class PersonalDataDeletionJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "__str__",
+        "status",
+        "deleted_items",
+        "total_items",
+        "attempts",
+        "created_at",
+        "finished_at",
+    )
+    list_filter = ("status",)
+    readonly_fields = (
+        "token",
+        "status",
+        "attempts",
+        "total_items",
+        "deleted_items",
+        "last_error",
+        "created_at",
+        "started_at",
+        "updated_at",
+        "finished_at",
+    )
+    exclude = ("user",)
+    actions = ("retry_jobs",)
+
+    def has_module_permission(self, request):
+        return request.user.is_superuser
+
+    def has_view_permission(self, request, obj=None):
+        return request.user.is_superuser
+
+    def has_change_permission(self, request, obj=None):
+        return request.user.is_superuser
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+    @admin.action(description="Reenviar para a fila de exclusão")
+    def retry_jobs(self, request, queryset):
+        updated = queryset.filter(status=PersonalDataDeletionJob.Status.FAILED).update(
+            status=PersonalDataDeletionJob.Status.PENDING,
+            attempts=0,
+            last_error="",
+            finished_at=None,
+        )
+        self.message_user(request, f"{updated} exclusão(ões) reenviada(s) para a fila.")
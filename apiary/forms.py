@@ -1,9 +1,28 @@
 from __future__ import annotations
 
 from django import forms
+from django.contrib.admin.widgets import AdminFileWidget
 from django.core.exceptions import ValidationError
 
-from .models import Hive, Revision
+from .models import Apiary, Hive, ImageRendition, Revision
+
+
+class RenditionPreviewFileInput(AdminFileWidget):
+    """Admin file input whose preview loads a reduced rendition of the image."""
+
+    preview_width = 480
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        if self.is_initial(value):
+            renditions = ImageRendition.objects.srcsets([value.name]).get(value.name)
+            if renditions:
+                url = next(
+                    (url for width, url in renditions if width >= self.preview_width),
+                    renditions[-1][1],
+                )
+                context["widget"]["attrs"]["data-initial-preview-url"] = url
+        return context
 
 
 class RevisaoForm(forms.ModelForm):
@@ -27,7 +46,36 @@ class ColmeiaForm(forms.ModelForm):
         self.fields["acquisition_date"].required = False
         self.fields["transfer_box_date"].required = False
         self.fields["origin_hive"].required = False
+        self._limit_species_to_apiary_state()
+
+    def _limit_species_to_apiary_state(self):
+        """Offer only the species found in the apiary's UF, plus the current one.
 
+        Species with no UF recorded are offered everywhere. Submitted forms are
+        validated against every species: the list is not narrowed again when
+        the apiary changes in the page, so the choice must not be rejected for
+        a state the user was never shown.
+        """
+        field = self.fields.get("species")
+        apiary_field = self.fields.get("apiary")
+        if field is None or apiary_field is None or self.is_bound:
+            return
+        apiary_id = self.initial.get("apiary", self.instance.apiary_id)
+        apiary_id = getattr(apiary_id, "pk", apiary_id)
+        try:
+            state = (
+                Apiary.objects.filter(pk=int(apiary_id))
+                .values_list("city__state", flat=True)
+                .first()
+            )
+        except (TypeError, ValueError):
+            return
+        if not state:
+            return
+        queryset = field.queryset.found_in(state) | field.queryset.without_states()
+        if self.instance.species_id:
+            queryset |= field.queryset.filter(pk=self.instance.species_id)
+        field.queryset = queryset
 
     def clean(self):
         cleaned_data = super().clean()
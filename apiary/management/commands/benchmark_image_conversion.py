@@ -0,0 +1,85 @@
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from PIL import Image, ImageOps
+
+from apiary.utils.images import (
+    DEFAULT_WEBP_MAX_SIZE,
+    _encode_webp,
+    _normalize_image_mode,
+    convert_image_to_webp,
+)
+
+FORMATS = ("JPEG", "PNG", "WEBP")
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _legacy_convert(source) -> bytes:
+    """Pipeline used before decode-time downscaling, kept for comparison."""
+    image = Image.open(source)
+    image = ImageOps.exif_transpose(image)
+    image = _normalize_image_mode(image)
+    image.thumbnail(DEFAULT_WEBP_MAX_SIZE, Image.Resampling.LANCZOS)
+    return _encode_webp(image, 80)
+
+
+def _measure(path: str, pipeline: str) -> tuple[float, float]:
+    """Run one conversion in a fresh process; return (peak RSS MB, seconds)."""
+    baseline = _peak_rss_mb()
+    started = time.perf_counter()
+    with open(path, "rb") as source:
+        if pipeline == "antes":
+            _legacy_convert(source)
+        else:
+            convert_image_to_webp(source, original_name=path)
+    return _peak_rss_mb() - baseline, time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = "Compara memória e tempo da conversão de imagens antes e depois da redução na decodificação."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--megapixels",
+            type=float,
+            default=48,
+            help="Resolução das imagens sintéticas usadas na medição.",
+        )
+
+    def _sample(self, directory: Path, image_format: str, megapixels: float) -> str:
+        width = int((megapixels * 1_000_000 * 4 / 3) ** 0.5)
+        height = width * 3 // 4
+        image = Image.merge(
+            "RGB",
+            [
+                Image.linear_gradient("L").resize((width, height)),
+                Image.radial_gradient("L").resize((width, height)),
+                Image.effect_noise((width, height), 40),
+            ],
+        )
+        path = directory / f"amostra.{image_format.lower()}"
+        image.save(path, format=image_format)
+        return str(path)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'Formato':<8} {'Pipeline':<8} {'Pico RSS (MB)':>14} {'Tempo (s)':>10}")
+        with tempfile.TemporaryDirectory() as directory:
+            for image_format in FORMATS:
+                path = self._sample(Path(directory), image_format, options["megapixels"])
+                for pipeline in ("antes", "depois"):
+                    # A new process per run keeps the peak RSS of each case separate.
+                    with ProcessPoolExecutor(max_workers=1) as executor:
+                        peak, seconds = executor.submit(_measure, path, pipeline).result()
+                    self.stdout.write(
+                        f"{image_format:<8} {pipeline:<8} {peak:>14.1f} {seconds:>10.2f}"
+                    )
@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+
+from apiary.utils.urls import url_template
+
+# Links built per row by the dashboard panels and the hive history.
+ROUTES = (
+    "admin:apiary_revision_change",
+    "admin:apiary_hive_change",
+    "admin:apiary_apiary_change",
+)
+
+
+class Command(BaseCommand):
+    help = "Compara reverse() por linha com os modelos de URL pré-calculados."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=1000,
+            help="Quantidade de linhas simuladas no painel.",
+        )
+
+    def _reverse_rows(self, rows: int) -> list[str]:
+        return [reverse(route, args=[pk]) for pk in range(1, rows + 1) for route in ROUTES]
+
+    def _template_rows(self, rows: int) -> list[str]:
+        builders = [url_template(route) for route in ROUTES]
+        return [build(pk) for pk in range(1, rows + 1) for build in builders]
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        if self._reverse_rows(rows) != self._template_rows(rows):
+            self.stderr.write("As URLs geradas pelos dois métodos são diferentes.")
+            return
+        self.stdout.write(f"{'Método':<10} {'Linhas':>7} {'Tempo (ms)':>11}")
+        for label, build in (("reverse", self._reverse_rows), ("modelo", self._template_rows)):
+            best = min(self._time(build, rows) for _ in range(5))
+            self.stdout.write(f"{label:<10} {rows:>7} {best * 1000:>11.2f}")
+
+    @staticmethod
+    def _time(build, rows: int) -> float:
+        started = time.perf_counter()
+        build(rows)
+        return time.perf_counter() - started
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from apiary.utils.dashboard_cache import get_cache_stats, is_enabled, reset_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Exibe os contadores de acerto/erro do cache dos dashboards de produção."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Zera os contadores após exibi-los.",
+        )
+
+    def handle(self, *args, **options):
+        if not is_enabled():
+            self.stdout.write(
+                self.style.WARNING(
+                    "O cache em memória local não é compartilhado entre os processos; "
+                    "os dashboards são calculados a cada acesso. Defina CACHE_DIR para ativá-lo."
+                )
+            )
+            return
+        stats = get_cache_stats()
+        total = stats["hits"] + stats["misses"]
+        ratio = (stats["hits"] / total * 100) if total else 0.0
+        self.stdout.write(
+            f"Acertos: {stats['hits']} | Erros: {stats['misses']} | "
+            f"Taxa de acerto: {ratio:.1f}%"
+        )
+        if options["reset"]:
+            reset_cache_stats()
+            self.stdout.write(self.style.SUCCESS("Contadores zerados."))
@@ -0,0 +1,89 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from apiary.models import IMAGE_FIELDS, ImageConversionJob, ImageRendition
+from apiary.utils.images import render_stored_image
+
+
+class Command(BaseCommand):
+    help = "Gera as versões reduzidas das imagens já armazenadas."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Quantidade de processos usados no redimensionamento (1 processa no próprio comando).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            type=int,
+            default=200,
+            help="Quantidade de imagens verificadas por lote.",
+        )
+
+    def _source_names(self):
+        for model, field_name in IMAGE_FIELDS:
+            yield from (
+                model._base_manager.exclude(**{f"{field_name}__isnull": True})
+                .exclude(**{field_name: ""})
+                .values_list(field_name, flat=True)
+                .iterator()
+            )
+
+    def _batches(self, batch_size):
+        names = self._source_names()
+        while batch := list(islice(names, batch_size)):
+            pending = set(batch)
+            pending -= set(
+                ImageRendition.objects.filter(source_name__in=pending).values_list(
+                    "source_name", flat=True
+                )
+            )
+            # Originals still waiting for the WebP worker get their renditions there.
+            pending -= set(
+                ImageConversionJob.objects.filter(
+                    source_name__in=pending,
+                    status__in=[
+                        ImageConversionJob.Status.PENDING,
+                        ImageConversionJob.Status.PROCESSING,
+                    ],
+                ).values_list("source_name", flat=True)
+            )
+            if pending:
+                yield sorted(pending)
+
+    def _record(self, results):
+        rows, generated = [], 0
+        for source_name, renditions, error in results:
+            if error:
+                self.stderr.write(f"Falha ao processar {source_name}: {error}")
+                continue
+            generated += 1
+            rows.extend(
+                ImageRendition(source_name=source_name, width=width, name=name)
+                for width, name in renditions
+            )
+        ImageRendition.objects.bulk_create(rows, ignore_conflicts=True)
+        return generated
+
+    def handle(self, *args, **options):
+        workers = max(1, options["workers"])
+        generated = 0
+        if workers == 1:
+            for batch in self._batches(options["batch_size"]):
+                generated += self._record(map(render_stored_image, batch))
+        else:
+            # Each child opens its own connection to record the blobs it stores.
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for batch in self._batches(options["batch_size"]):
+                    generated += self._record(executor.map(render_stored_image, batch))
+        self.stdout.write(
+            self.style.SUCCESS(f"Versões reduzidas geradas para {generated} imagem(ns).")
+        )
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from apiary.models import MonthlyHarvestRollup
+
+
+class Command(BaseCommand):
+    help = "Reconstrói o consolidado mensal de colheitas a partir das revisões."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            type=int,
+            default=500,
+            help="Quantidade de linhas inseridas por lote.",
+        )
+
+    def handle(self, *args, **options):
+        total = MonthlyHarvestRollup.objects.rebuild_all(batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Consolidado reconstruído: {total} linha(s) de colmeia/mês gerada(s)."
+            )
+        )
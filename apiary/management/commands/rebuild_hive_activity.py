@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from apiary.models import HiveActivitySummary
+
+
+class Command(BaseCommand):
+    help = "Reconstrói o resumo de atividade das colmeias a partir das revisões."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            type=int,
+            default=500,
+            help="Quantidade de linhas inseridas por lote.",
+        )
+
+    def handle(self, *args, **options):
+        total = HiveActivitySummary.objects.rebuild_all(batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Resumo reconstruído: {total} colmeia(s) com revisões.")
+        )
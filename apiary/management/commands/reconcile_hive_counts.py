@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from apiary.models import Apiary
+
+
+class Command(BaseCommand):
+    help = "Recalcula a quantidade de colmeias vinculadas a cada meliponário/apiário."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            type=int,
+            default=500,
+            help="Quantidade de meliponários/apiários verificados por lote.",
+        )
+
+    def handle(self, *args, **options):
+        repaired = Apiary.objects.reconcile_hive_counts(batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Contagem de colmeias conferida: {repaired} meliponário(s)/apiário(s) corrigido(s)."
+            )
+        )
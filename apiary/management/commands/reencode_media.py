@@ -0,0 +1,156 @@
+import json
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+
+from apiary.models import IMAGE_FIELDS
+from apiary.storage import image_storage
+from apiary.utils.images import DEFAULT_WEBP_QUALITY, reencode_stored_image, should_replace
+
+
+def _megabytes(size: int) -> str:
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+class Command(BaseCommand):
+    help = "Converte para WebP as imagens já armazenadas e atualiza os registros."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Quantidade de processos usados na conversão (1 converte no próprio comando).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            type=int,
+            default=200,
+            help="Quantidade de registros atualizados por transação.",
+        )
+        parser.add_argument(
+            "--quality",
+            type=int,
+            default=DEFAULT_WEBP_QUALITY,
+            help="Qualidade WebP usada na conversão.",
+        )
+        parser.add_argument(
+            "--all",
+            dest="include_webp",
+            action="store_true",
+            help="Recomprime também os arquivos que já são WebP (mantidos se não ficarem menores).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            dest="dry_run",
+            action="store_true",
+            help="Apenas calcula a economia, sem gravar arquivos nem alterar registros.",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continua a partir do último lote concluído na execução anterior.",
+        )
+        parser.add_argument(
+            "--state-file",
+            dest="state_file",
+            default=str(Path(settings.BASE_DIR) / "reencode_media_state.json"),
+            help="Arquivo onde o progresso é salvo a cada lote.",
+        )
+
+    def _rows(self, model, field_name, after_pk, batch_size):
+        queryset = (
+            model._base_manager.exclude(**{f"{field_name}__isnull": True})
+            .exclude(**{field_name: ""})
+            .order_by("pk")
+            .values_list("pk", field_name)
+        )
+        while batch := list(queryset.filter(pk__gt=after_pk)[:batch_size]):
+            yield batch
+            after_pk = batch[-1][0]
+
+    def _apply(self, model, field_name, rows, results, stats, dry_run):
+        swapped, orphaned = [], []
+        with transaction.atomic():
+            for (pk, name), (_, new_name, original_size, new_size, error) in zip(rows, results):
+                if error:
+                    stats["failed"] += 1
+                    self.stderr.write(f"Falha ao converter {name}: {error}")
+                    continue
+                if not should_replace(name, original_size, new_size):
+                    stats["kept"] += 1
+                    continue
+                stats["converted"] += 1
+                stats["before"] += original_size
+                stats["after"] += new_size
+                if dry_run:
+                    continue
+                # The photo may have been replaced while the file was converted.
+                updated = model._base_manager.filter(pk=pk, **{field_name: name}).update(
+                    **{field_name: new_name}
+                )
+                (swapped if updated else orphaned).append((name, new_name))
+
+        # Renditions of the replaced files go with them once unreferenced.
+        for name, new_name in orphaned:
+            image_storage.delete(new_name)
+        for name, _ in swapped:
+            image_storage.delete(name)
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        state_file = Path(options["state_file"])
+        state = {}
+        if options["resume"] and state_file.exists():
+            state = json.loads(state_file.read_text())
+
+        stats = Counter()
+        executor = None
+        convert = map
+        if options["workers"] > 1:
+            # Each child opens its own connection to record the blobs it stores.
+            connections.close_all()
+            executor = ProcessPoolExecutor(max_workers=options["workers"])
+            convert = executor.map
+        try:
+            for model, field_name in IMAGE_FIELDS:
+                label = f"{model._meta.label_lower}.{field_name}"
+                for batch in self._rows(model, field_name, state.get(label, 0), options["batch_size"]):
+                    rows = [
+                        (pk, name)
+                        for pk, name in batch
+                        if options["include_webp"] or not name.lower().endswith(".webp")
+                    ]
+                    results = convert(
+                        reencode_stored_image,
+                        [name for _, name in rows],
+                        repeat(options["quality"]),
+                        repeat(dry_run),
+                    )
+                    self._apply(model, field_name, rows, results, stats, dry_run)
+                    if not dry_run:
+                        state[label] = batch[-1][0]
+                        state_file.write_text(json.dumps(state))
+        finally:
+            if executor:
+                executor.shutdown()
+
+        if not dry_run and state_file.exists():
+            state_file.unlink()
+
+        prefix = "Simulação: " if dry_run else ""
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{prefix}{stats['converted']} imagem(ns) convertida(s), "
+                f"{stats['kept']} mantida(s) e {stats['failed']} com falha. "
+                f"Tamanho {_megabytes(stats['before'])} -> {_megabytes(stats['after'])} "
+                f"(economia de {_megabytes(stats['before'] - stats['after'])})."
+            )
+        )
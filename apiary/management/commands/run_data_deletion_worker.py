@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apiary.models import PersonalDataDeletionJob
+
+
+class Command(BaseCommand):
+    help = "Processa a fila de exclusão de dados pessoais solicitadas pelos usuários."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            type=int,
+            default=500,
+            help="Quantidade de registros excluídos por transação.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=5.0,
+            help="Segundos de espera quando a fila está vazia.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Esvazia a fila e encerra, em vez de continuar aguardando novas solicitações.",
+        )
+
+    def handle(self, *args, **options):
+        processed = 0
+        while True:
+            job = PersonalDataDeletionJob.objects.claim()
+            if job is None:
+                if options["once"]:
+                    break
+                time.sleep(options["sleep"])
+                continue
+            job.run(batch_size=options["batch_size"])
+            processed += 1
+            if job.status != PersonalDataDeletionJob.Status.DONE:
+                self.stderr.write(f"Falha ao executar {job}: {job.last_error}")
+        self.stdout.write(
+            self.style.SUCCESS(f"Fila processada: {processed} exclusão(ões) executada(s).")
+        )
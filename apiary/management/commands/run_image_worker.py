@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apiary.models import ImageConversionJob
+
+
+class Command(BaseCommand):
+    help = "Processa a fila de conversão de imagens para WebP."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            type=int,
+            default=10,
+            help="Quantidade de conversões reservadas por vez.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=5.0,
+            help="Segundos de espera quando a fila está vazia.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Esvazia a fila e encerra, em vez de continuar aguardando novas conversões.",
+        )
+
+    def handle(self, *args, **options):
+        processed = 0
+        while True:
+            jobs = ImageConversionJob.objects.claim(options["batch_size"])
+            if not jobs:
+                if options["once"]:
+                    break
+                time.sleep(options["sleep"])
+                continue
+            for job in jobs:
+                job.run()
+                processed += 1
+                if job.status == ImageConversionJob.Status.FAILED:
+                    self.stderr.write(f"Falha ao converter {job}: {job.last_error}")
+        self.stdout.write(
+            self.style.SUCCESS(f"Fila processada: {processed} conversão(ões) executada(s).")
+        )
@@ -3,6 +3,7 @@ from pathlib import Path
 
 from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
 
 from apiary.models import City
 
@@ -33,8 +34,7 @@ class Command(BaseCommand):
         if not isinstance(states, list):
             raise CommandError("Estrutura inválida: o arquivo deve conter a chave 'estados' com uma lista.")
 
-        created = 0
-        updated = 0
+        names = []
 
         for state in states:
             uf = state.get("sigla")
@@ -59,20 +59,20 @@ class Command(BaseCommand):
                     )
                     continue
 
-                formatted_name = f"{city_name.strip()} - {uf}"
-                obj, created_flag = City.objects.update_or_create(name=formatted_name)
+                names.append(f"{city_name.strip()} - {uf}")
 
-                if created_flag:
-                    created += 1
-                    action = "criada"
-                else:
-                    updated += 1
-                    action = "atualizada"
-
-                self.stdout.write(self.style.SUCCESS(f"Cidade '{obj.name}' {action}."))
+        # One read of the current names and a bulk insert of the missing ones.
+        with transaction.atomic():
+            existing = set(City.objects.values_list("name", flat=True))
+            missing = list(dict.fromkeys(name for name in names if name not in existing))
+            cities = [City(name=name) for name in missing]
+            for city in cities:
+                # bulk_create skips save(), which derives these fields.
+                city.refresh_search_fields()
+            City.objects.bulk_create(cities, batch_size=1000, ignore_conflicts=True)
 
         summary = (
-            f"Importação concluída: {created} cidade(s) criada(s), "
-            f"{updated} cidade(s) atualizada(s)."
+            f"Importação concluída: {len(missing)} cidade(s) criada(s), "
+            f"{len(set(names)) - len(missing)} cidade(s) já cadastrada(s)."
         )
         self.stdout.write(summary)
@@ -3,8 +3,11 @@ from pathlib import Path
 
 from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
 
-from apiary.models import Species
+from apiary.models import Species, SpeciesState
+
+SPECIES_FIELDS = ["group", "popular_name", "states", "characteristics", "default_temperament"]
 
 
 def _normalize_states(states):
@@ -64,8 +67,7 @@ class Command(BaseCommand):
         if not isinstance(data, list):
             raise CommandError("O arquivo JSON deve conter uma lista de espécies.")
 
-        created_count = 0
-        updated_count = 0
+        entries = {}
 
         for index, entry in enumerate(data, start=1):
             scientific_name = (entry.get("nome_cientifico") or "").strip()
@@ -93,6 +95,15 @@ class Command(BaseCommand):
                     )
                 )
                 continue
+            invalid_states = sorted(set(states) - Species.STATE_CODES)
+            if invalid_states:
+                self.stderr.write(
+                    self.style.WARNING(
+                        f"Registro '{scientific_name}' ignorado: estados inválidos informados: "
+                        f"{', '.join(invalid_states)}"
+                    )
+                )
+                continue
 
             raw_characteristics = entry.get("caracteristicas")
             if raw_characteristics is None:
@@ -103,7 +114,9 @@ class Command(BaseCommand):
             if isinstance(default_temperament, str):
                 default_temperament = default_temperament.strip() or None
 
-            defaults = {
+            # A repeated name keeps the last entry, as the previous
+            # update_or_create loop did.
+            entries[scientific_name] = {
                 "group": group,
                 "popular_name": popular_name,
                 "states": states,
@@ -111,26 +124,33 @@ class Command(BaseCommand):
                 "default_temperament": default_temperament,
             }
 
-            species, created = Species.objects.update_or_create(
-                scientific_name=scientific_name,
-                defaults=defaults,
-            )
-
-            if created:
-                created_count += 1
-                action = "criada"
-            else:
-                updated_count += 1
-                action = "atualizada"
-
-            self.stdout.write(
-                self.style.SUCCESS(
-                    f"Espécie '{species.scientific_name}' {action} com sucesso."
-                )
-            )
-
+        # The whole file is applied against the current rows with one read
+        # and bulk writes; rows whose values did not change are skipped.
+        with transaction.atomic():
+            existing = {}
+            for species in Species.objects.filter(scientific_name__in=list(entries)):
+                existing.setdefault(species.scientific_name, []).append(species)
+
+            to_create = []
+            to_update = []
+            for scientific_name, values in entries.items():
+                if scientific_name not in existing:
+                    to_create.append(Species(scientific_name=scientific_name, **values))
+                    continue
+                for species in existing[scientific_name]:
+                    if any(getattr(species, field) != value for field, value in values.items()):
+                        for field, value in values.items():
+                            setattr(species, field, value)
+                        to_update.append(species)
+
+            Species.objects.bulk_create(to_create, batch_size=500)
+            Species.objects.bulk_update(to_update, SPECIES_FIELDS, batch_size=500)
+            # bulk writes skip Species.save(), which keeps the UF index in sync.
+            SpeciesState.objects.sync(to_create + to_update)
+
+        unchanged_count = len(entries) - len(to_create) - len({s.scientific_name for s in to_update})
         summary_message = (
-            f"Importação concluída: {created_count} criada(s), "
-            f"{updated_count} atualizada(s)."
+            f"Importação concluída: {len(to_create)} criada(s), "
+            f"{len(to_update)} atualizada(s), {unchanged_count} sem alteração."
         )
         self.stdout.write(summary_message)
@@ -0,0 +1,84 @@
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apiary.models import IMAGE_FIELDS, ImageConversionJob, ImageRendition
+from apiary.storage import image_storage, is_sharded
+
+
+class Command(BaseCommand):
+    help = "Move as imagens antigas para as subpastas por hash e atualiza os registros."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            type=int,
+            default=200,
+            help="Quantidade de registros atualizados por transação.",
+        )
+
+    def _rows(self, model, field_name, batch_size):
+        queryset = (
+            model._base_manager.exclude(**{f"{field_name}__isnull": True})
+            .exclude(**{field_name: ""})
+            .order_by("pk")
+            .values_list("pk", field_name)
+        )
+        after_pk = 0
+        while batch := list(queryset.filter(pk__gt=after_pk)[:batch_size]):
+            yield [(pk, name) for pk, name in batch if not is_sharded(name)]
+            after_pk = batch[-1][0]
+
+    def _move(self, model, field_name, rows, stats):
+        # Originals waiting for the WebP worker are moved once converted.
+        queued = set(
+            ImageConversionJob.objects.filter(
+                source_name__in=[name for _, name in rows],
+                status__in=[ImageConversionJob.Status.PENDING, ImageConversionJob.Status.PROCESSING],
+            ).values_list("source_name", flat=True)
+        )
+        copies = []
+        for pk, name in rows:
+            if name in queued:
+                stats["queued"] += 1
+                continue
+            if not image_storage.exists(name):
+                stats["missing"] += 1
+                self.stderr.write(f"Arquivo não encontrado: {name}")
+                continue
+            # The copy is written first, so the old name keeps working until
+            # the row points at the new one.
+            with image_storage.open(name, "rb") as source:
+                copies.append((pk, name, image_storage.save(name, source)))
+
+        moved, stale = [], []
+        with transaction.atomic():
+            for pk, name, new_name in copies:
+                updated = model._base_manager.filter(pk=pk, **{field_name: name}).update(
+                    **{field_name: new_name}
+                )
+                if not updated:
+                    stale.append(new_name)
+                    continue
+                if model is not ImageRendition:
+                    ImageRendition.objects.rename_source(name, new_name)
+                moved.append(name)
+        stats["moved"] += len(moved)
+        for name in stale + moved:
+            image_storage.delete(name)
+
+    def handle(self, *args, **options):
+        stats = Counter()
+        # Renditions come last so their rows already follow the moved sources.
+        for model, field_name in IMAGE_FIELDS + ((ImageRendition, "name"),):
+            for rows in self._rows(model, field_name, options["batch_size"]):
+                if rows:
+                    self._move(model, field_name, rows, stats)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{stats['moved']} arquivo(s) movido(s), {stats['queued']} aguardando conversão "
+                f"e {stats['missing']} não encontrado(s)."
+            )
+        )
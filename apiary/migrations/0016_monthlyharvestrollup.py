@@ -0,0 +1,43 @@
+# Generated by Django 4.2.16 on 2026-10-16 22:36
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('apiary', '0015_apiary_photo_season_mellitophilousplant_quickobservation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyHarvestRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(verbose_name='Mês')),
+                ('honey_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Mel colhido (ml)')),
+                ('propolis_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Própolis colhida (g)')),
+                ('wax_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Cera colhida (g)')),
+                ('pollen_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Pólen colhido (g)')),
+                ('harvest_count', models.PositiveIntegerField(default=0, verbose_name='Qtd. de colheitas')),
+                ('last_review_date', models.DateTimeField(blank=True, null=True, verbose_name='Última colheita')),
+                ('apiary', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='harvest_rollups', to='apiary.apiary', verbose_name='Meliponário/Apiário')),
+                ('hive', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='harvest_rollups', to='apiary.hive', verbose_name='Colmeia')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='harvest_rollups', to=settings.AUTH_USER_MODEL, verbose_name='Proprietário')),
+                ('species', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='harvest_rollups', to='apiary.species', verbose_name='Espécie')),
+            ],
+            options={
+                'verbose_name': 'Consolidado mensal de colheitas',
+                'verbose_name_plural': 'Consolidados mensais de colheitas',
+                'ordering': ['month'],
+                'indexes': [models.Index(fields=['owner', 'month'], name='harvest_rollup_owner_month')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='monthlyharvestrollup',
+            constraint=models.UniqueConstraint(fields=('hive', 'month'), name='unique_harvest_rollup_per_hive_month'),
+        ),
+    ]
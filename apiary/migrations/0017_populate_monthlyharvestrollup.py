@@ -0,0 +1,57 @@
+from django.db import migrations
+from django.db.models import Count, DecimalField, Max, Sum, Value
+from django.db.models.functions import Coalesce, TruncMonth
+from django.utils import timezone
+
+
+def populate_rollups(apps, schema_editor):
+    Revision = apps.get_model("apiary", "Revision")
+    MonthlyHarvestRollup = apps.get_model("apiary", "MonthlyHarvestRollup")
+
+    MonthlyHarvestRollup.objects.all().delete()
+    grouped = (
+        Revision.objects.filter(review_type="colheita")
+        .annotate(month=TruncMonth("review_date"))
+        .values("hive_id", "hive__owner_id", "hive__apiary_id", "hive__species_id", "month")
+        .annotate(
+            honey_amount=Coalesce(Sum("honey_harvest_amount"), Value(0), output_field=DecimalField()),
+            propolis_amount=Coalesce(Sum("propolis_harvest_amount"), Value(0), output_field=DecimalField()),
+            wax_amount=Coalesce(Sum("wax_harvest_amount"), Value(0), output_field=DecimalField()),
+            pollen_amount=Coalesce(Sum("pollen_harvest_amount"), Value(0), output_field=DecimalField()),
+            harvest_count=Count("id"),
+            last_review_date=Max("review_date"),
+        )
+        .order_by()
+    )
+    rows = []
+    for row in grouped:
+        month = row["month"]
+        if timezone.is_aware(month):
+            month = timezone.localtime(month)
+        rows.append(
+            MonthlyHarvestRollup(
+                owner_id=row["hive__owner_id"],
+                hive_id=row["hive_id"],
+                apiary_id=row["hive__apiary_id"],
+                species_id=row["hive__species_id"],
+                month=month.date().replace(day=1),
+                honey_amount=row["honey_amount"],
+                propolis_amount=row["propolis_amount"],
+                wax_amount=row["wax_amount"],
+                pollen_amount=row["pollen_amount"],
+                harvest_count=row["harvest_count"],
+                last_review_date=row["last_review_date"],
+            )
+        )
+    MonthlyHarvestRollup.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apiary', '0016_monthlyharvestrollup'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.16 on 2026-10-16 22:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apiary', '0017_populate_monthlyharvestrollup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='hive',
+            index=models.Index(fields=['owner', 'popular_name'], name='hive_owner_popular_name'),
+        ),
+    ]
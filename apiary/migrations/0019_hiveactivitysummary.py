@@ -0,0 +1,32 @@
+# Generated by Django 4.2.16 on 2026-10-16 22:56
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apiary', '0018_hive_owner_popular_name_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HiveActivitySummary',
+            fields=[
+                ('hive', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='activity_summary', serialize=False, to='apiary.hive', verbose_name='Colmeia')),
+                ('revision_count', models.PositiveIntegerField(default=0, verbose_name='Qtd. de revisões')),
+                ('harvest_count', models.PositiveIntegerField(default=0, verbose_name='Qtd. de colheitas')),
+                ('last_review_date', models.DateTimeField(blank=True, null=True, verbose_name='Última revisão')),
+                ('last_harvest_date', models.DateTimeField(blank=True, null=True, verbose_name='Última colheita')),
+                ('honey_total', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Mel colhido (ml)')),
+                ('propolis_total', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Própolis colhida (g)')),
+                ('wax_total', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Cera colhida (g)')),
+                ('pollen_total', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Pólen colhido (g)')),
+            ],
+            options={
+                'verbose_name': 'Resumo de atividade da colmeia',
+                'verbose_name_plural': 'Resumos de atividade das colmeias',
+            },
+        ),
+    ]
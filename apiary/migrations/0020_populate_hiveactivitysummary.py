@@ -0,0 +1,46 @@
+from django.db import migrations
+from django.db.models import Count, DecimalField, Max, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def populate_summaries(apps, schema_editor):
+    Hive = apps.get_model("apiary", "Hive")
+    Revision = apps.get_model("apiary", "Revision")
+    HiveActivitySummary = apps.get_model("apiary", "HiveActivitySummary")
+
+    harvests = Q(review_type="colheita")
+    HiveActivitySummary.objects.all().delete()
+    grouped = (
+        Revision.objects.values("hive_id")
+        .annotate(
+            revision_count=Count("id"),
+            harvest_count=Count("id", filter=harvests),
+            last_review_date=Max("review_date"),
+            last_harvest_date=Max("review_date", filter=harvests),
+            honey_total=Coalesce(Sum("honey_harvest_amount", filter=harvests), Value(0), output_field=DecimalField()),
+            propolis_total=Coalesce(Sum("propolis_harvest_amount", filter=harvests), Value(0), output_field=DecimalField()),
+            wax_total=Coalesce(Sum("wax_harvest_amount", filter=harvests), Value(0), output_field=DecimalField()),
+            pollen_total=Coalesce(Sum("pollen_harvest_amount", filter=harvests), Value(0), output_field=DecimalField()),
+        )
+        .order_by()
+    )
+    HiveActivitySummary.objects.bulk_create(
+        [HiveActivitySummary(**row) for row in grouped], batch_size=500
+    )
+    # Backdated revisions used to overwrite the latest review date.
+    Hive.objects.update(
+        last_review_date=Subquery(
+            HiveActivitySummary.objects.filter(hive_id=OuterRef("pk")).values("last_review_date")[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apiary', '0019_hiveactivitysummary'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_summaries, migrations.RunPython.noop),
+    ]
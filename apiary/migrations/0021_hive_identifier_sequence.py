@@ -0,0 +1,30 @@
+# Generated by Django 4.2.16 on 2026-10-16 23:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apiary', '0020_populate_hiveactivitysummary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HiveIdentifierSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('prefix', models.CharField(max_length=10, unique=True, verbose_name='Prefixo')),
+                ('next_value', models.BigIntegerField(default=0, verbose_name='Próximo número')),
+            ],
+            options={
+                'verbose_name': 'Sequência de identificadores de colmeias',
+                'verbose_name_plural': 'Sequências de identificadores de colmeias',
+            },
+        ),
+        migrations.AlterField(
+            model_name='hive',
+            name='identification_number',
+            field=models.CharField(editable=False, max_length=20, unique=True, verbose_name='N. de identificação'),
+        ),
+    ]
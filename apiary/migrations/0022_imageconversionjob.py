@@ -0,0 +1,37 @@
+# Generated by Django 4.2.16 on 2026-10-16 23:07
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('apiary', '0021_hive_identifier_sequence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageConversionJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveBigIntegerField(verbose_name='ID do registro')),
+                ('field_name', models.CharField(max_length=50, verbose_name='Campo')),
+                ('source_name', models.CharField(max_length=255, verbose_name='Arquivo original')),
+                ('status', models.CharField(choices=[('pendente', 'Pendente'), ('processando', 'Processando'), ('concluida', 'Concluída'), ('falhou', 'Falhou'), ('descartada', 'Descartada (imagem substituída)')], default='pendente', max_length=20, verbose_name='Situação')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Tentativas')),
+                ('last_error', models.TextField(blank=True, verbose_name='Último erro')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Iniciado em')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Finalizado em')),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype', verbose_name='Tipo de registro')),
+            ],
+            options={
+                'verbose_name': 'Conversão de imagem',
+                'verbose_name_plural': 'Conversões de imagens',
+                'ordering': ['-created_at', '-pk'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='image_job_status_created')],
+            },
+        ),
+    ]
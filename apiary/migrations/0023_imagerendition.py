@@ -0,0 +1,31 @@
+# Generated by Django 4.2.16 on 2026-10-16 23:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apiary', '0022_imageconversionjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageRendition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source_name', models.CharField(max_length=255, verbose_name='Arquivo original')),
+                ('width', models.PositiveSmallIntegerField(verbose_name='Largura (px)')),
+                ('name', models.CharField(max_length=255, verbose_name='Arquivo')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+            ],
+            options={
+                'verbose_name': 'Versão reduzida de imagem',
+                'verbose_name_plural': 'Versões reduzidas de imagens',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='imagerendition',
+            constraint=models.UniqueConstraint(fields=('source_name', 'width'), name='image_rendition_source_width'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 4.2.16 on 2026-10-16 23:23
+
+import apiary.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apiary', '0023_imagerendition'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredImage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True, verbose_name='Arquivo')),
+                ('ref_count', models.PositiveIntegerField(default=0, verbose_name='Referências')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+            ],
+            options={
+                'verbose_name': 'Arquivo de imagem',
+                'verbose_name_plural': 'Arquivos de imagens',
+            },
+        ),
+        migrations.AlterField(
+            model_name='apiary',
+            name='photo',
+            field=models.ImageField(blank=True, null=True, storage=apiary.storage.ContentAddressedStorage(), upload_to='apiary_photos/', verbose_name='Foto do meliponário'),
+        ),
+        migrations.AlterField(
+            model_name='hive',
+            name='photo',
+            field=models.ImageField(blank=True, null=True, storage=apiary.storage.ContentAddressedStorage(), upload_to='hive_photos/', verbose_name='Foto da colmeia'),
+        ),
+        migrations.AlterField(
+            model_name='quickobservation',
+            name='external_photo',
+            field=models.ImageField(blank=True, null=True, storage=apiary.storage.ContentAddressedStorage(), upload_to='quick_observations/external/', verbose_name='Foto externa'),
+        ),
+        migrations.AlterField(
+            model_name='quickobservation',
+            name='internal_photo',
+            field=models.ImageField(blank=True, null=True, storage=apiary.storage.ContentAddressedStorage(), upload_to='quick_observations/internal/', verbose_name='Foto interna'),
+        ),
+        migrations.AlterField(
+            model_name='revisionattachment',
+            name='file',
+            field=models.ImageField(storage=apiary.storage.ContentAddressedStorage(), upload_to='revision_attachments/', verbose_name='Imagem'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.16 on 2026-10-16 23:28
+
+import apiary.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apiary', '0024_content_addressed_images'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='apiary',
+            name='photo',
+            field=models.ImageField(blank=True, max_length=255, null=True, storage=apiary.storage.ContentAddressedStorage(), upload_to='apiary_photos/', verbose_name='Foto do meliponário'),
+        ),
+        migrations.AlterField(
+            model_name='hive',
+            name='photo',
+            field=models.ImageField(blank=True, max_length=255, null=True, storage=apiary.storage.ContentAddressedStorage(), upload_to='hive_photos/', verbose_name='Foto da colmeia'),
+        ),
+        migrations.AlterField(
+            model_name='quickobservation',
+            name='external_photo',
+            field=models.ImageField(blank=True, max_length=255, null=True, storage=apiary.storage.ContentAddressedStorage(), upload_to='quick_observations/external/', verbose_name='Foto externa'),
+        ),
+        migrations.AlterField(
+            model_name='quickobservation',
+            name='internal_photo',
+            field=models.ImageField(blank=True, max_length=255, null=True, storage=apiary.storage.ContentAddressedStorage(), upload_to='quick_observations/internal/', verbose_name='Foto interna'),
+        ),
+        migrations.AlterField(
+            model_name='revisionattachment',
+            name='file',
+            field=models.ImageField(max_length=255, storage=apiary.storage.ContentAddressedStorage(), upload_to='revision_attachments/', verbose_name='Imagem'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations
+
+from apiary.utils.text import search_key, split_city_name
+
+
+def split_city_names(apps, schema_editor):
+    City = apps.get_model("apiary", "City")
+    cities = list(City.objects.only("pk", "name"))
+    for city in cities:
+        name, city.state = split_city_name(city.name)
+        city.search_name = search_key(name)
+    City.objects.bulk_update(cities, ["state", "search_name"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apiary', '0026_city_state_search_name'),
+    ]
+
+    operations = [
+        migrations.RunPython(split_city_names, migrations.RunPython.noop),
+    ]
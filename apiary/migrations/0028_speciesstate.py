@@ -0,0 +1,30 @@
+# Generated by Django 4.2.16 on 2026-10-16 23:39
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apiary', '0027_populate_city_search_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SpeciesState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('state', models.CharField(choices=[('AC', 'Acre'), ('AL', 'Alagoas'), ('AP', 'Amapá'), ('AM', 'Amazonas'), ('BA', 'Bahia'), ('CE', 'Ceará'), ('DF', 'Distrito Federal'), ('ES', 'Espírito Santo'), ('GO', 'Goiás'), ('MA', 'Maranhão'), ('MT', 'Mato Grosso'), ('MS', 'Mato Grosso do Sul'), ('MG', 'Minas Gerais'), ('PA', 'Pará'), ('PB', 'Paraíba'), ('PR', 'Paraná'), ('PE', 'Pernambuco'), ('PI', 'Piauí'), ('RJ', 'Rio de Janeiro'), ('RN', 'Rio Grande do Norte'), ('RS', 'Rio Grande do Sul'), ('RO', 'Rondônia'), ('RR', 'Roraima'), ('SC', 'Santa Catarina'), ('SP', 'São Paulo'), ('SE', 'Sergipe'), ('TO', 'Tocantins')], max_length=2, verbose_name='UF')),
+                ('species', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='state_links', to='apiary.species', verbose_name='Espécie')),
+            ],
+            options={
+                'verbose_name': 'UF da espécie',
+                'verbose_name_plural': 'UFs das espécies',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='speciesstate',
+            constraint=models.UniqueConstraint(fields=('state', 'species'), name='species_state_unique'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+from django.db import migrations
+
+
+def populate_species_states(apps, schema_editor):
+    Species = apps.get_model("apiary", "Species")
+    SpeciesState = apps.get_model("apiary", "SpeciesState")
+
+    valid_states = {code for code, _ in SpeciesState._meta.get_field("state").choices}
+    SpeciesState.objects.bulk_create(
+        [
+            SpeciesState(species_id=species_id, state=state)
+            for species_id, states in Species.objects.values_list("pk", "states")
+            for state in dict.fromkeys(states or [])
+            if state in valid_states
+        ],
+        batch_size=500,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apiary', '0028_speciesstate'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_species_states, migrations.RunPython.noop),
+    ]
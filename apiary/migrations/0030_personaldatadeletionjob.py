@@ -0,0 +1,40 @@
+# Generated by Django 4.2.16 on 2026-10-16 23:57
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('apiary', '0029_populate_speciesstate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PersonalDataDeletionJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.UUIDField(default=uuid.uuid4, editable=False, unique=True, verbose_name='Código')),
+                ('status', models.CharField(choices=[('pendente', 'Pendente'), ('processando', 'Processando'), ('concluida', 'Concluída'), ('falhou', 'Falhou')], default='pendente', max_length=20, verbose_name='Situação')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Tentativas')),
+                ('total_items', models.PositiveIntegerField(default=0, verbose_name='Registros a excluir')),
+                ('deleted_items', models.PositiveIntegerField(default=0, verbose_name='Registros excluídos')),
+                ('last_error', models.TextField(blank=True, verbose_name='Último erro')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Solicitado em')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Iniciado em')),
+                ('updated_at', models.DateTimeField(blank=True, null=True, verbose_name='Último progresso em')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Finalizado em')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Usuário')),
+            ],
+            options={
+                'verbose_name': 'Exclusão de dados pessoais',
+                'verbose_name_plural': 'Exclusões de dados pessoais',
+                'ordering': ['-created_at', '-pk'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='deletion_job_status_created')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.16 on 2026-10-17 00:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apiary', '0030_personaldatadeletionjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hive',
+            name='search_name',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=255),
+        ),
+    ]
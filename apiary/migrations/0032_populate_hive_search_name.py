@@ -0,0 +1,22 @@
+from django.db import migrations
+
+from apiary.utils.text import search_key
+
+
+def populate_search_names(apps, schema_editor):
+    Hive = apps.get_model("apiary", "Hive")
+    hives = list(Hive.objects.only("pk", "popular_name"))
+    for hive in hives:
+        hive.search_name = search_key(hive.popular_name)
+    Hive.objects.bulk_update(hives, ["search_name"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apiary', '0031_hive_search_name'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_search_names, migrations.RunPython.noop),
+    ]
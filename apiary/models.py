@@ -1,40 +1,148 @@
 from __future__ import annotations
 
 import calendar
+import threading
 import uuid
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta
 
 from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
 from django.core.files.uploadedfile import UploadedFile
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, DecimalField, F, Max, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest, TruncMonth
+from django.db.models.signals import post_delete
+from django.utils import timezone
 from PIL import UnidentifiedImageError
 
 
 def generate_hive_identifier() -> str:
     """Generate a unique identifier for a hive."""
-    prefix = "COL"
-    while True:
-        identifier = f"{prefix}-{uuid.uuid4().hex[:8].upper()}"
-        if not Hive.objects.filter(identification_number=identifier).exists():
-            return identifier
+    return hive_identifiers.allocate()[0]
 
 
-from .utils.images import convert_image_to_webp
+from .storage import image_storage
+from .utils.dashboard_cache import bump_data_version
+from .utils.identifiers import hive_identifiers
+from .utils.text import search_key, split_city_name
+from .utils.images import (
+    ImageTooLargeError,
+    convert_image_to_webp,
+    ensure_image,
+    store_renditions,
+)
 
 
-def _convert_image_field_to_webp(field_file, *, field_name: str) -> None:
+def _convert_image_field_to_webp(field_file, *, field_name: str) -> bool:
+    """Convert a freshly uploaded image to WebP.
+
+    With ``IMAGE_CONVERSION_ASYNC`` the upload is only validated and stored as
+    is, and ``True`` is returned so the caller enqueues an
+    ``ImageConversionJob`` once the instance has been saved.
+    """
     file_obj = getattr(field_file, "file", None)
     if not file_obj or not isinstance(file_obj, UploadedFile):
-        return
+        return False
 
     original_name = getattr(file_obj, "name", field_file.name)
     try:
+        if getattr(settings, "IMAGE_CONVERSION_ASYNC", False):
+            ensure_image(file_obj)
+            return True
         converted = convert_image_to_webp(file_obj, original_name=original_name)
     except UnidentifiedImageError as exc:
         raise ValidationError({field_name: "Envie uma imagem válida."}) from exc
+    except ImageTooLargeError as exc:
+        raise ValidationError(
+            {field_name: "A imagem é grande demais. Envie uma foto com resolução menor."}
+        ) from exc
 
     field_file.save(converted.name, converted, save=False)
+    return False
+
+
+def _convert_image_fields(instance, *field_names: str) -> tuple[list[str], list[str]]:
+    """Convert the uploaded images of ``instance``.
+
+    Returns the fields converted right away and the fields left for the
+    background worker.
+    """
+    converted, deferred = [], []
+    for field_name in field_names:
+        field_file = getattr(instance, field_name)
+        if not field_file or not isinstance(getattr(field_file, "file", None), UploadedFile):
+            continue
+        if _convert_image_field_to_webp(field_file, field_name=field_name):
+            deferred.append(field_name)
+        else:
+            converted.append(field_name)
+    return converted, deferred
+
+
+def _replaced_image_names(instance, *field_names: str, update_fields=None) -> list[tuple]:
+    """Return ``(storage, name)`` of the stored images this save replaces or clears.
+
+    Each row holds one reference per image, so the previous file is released
+    even when a new upload has the same content-addressed name.
+    """
+    if instance._state.adding or instance.pk is None:
+        return []
+    if update_fields is not None:
+        field_names = [name for name in field_names if name in update_fields]
+    if not field_names:
+        return []
+    previous = type(instance)._base_manager.filter(pk=instance.pk).values(*field_names).first()
+    if previous is None:
+        return []
+    replaced = []
+    for field_name in field_names:
+        field_file = getattr(instance, field_name)
+        old_name = previous[field_name]
+        if old_name and (not field_file._committed or field_file.name != old_name):
+            replaced.append((field_file.storage, old_name))
+    return replaced
+
+
+def _release_images(images) -> None:
+    """Drop the references of ``images``; unused files go after the commit."""
+    for storage, name in images:
+        storage.delete(name)
+
+
+def _month_start(value: datetime) -> date:
+    """Return the first day of the month of ``value`` in the current timezone."""
+    if timezone.is_aware(value):
+        value = timezone.localtime(value)
+    return value.date().replace(day=1)
+
+
+def _month_bounds(month: date) -> tuple[datetime, datetime]:
+    """Return the aware ``[start, end)`` datetimes covering ``month``."""
+    tz = timezone.get_current_timezone()
+    if month.month == 12:
+        next_month = date(month.year + 1, 1, 1)
+    else:
+        next_month = date(month.year, month.month + 1, 1)
+    return (
+        timezone.make_aware(datetime.combine(month, time.min), tz),
+        timezone.make_aware(datetime.combine(next_month, time.min), tz),
+    )
+
+
+class SpeciesQuerySet(models.QuerySet):
+    def found_in(self, state: str) -> "SpeciesQuerySet":
+        """Species whose ``states`` include ``state``, via the indexed UF table."""
+        return self.filter(
+            pk__in=SpeciesState.objects.filter(state=state.upper()).values("species_id")
+        )
+
+    def without_states(self) -> "SpeciesQuerySet":
+        """Species with no UF recorded, which may occur anywhere."""
+        return self.exclude(pk__in=SpeciesState.objects.values("species_id"))
 
 
 class Species(models.Model):
@@ -71,6 +179,7 @@ class Species(models.Model):
         ("SE", "Sergipe"),
         ("TO", "Tocantins"),
     ]
+    STATE_CODES = frozenset(dict(BRAZILIAN_STATES))
 
     group = models.CharField(
         "Grupo",
@@ -93,6 +202,8 @@ class Species(models.Model):
         null=True,
     )
 
+    objects = SpeciesQuerySet.as_manager()
+
     class Meta:
         verbose_name_plural = "Espécies"
         ordering = ["popular_name", "scientific_name"]
@@ -106,7 +217,7 @@ class Species(models.Model):
         if self.states:
             if not isinstance(self.states, list):
                 raise ValidationError({"states": "Informe as UFs como uma lista."})
-            invalid_states = [state for state in self.states if state not in dict(self.BRAZILIAN_STATES)]
+            invalid_states = [state for state in self.states if state not in self.STATE_CODES]
             if invalid_states:
                 raise ValidationError({
                     "states": "Estados inválidos informados: {}".format(
@@ -116,7 +227,59 @@ class Species(models.Model):
 
     def save(self, *args, **kwargs):
         self.full_clean()
-        return super().save(*args, **kwargs)
+        with transaction.atomic():
+            result = super().save(*args, **kwargs)
+            SpeciesState.objects.sync([self])
+        return result
+
+
+class SpeciesStateQuerySet(models.QuerySet):
+    def sync(self, species_list) -> None:
+        """Make the rows of ``species_list`` match their ``states`` lists."""
+        species_ids = [species.pk for species in species_list]
+        wanted = {
+            (species.pk, state) for species in species_list for state in species.states or []
+        }
+        current = set(
+            self.filter(species_id__in=species_ids).values_list("species_id", "state")
+        )
+        stale_by_state = {}
+        for species_id, state in current - wanted:
+            stale_by_state.setdefault(state, []).append(species_id)
+        for state, stale_ids in stale_by_state.items():
+            self.filter(state=state, species_id__in=stale_ids).delete()
+        self.bulk_create(
+            [
+                SpeciesState(species_id=species_id, state=state)
+                for species_id, state in wanted - current
+            ],
+            batch_size=500,
+            ignore_conflicts=True,
+        )
+
+
+class SpeciesState(models.Model):
+    """One row per UF in ``Species.states``, indexed by UF for filtering."""
+
+    species = models.ForeignKey(
+        Species,
+        on_delete=models.CASCADE,
+        related_name="state_links",
+        verbose_name="Espécie",
+    )
+    state = models.CharField("UF", max_length=2, choices=Species.BRAZILIAN_STATES)
+
+    objects = SpeciesStateQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "UF da espécie"
+        verbose_name_plural = "UFs das espécies"
+        constraints = [
+            models.UniqueConstraint(fields=["state", "species"], name="species_state_unique"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.species_id} ({self.state})"
 
 
 class ApiaryQuerySet(models.QuerySet):
@@ -125,6 +288,68 @@ class ApiaryQuerySet(models.QuerySet):
             return self
         return self.filter(owner=user)
 
+    def update(self, **kwargs):
+        owner_ids = set(self.values_list("owner_id", flat=True))
+        rows = super().update(**kwargs)
+        owner_ids.add(getattr(kwargs.get("owner"), "pk", kwargs.get("owner_id")))
+        bump_data_version(owner_ids)
+        return rows
+
+    def delete(self):
+        owner_ids = set(self.values_list("owner_id", flat=True))
+        result = super().delete()
+        bump_data_version(owner_ids)
+        return result
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+    def adjust_hive_counts(self, deltas: dict[int | None, int]) -> None:
+        """Apply ``{apiary_id: delta}`` to ``hive_count`` with atomic increments."""
+        by_delta: dict[int, list[int]] = {}
+        for apiary_id, delta in deltas.items():
+            if apiary_id is not None and delta:
+                by_delta.setdefault(delta, []).append(apiary_id)
+        for delta, apiary_ids in by_delta.items():
+            # Plain QuerySet.update: the counter is not dashboard data.
+            models.QuerySet.update(
+                self.filter(pk__in=apiary_ids),
+                hive_count=Greatest(F("hive_count") + delta, Value(0)),
+            )
+
+    def reconcile_hive_counts(self, *, batch_size: int = 500) -> int:
+        """Recount ``hive_count`` in batches. Returns how many apiaries drifted."""
+        actual = Subquery(
+            Hive.objects.filter(apiary=OuterRef("pk"))
+            .order_by()
+            .values("apiary")
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+        repaired = 0
+        last_pk = 0
+        while True:
+            batch = list(
+                self.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not batch:
+                return repaired
+            last_pk = batch[-1]
+            with transaction.atomic(using=self.db):
+                drifted = list(
+                    self.filter(pk__in=batch)
+                    .annotate(actual=Coalesce(actual, Value(0)))
+                    .exclude(hive_count=F("actual"))
+                    .values_list("pk", flat=True)
+                )
+                if drifted:
+                    models.QuerySet.update(
+                        self.filter(pk__in=drifted), hive_count=Coalesce(actual, Value(0))
+                    )
+            repaired += len(drifted)
+
 
 class BoxModel(models.Model):
     name = models.CharField("Nome", max_length=255, unique=True)
@@ -139,8 +364,38 @@ class BoxModel(models.Model):
         return self.name
 
 
+class CityQuerySet(models.QuerySet):
+    def search(self, term: str, state: str | None = None) -> "CityQuerySet":
+        """Cities whose name starts with ``term``, ignoring case and accents.
+
+        ``"sao jo"`` matches "São José - SC"; a trailing ``" - UF"`` in the
+        term, or ``state``, narrows the result to one state.
+        """
+        city, term_state = split_city_name(term)
+        queryset = self
+        if state or term_state:
+            queryset = queryset.filter(state=(state or term_state).upper())
+        key = search_key(city)
+        if key:
+            queryset = queryset.filter(search_name__startswith=key)
+        return queryset
+
+
 class City(models.Model):
     name = models.CharField("Nome", max_length=255, unique=True)
+    state = models.CharField(
+        "UF",
+        max_length=2,
+        choices=Species.BRAZILIAN_STATES,
+        blank=True,
+        db_index=True,
+        editable=False,
+    )
+    # Unaccented, lowercased city name; db_index also creates the
+    # ``varchar_pattern_ops`` index PostgreSQL needs for prefix LIKE.
+    search_name = models.CharField(max_length=255, default="", db_index=True, editable=False)
+
+    objects = CityQuerySet.as_manager()
 
     class Meta:
         verbose_name = "Cidade"
@@ -150,6 +405,18 @@ class City(models.Model):
     def __str__(self) -> str:
         return self.name
 
+    def refresh_search_fields(self) -> None:
+        """Derive ``state`` and ``search_name`` from ``"Cidade - UF"``."""
+        city, self.state = split_city_name(self.name)
+        self.search_name = search_key(city)
+
+    def save(self, *args, **kwargs):
+        self.refresh_search_fields()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "name" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "state", "search_name"}
+        return super().save(*args, **kwargs)
+
 
 class Season(models.Model):
     name = models.CharField("Nome", max_length=50, unique=True)
@@ -232,7 +499,12 @@ class Apiary(models.Model):
         blank=True,
     )
     photo = models.ImageField(
-        "Foto do meliponário", upload_to="apiary_photos/", blank=True, null=True
+        "Foto do meliponário",
+        upload_to="apiary_photos/",
+        storage=image_storage,
+        max_length=255,
+        blank=True,
+        null=True,
     )
     hive_count = models.PositiveIntegerField(
         "Qtd. de colmeias vinculadas", default=0, editable=False
@@ -250,23 +522,159 @@ class Apiary(models.Model):
         return self.name
 
     def update_hive_count(self) -> None:
+        """Recount the hives of this apiary; used to repair drift."""
         total = self.hives.count()
-        Apiary.objects.filter(pk=self.pk).update(hive_count=total)
+        models.QuerySet.update(Apiary.objects.filter(pk=self.pk), hive_count=total)
         self.hive_count = total
 
     def save(self, *args, **kwargs):
+        previous_owner_id = None
+        if self.pk:
+            previous_owner_id = (
+                Apiary.objects.filter(pk=self.pk).values_list("owner_id", flat=True).first()
+            )
         self.full_clean()
-        if self.photo:
-            _convert_image_field_to_webp(self.photo, field_name="photo")
-        return super().save(*args, **kwargs)
+        replaced_images = _replaced_image_names(
+            self, "photo", update_fields=kwargs.get("update_fields")
+        )
+        converted_images, deferred_images = _convert_image_fields(self, "photo")
+        result = super().save(*args, **kwargs)
+        _release_images(replaced_images)
+        ImageRendition.objects.generate_for(self, converted_images)
+        ImageConversionJob.objects.enqueue(self, deferred_images)
+        bump_data_version([self.owner_id, previous_owner_id])
+        return result
+
+    def delete(self, *args, **kwargs):
+        owner_id = self.owner_id
+        result = super().delete(*args, **kwargs)
+        bump_data_version([owner_id])
+        return result
 
 
 class HiveQuerySet(models.QuerySet):
+    ROLLUP_FIELDS = ("owner", "apiary", "species")
+
     def owned_by(self, user) -> "HiveQuerySet":
         if user.is_superuser:
             return self
         return self.filter(owner=user)
 
+    def update(self, **kwargs):
+        synced_fields = [
+            field for field in self.ROLLUP_FIELDS if field in kwargs or f"{field}_id" in kwargs
+        ]
+        if isinstance(kwargs.get("popular_name"), str):
+            kwargs["search_name"] = search_key(kwargs["popular_name"])
+        with transaction.atomic(using=self.db):
+            queryset = self.select_for_update(of=("self",)) if synced_fields else self
+            before = {
+                pk: (owner_id, apiary_id)
+                for pk, owner_id, apiary_id in queryset.values_list("pk", "owner_id", "apiary_id")
+            }
+            rows = super().update(**kwargs)
+            owner_ids = {owner_id for owner_id, _ in before.values()}
+            if synced_fields:
+                # Values may be expressions (bulk_update passes Case/When on
+                # the hive pk), so read back what each hive ended up with.
+                after = {
+                    pk: (owner_id, apiary_id)
+                    for pk, owner_id, apiary_id in Hive.objects.filter(pk__in=before).values_list(
+                        "pk", "owner_id", "apiary_id"
+                    )
+                }
+                MonthlyHarvestRollup.objects.filter(hive_id__in=before).update(
+                    **{
+                        f"{field}_id": self._rollup_value(kwargs, field)
+                        for field in synced_fields
+                    }
+                )
+                deltas = Counter()
+                for pk, (_, apiary_id) in after.items():
+                    if apiary_id != before[pk][1]:
+                        deltas[before[pk][1]] -= 1
+                        deltas[apiary_id] += 1
+                Apiary.objects.adjust_hive_counts(deltas)
+                owner_ids.update(owner_id for owner_id, _ in after.values())
+        bump_data_version(owner_ids)
+        return rows
+
+    @staticmethod
+    def _rollup_value(kwargs, field: str):
+        """Plain value for ``field`` if ``kwargs`` has one, else the hive's own column.
+
+        ``bulk_update`` passes ``Case(When(pk=<hive pk>))`` expressions, which
+        must not be evaluated against the rollup rows.
+        """
+        value = kwargs[field] if field in kwargs else kwargs[f"{field}_id"]
+        if isinstance(value, models.Model):
+            return value.pk
+        if not hasattr(value, "resolve_expression"):
+            return value
+        return Subquery(Hive.objects.filter(pk=OuterRef("hive_id")).values(f"{field}_id")[:1])
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        missing = [hive for hive in objs if not hive.identification_number]
+        for hive in objs:
+            hive.search_name = search_key(hive.popular_name)
+        with transaction.atomic(using=self.db):
+            for hive, code in zip(missing, hive_identifiers.allocate(len(missing))):
+                hive.identification_number = code
+            created = super().bulk_create(objs, *args, **kwargs)
+            Apiary.objects.adjust_hive_counts(Counter(hive.apiary_id for hive in created))
+        bump_data_version({hive.owner_id for hive in created})
+        return created
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        if "popular_name" in fields:
+            for hive in objs:
+                hive.search_name = search_key(hive.popular_name)
+            fields = [*fields, "search_name"]
+        return super().bulk_update(objs, fields, *args, **kwargs)
+
+    def delete(self):
+        with transaction.atomic(using=self.db):
+            affected = list(
+                self.select_for_update(of=("self",)).values_list("owner_id", "apiary_id")
+            )
+            result = super().delete()
+            deltas = Counter()
+            deltas.subtract(apiary_id for _, apiary_id in affected)
+            Apiary.objects.adjust_hive_counts(deltas)
+        bump_data_version({owner_id for owner_id, _ in affected})
+        return result
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+
+class HiveIdentifierSequenceQuerySet(models.QuerySet):
+    def reserve(self, prefix: str, count: int) -> int:
+        """Reserve ``count`` consecutive numbers and return the first one."""
+        with transaction.atomic(using=self.db):
+            self.get_or_create(prefix=prefix)
+            sequence = self.select_for_update().get(prefix=prefix)
+            self.filter(pk=sequence.pk).update(next_value=F("next_value") + count)
+        return sequence.next_value
+
+
+class HiveIdentifierSequence(models.Model):
+    """Next free number of the hive identifier allocator."""
+
+    prefix = models.CharField("Prefixo", max_length=10, unique=True)
+    next_value = models.BigIntegerField("Próximo número", default=0)
+
+    objects = HiveIdentifierSequenceQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "Sequência de identificadores de colmeias"
+        verbose_name_plural = "Sequências de identificadores de colmeias"
+
+    def __str__(self) -> str:
+        return f"{self.prefix}: {self.next_value}"
+
 
 class Hive(models.Model):
     class AcquisitionMethod(models.TextChoices):
@@ -289,7 +697,6 @@ class Hive(models.Model):
         max_length=20,
         unique=True,
         editable=False,
-        default=generate_hive_identifier,
     )
     owner = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -298,6 +705,9 @@ class Hive(models.Model):
         verbose_name="Proprietário",
     )
     popular_name = models.CharField("Nome popular", max_length=255)
+    # Unaccented, lowercased popular name for the hive selector's prefix search;
+    # db_index also creates the ``varchar_pattern_ops`` index PostgreSQL needs.
+    search_name = models.CharField(max_length=255, default="", db_index=True, editable=False)
     species = models.ForeignKey(
         Species,
         on_delete=models.PROTECT,
@@ -305,7 +715,12 @@ class Hive(models.Model):
         verbose_name="Espécie",
     )
     photo = models.ImageField(
-        "Foto da colmeia", upload_to="hive_photos/", blank=True, null=True
+        "Foto da colmeia",
+        upload_to="hive_photos/",
+        storage=image_storage,
+        max_length=255,
+        blank=True,
+        null=True,
     )
     apiary = models.ForeignKey(
         Apiary,
@@ -375,6 +790,9 @@ class Hive(models.Model):
         verbose_name = "Colmeia"
         verbose_name_plural = "Colmeias"
         ordering = ["-acquisition_date", "identification_number"]
+        indexes = [
+            models.Index(fields=["owner", "popular_name"], name="hive_owner_popular_name"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.identification_number} - {self.popular_name}"
@@ -405,39 +823,124 @@ class Hive(models.Model):
                 )
 
     def save(self, *args, **kwargs):
-        previous_apiary_id = None
-        if self.pk:
-            previous_apiary_id = (
-                Hive.objects.filter(pk=self.pk)
-                .values_list("apiary_id", flat=True)
-                .first()
-            )
+        if not self.identification_number:
+            self.identification_number = hive_identifiers.allocate()[0]
+        self.search_name = search_key(self.popular_name)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "popular_name" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "search_name"}
         self.full_clean()
-        if self.photo:
-            _convert_image_field_to_webp(self.photo, field_name="photo")
-        super().save(*args, **kwargs)
-        if previous_apiary_id and previous_apiary_id != self.apiary_id:
-            previous_apiary = Apiary.objects.filter(pk=previous_apiary_id).first()
-            if previous_apiary:
-                previous_apiary.update_hive_count()
-        if self.apiary_id and self.apiary:
-            self.apiary.update_hive_count()
+        replaced_images = _replaced_image_names(
+            self, "photo", update_fields=kwargs.get("update_fields")
+        )
+        converted_images, deferred_images = _convert_image_fields(self, "photo")
+        with transaction.atomic():
+            previous = None
+            if self.pk:
+                # The row lock keeps the apiary counters exact when the same
+                # hive is moved by concurrent requests.
+                previous = (
+                    Hive.objects.select_for_update(of=("self",))
+                    .filter(pk=self.pk)
+                    .values_list("apiary_id", "owner_id", "species_id")
+                    .first()
+                )
+            previous_apiary_id = previous[0] if previous else None
+            super().save(*args, **kwargs)
+            _release_images(replaced_images)
+            ImageConversionJob.objects.enqueue(self, deferred_images)
+            if previous and previous != (self.apiary_id, self.owner_id, self.species_id):
+                MonthlyHarvestRollup.objects.filter(hive_id=self.pk).update(
+                    apiary_id=self.apiary_id,
+                    owner_id=self.owner_id,
+                    species_id=self.species_id,
+                )
+            if previous is None or previous_apiary_id != self.apiary_id:
+                Apiary.objects.adjust_hive_counts({previous_apiary_id: -1, self.apiary_id: 1})
+        ImageRendition.objects.generate_for(self, converted_images)
+        bump_data_version([self.owner_id, previous[1] if previous else None])
 
     def delete(self, *args, **kwargs):
-        apiary_id = self.apiary_id
-        super().delete(*args, **kwargs)
-        if apiary_id:
-            apiary = Apiary.objects.filter(pk=apiary_id).first()
-            if apiary:
-                apiary.update_hive_count()
+        owner_id = self.owner_id
+        with transaction.atomic():
+            apiary_id = (
+                Hive.objects.select_for_update(of=("self",))
+                .filter(pk=self.pk)
+                .values_list("apiary_id", flat=True)
+                .first()
+            )
+            result = super().delete(*args, **kwargs)
+            Apiary.objects.adjust_hive_counts({apiary_id: -1})
+        bump_data_version([owner_id])
+        return result
 
 
 class RevisionQuerySet(models.QuerySet):
+    ROLLUP_FIELDS = {
+        "hive",
+        "hive_id",
+        "review_date",
+        "review_type",
+        "honey_harvest_amount",
+        "propolis_harvest_amount",
+        "wax_harvest_amount",
+        "pollen_harvest_amount",
+    }
+
     def owned_by(self, user) -> "RevisionQuerySet":
         if user.is_superuser:
             return self
         return self.filter(hive__owner=user)
 
+    def _invalidate_hives(self, hive_ids, *, rebuild_rollups: bool = True) -> None:
+        if rebuild_rollups:
+            MonthlyHarvestRollup.objects.rebuild_for_hives(hive_ids)
+            HiveActivitySummary.objects.rebuild_for_hives(hive_ids)
+        bump_data_version(
+            Hive.objects.filter(pk__in=hive_ids).values_list("owner_id", flat=True).distinct()
+        )
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        with transaction.atomic(using=self.db):
+            created = super().bulk_create(objs, *args, **kwargs)
+            self._invalidate_hives({obj.hive_id for obj in objs})
+        return created
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        with transaction.atomic(using=self.db):
+            pks = [obj.pk for obj in objs]
+            hive_ids = set(self.filter(pk__in=pks).values_list("hive_id", flat=True))
+            rows = super().bulk_update(objs, fields, *args, **kwargs)
+            hive_ids.update(obj.hive_id for obj in objs)
+            self._invalidate_hives(
+                hive_ids, rebuild_rollups=bool(self.ROLLUP_FIELDS.intersection(fields))
+            )
+        return rows
+
+    def update(self, **kwargs):
+        with transaction.atomic(using=self.db):
+            hive_ids = set(self.values_list("hive_id", flat=True))
+            rows = super().update(**kwargs)
+            target_hive = kwargs.get("hive_id", kwargs.get("hive"))
+            if target_hive is not None:
+                hive_ids.add(getattr(target_hive, "pk", target_hive))
+            self._invalidate_hives(
+                hive_ids, rebuild_rollups=bool(self.ROLLUP_FIELDS.intersection(kwargs))
+            )
+        return rows
+
+    def delete(self):
+        with transaction.atomic(using=self.db):
+            hive_ids = set(self.values_list("hive_id", flat=True))
+            result = super().delete()
+            self._invalidate_hives(hive_ids)
+        return result
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
 
 class Revision(models.Model):
     class RevisionType(models.TextChoices):
@@ -613,18 +1116,54 @@ class Revision(models.Model):
         super().clean()
         return None
 
+    def _stored_activity(self) -> dict[str, object] | None:
+        if not self.pk:
+            return None
+        return (
+            Revision.objects.filter(pk=self.pk)
+            .values(*ACTIVITY_FIELDS, owner_id=F("hive__owner_id"))
+            .first()
+        )
+
     def save(self, *args, **kwargs):
+        previous = self._stored_activity()
         self.full_clean()
-        super().save(*args, **kwargs)
-        Hive.objects.filter(pk=self.hive_id).update(last_review_date=self.review_date)
+        current = {field: getattr(self, field) for field in ACTIVITY_FIELDS}
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            changed = previous is None or any(
+                previous[field] != current[field] for field in ACTIVITY_FIELDS
+            )
+            if changed:
+                if previous:
+                    HiveActivitySummary.objects.discard_revision(previous)
+                HiveActivitySummary.objects.record_revision(current)
+                HiveActivitySummary.objects.sync_hive_review_dates(
+                    {self.hive_id, previous["hive_id"] if previous else None} - {None}
+                )
+            buckets = set()
+            if self.review_type == self.RevisionType.HARVEST:
+                buckets.add((self.hive_id, _month_start(self.review_date)))
+            if previous and previous["review_type"] == self.RevisionType.HARVEST:
+                buckets.add((previous["hive_id"], _month_start(previous["review_date"])))
+            for hive_id, month in buckets:
+                MonthlyHarvestRollup.objects.refresh_bucket(hive_id, month)
+        bump_data_version([self.hive.owner_id, previous["owner_id"] if previous else None])
 
     def delete(self, *args, **kwargs):
-        hive_id = self.hive_id
-        super().delete(*args, **kwargs)
-        latest_review = Revision.objects.filter(hive_id=hive_id).order_by("-review_date").first()
-        Hive.objects.filter(pk=hive_id).update(
-            last_review_date=latest_review.review_date if latest_review else None
-        )
+        with transaction.atomic():
+            stored = self._stored_activity()
+            result = super().delete(*args, **kwargs)
+            if stored:
+                HiveActivitySummary.objects.discard_revision(stored)
+                HiveActivitySummary.objects.sync_hive_review_dates([stored["hive_id"]])
+                if stored["review_type"] == self.RevisionType.HARVEST:
+                    MonthlyHarvestRollup.objects.refresh_bucket(
+                        stored["hive_id"], _month_start(stored["review_date"])
+                    )
+        if stored:
+            bump_data_version([stored["owner_id"]])
+        return result
 
 
 class RevisionAttachment(models.Model):
@@ -634,7 +1173,9 @@ class RevisionAttachment(models.Model):
         related_name="attachments",
         verbose_name="Revisão",
     )
-    file = models.ImageField("Imagem", upload_to="revision_attachments/")
+    file = models.ImageField(
+        "Imagem", upload_to="revision_attachments/", storage=image_storage, max_length=255
+    )
 
     class Meta:
         verbose_name = "Anexo da Revisão"
@@ -645,9 +1186,301 @@ class RevisionAttachment(models.Model):
 
     def save(self, *args, **kwargs):
         self.full_clean()
-        if self.file:
-            _convert_image_field_to_webp(self.file, field_name="file")
-        return super().save(*args, **kwargs)
+        replaced_images = _replaced_image_names(
+            self, "file", update_fields=kwargs.get("update_fields")
+        )
+        converted_images, deferred_images = _convert_image_fields(self, "file")
+        result = super().save(*args, **kwargs)
+        _release_images(replaced_images)
+        ImageRendition.objects.generate_for(self, converted_images)
+        ImageConversionJob.objects.enqueue(self, deferred_images)
+        return result
+
+
+def _harvest_totals() -> dict[str, object]:
+    return {
+        "honey_amount": Coalesce(Sum("honey_harvest_amount"), Value(0), output_field=DecimalField()),
+        "propolis_amount": Coalesce(Sum("propolis_harvest_amount"), Value(0), output_field=DecimalField()),
+        "wax_amount": Coalesce(Sum("wax_harvest_amount"), Value(0), output_field=DecimalField()),
+        "pollen_amount": Coalesce(Sum("pollen_harvest_amount"), Value(0), output_field=DecimalField()),
+        "harvest_count": Count("id"),
+        "last_review_date": Max("review_date"),
+    }
+
+
+class MonthlyHarvestRollupQuerySet(models.QuerySet):
+    def owned_by(self, user) -> "MonthlyHarvestRollupQuerySet":
+        if user.is_superuser:
+            return self
+        return self.filter(owner=user)
+
+    def _build_rows(self, revisions) -> list["MonthlyHarvestRollup"]:
+        """Aggregate harvest ``revisions`` into unsaved rollup rows."""
+        grouped = (
+            revisions.filter(review_type=Revision.RevisionType.HARVEST)
+            .annotate(month=TruncMonth("review_date"))
+            .values("hive_id", "hive__owner_id", "hive__apiary_id", "hive__species_id", "month")
+            .annotate(**_harvest_totals())
+            .order_by()
+        )
+        return [
+            self.model(
+                owner_id=row["hive__owner_id"],
+                hive_id=row["hive_id"],
+                apiary_id=row["hive__apiary_id"],
+                species_id=row["hive__species_id"],
+                month=_month_start(row["month"]),
+                honey_amount=row["honey_amount"],
+                propolis_amount=row["propolis_amount"],
+                wax_amount=row["wax_amount"],
+                pollen_amount=row["pollen_amount"],
+                harvest_count=row["harvest_count"],
+                last_review_date=row["last_review_date"],
+            )
+            for row in grouped
+        ]
+
+    def refresh_bucket(self, hive_id: int, month: date) -> None:
+        """Recompute the rollup row of a single ``(hive, month)`` pair."""
+        start, end = _month_bounds(month)
+        revisions = Revision.objects.filter(
+            hive_id=hive_id, review_date__gte=start, review_date__lt=end
+        )
+        with transaction.atomic(using=self.db):
+            rows = self._build_rows(revisions)
+            self.filter(hive_id=hive_id, month=month).delete()
+            self.bulk_create(rows)
+
+    def rebuild_for_hives(self, hive_ids) -> None:
+        """Recompute every rollup row of the given hives."""
+        hive_ids = [hive_id for hive_id in hive_ids if hive_id is not None]
+        if not hive_ids:
+            return
+        with transaction.atomic(using=self.db):
+            rows = self._build_rows(Revision.objects.filter(hive_id__in=hive_ids))
+            self.filter(hive_id__in=hive_ids).delete()
+            self.bulk_create(rows)
+
+    def rebuild_all(self, *, batch_size: int = 500) -> int:
+        """Drop and regenerate the whole rollup table. Returns the row count."""
+        with transaction.atomic(using=self.db):
+            self.all().delete()
+            rows = self._build_rows(Revision.objects.all())
+            self.bulk_create(rows, batch_size=batch_size)
+        return len(rows)
+
+
+class MonthlyHarvestRollup(models.Model):
+    """Harvest totals per hive and month, kept in sync by ``Revision`` writes."""
+
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="harvest_rollups",
+        verbose_name="Proprietário",
+    )
+    hive = models.ForeignKey(
+        Hive,
+        on_delete=models.CASCADE,
+        related_name="harvest_rollups",
+        verbose_name="Colmeia",
+    )
+    apiary = models.ForeignKey(
+        Apiary,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="harvest_rollups",
+        verbose_name="Meliponário/Apiário",
+    )
+    species = models.ForeignKey(
+        Species,
+        on_delete=models.CASCADE,
+        related_name="harvest_rollups",
+        verbose_name="Espécie",
+    )
+    month = models.DateField("Mês")
+    honey_amount = models.DecimalField(
+        "Mel colhido (ml)", max_digits=14, decimal_places=2, default=0
+    )
+    propolis_amount = models.DecimalField(
+        "Própolis colhida (g)", max_digits=14, decimal_places=2, default=0
+    )
+    wax_amount = models.DecimalField(
+        "Cera colhida (g)", max_digits=14, decimal_places=2, default=0
+    )
+    pollen_amount = models.DecimalField(
+        "Pólen colhido (g)", max_digits=14, decimal_places=2, default=0
+    )
+    harvest_count = models.PositiveIntegerField("Qtd. de colheitas", default=0)
+    last_review_date = models.DateTimeField("Última colheita", null=True, blank=True)
+
+    objects = MonthlyHarvestRollupQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "Consolidado mensal de colheitas"
+        verbose_name_plural = "Consolidados mensais de colheitas"
+        ordering = ["month"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["hive", "month"],
+                name="unique_harvest_rollup_per_hive_month",
+            )
+        ]
+        indexes = [
+            models.Index(fields=["owner", "month"], name="harvest_rollup_owner_month"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.hive} - {self.month:%m/%Y}"
+
+
+HARVEST_TOTAL_FIELDS = (
+    ("honey_total", "honey_harvest_amount"),
+    ("propolis_total", "propolis_harvest_amount"),
+    ("wax_total", "wax_harvest_amount"),
+    ("pollen_total", "pollen_harvest_amount"),
+)
+ACTIVITY_FIELDS = ("hive_id", "review_date", "review_type") + tuple(
+    amount_field for _, amount_field in HARVEST_TOTAL_FIELDS
+)
+
+
+class HiveActivitySummaryQuerySet(models.QuerySet):
+    def _latest(self, **filters):
+        return Subquery(
+            Revision.objects.filter(hive_id=OuterRef("hive_id"), **filters)
+            .order_by("-review_date")
+            .values("review_date")[:1]
+        )
+
+    def record_revision(self, values: dict[str, object]) -> None:
+        """Add one revision (``ACTIVITY_FIELDS`` values) to its hive summary."""
+        review_date = Value(values["review_date"], output_field=models.DateTimeField())
+        updates = {
+            "revision_count": F("revision_count") + 1,
+            "last_review_date": Greatest(Coalesce("last_review_date", review_date), review_date),
+        }
+        if values["review_type"] == Revision.RevisionType.HARVEST:
+            updates["harvest_count"] = F("harvest_count") + 1
+            updates["last_harvest_date"] = Greatest(
+                Coalesce("last_harvest_date", review_date), review_date
+            )
+            for total_field, amount_field in HARVEST_TOTAL_FIELDS:
+                if values[amount_field]:
+                    updates[total_field] = F(total_field) + values[amount_field]
+        self.get_or_create(hive_id=values["hive_id"])
+        self.filter(hive_id=values["hive_id"]).update(**updates)
+
+    def discard_revision(self, values: dict[str, object]) -> None:
+        """Remove one revision from its hive summary.
+
+        The latest dates are only recomputed when the removed revision was the
+        latest one, which covers backdated edits without a full recount.
+        """
+        hive_id = values["hive_id"]
+        updates = {"revision_count": Greatest(F("revision_count") - 1, Value(0))}
+        is_harvest = values["review_type"] == Revision.RevisionType.HARVEST
+        if is_harvest:
+            updates["harvest_count"] = Greatest(F("harvest_count") - 1, Value(0))
+            for total_field, amount_field in HARVEST_TOTAL_FIELDS:
+                if values[amount_field]:
+                    updates[total_field] = F(total_field) - values[amount_field]
+        self.filter(hive_id=hive_id).update(**updates)
+        self.filter(hive_id=hive_id, last_review_date__lte=values["review_date"]).update(
+            last_review_date=self._latest()
+        )
+        if is_harvest:
+            self.filter(hive_id=hive_id, last_harvest_date__lte=values["review_date"]).update(
+                last_harvest_date=self._latest(review_type=Revision.RevisionType.HARVEST)
+            )
+
+    def sync_hive_review_dates(self, hive_ids) -> None:
+        """Copy ``last_review_date`` to ``Hive.last_review_date``."""
+        models.QuerySet.update(
+            Hive.objects.filter(pk__in=hive_ids),
+            last_review_date=Subquery(
+                self.filter(hive_id=OuterRef("pk")).values("last_review_date")[:1]
+            ),
+        )
+
+    def _build_rows(self, revisions) -> list["HiveActivitySummary"]:
+        harvests = Q(review_type=Revision.RevisionType.HARVEST)
+        totals = {
+            total_field: Coalesce(
+                Sum(amount_field, filter=harvests), Value(0), output_field=DecimalField()
+            )
+            for total_field, amount_field in HARVEST_TOTAL_FIELDS
+        }
+        grouped = (
+            revisions.values("hive_id")
+            .annotate(
+                revision_count=Count("id"),
+                harvest_count=Count("id", filter=harvests),
+                last_review_date=Max("review_date"),
+                last_harvest_date=Max("review_date", filter=harvests),
+                **totals,
+            )
+            .order_by()
+        )
+        return [self.model(**row) for row in grouped]
+
+    def rebuild_for_hives(self, hive_ids) -> None:
+        """Recompute the summaries of the given hives from their revisions."""
+        hive_ids = [hive_id for hive_id in hive_ids if hive_id is not None]
+        if not hive_ids:
+            return
+        with transaction.atomic(using=self.db):
+            rows = self._build_rows(Revision.objects.filter(hive_id__in=hive_ids))
+            self.filter(hive_id__in=hive_ids).delete()
+            self.bulk_create(rows)
+            self.sync_hive_review_dates(hive_ids)
+
+    def rebuild_all(self, *, batch_size: int = 500) -> int:
+        """Drop and regenerate every summary. Returns the row count."""
+        with transaction.atomic(using=self.db):
+            self.all().delete()
+            rows = self._build_rows(Revision.objects.all())
+            self.bulk_create(rows, batch_size=batch_size)
+            self.sync_hive_review_dates(Hive.objects.values("pk"))
+        return len(rows)
+
+
+class HiveActivitySummary(models.Model):
+    """Lifetime activity of a hive, kept in sync by ``Revision`` writes."""
+
+    hive = models.OneToOneField(
+        Hive,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="activity_summary",
+        verbose_name="Colmeia",
+    )
+    revision_count = models.PositiveIntegerField("Qtd. de revisões", default=0)
+    harvest_count = models.PositiveIntegerField("Qtd. de colheitas", default=0)
+    last_review_date = models.DateTimeField("Última revisão", null=True, blank=True)
+    last_harvest_date = models.DateTimeField("Última colheita", null=True, blank=True)
+    honey_total = models.DecimalField(
+        "Mel colhido (ml)", max_digits=14, decimal_places=2, default=0
+    )
+    propolis_total = models.DecimalField(
+        "Própolis colhida (g)", max_digits=14, decimal_places=2, default=0
+    )
+    wax_total = models.DecimalField(
+        "Cera colhida (g)", max_digits=14, decimal_places=2, default=0
+    )
+    pollen_total = models.DecimalField(
+        "Pólen colhido (g)", max_digits=14, decimal_places=2, default=0
+    )
+
+    objects = HiveActivitySummaryQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "Resumo de atividade da colmeia"
+        verbose_name_plural = "Resumos de atividade das colmeias"
+
+    def __str__(self) -> str:
+        return str(self.hive)
 
 
 class MellitophilousPlant(models.Model):
@@ -705,12 +1538,16 @@ class QuickObservation(models.Model):
     internal_photo = models.ImageField(
         "Foto interna",
         upload_to="quick_observations/internal/",
+        storage=image_storage,
+        max_length=255,
         blank=True,
         null=True,
     )
     external_photo = models.ImageField(
         "Foto externa",
         upload_to="quick_observations/external/",
+        storage=image_storage,
+        max_length=255,
         blank=True,
         null=True,
     )
@@ -726,15 +1563,333 @@ class QuickObservation(models.Model):
 
     def save(self, *args, **kwargs):
         self.full_clean()
-        if self.internal_photo:
-            _convert_image_field_to_webp(
-                self.internal_photo, field_name="internal_photo"
+        replaced_images = _replaced_image_names(
+            self, "internal_photo", "external_photo", update_fields=kwargs.get("update_fields")
+        )
+        converted_images, deferred_images = _convert_image_fields(self, "internal_photo", "external_photo")
+        result = super().save(*args, **kwargs)
+        _release_images(replaced_images)
+        ImageRendition.objects.generate_for(self, converted_images)
+        ImageConversionJob.objects.enqueue(self, deferred_images)
+        return result
+
+
+# Every image field that goes through the WebP conversion, for the media commands.
+IMAGE_FIELDS = (
+    (Apiary, "photo"),
+    (Hive, "photo"),
+    (RevisionAttachment, "file"),
+    (QuickObservation, "internal_photo"),
+    (QuickObservation, "external_photo"),
+)
+
+
+_image_release = threading.local()
+
+
+@contextmanager
+def batched_image_release():
+    """Release the images of the rows deleted inside the block all at once.
+
+    Meant to wrap bulk deletes inside a transaction: the references are dropped
+    with a few queries when the block ends, and the unused files are removed by
+    a single hook after the commit instead of one hook per file.
+    """
+    if getattr(_image_release, "pending", None) is not None:
+        yield
+        return
+    _image_release.pending = pending = {}
+    try:
+        yield
+    finally:
+        _image_release.pending = None
+    for storage, names in pending.items():
+        storage.delete_many(names)
+
+
+def _release_deleted_images(sender, instance, **kwargs) -> None:
+    """Drop the blob references of a deleted row, including cascaded deletes."""
+    pending = getattr(_image_release, "pending", None)
+    for model, field_name in IMAGE_FIELDS:
+        if model is sender:
+            field_file = getattr(instance, field_name)
+            if not field_file:
+                continue
+            if pending is not None and hasattr(field_file.storage, "delete_many"):
+                pending.setdefault(field_file.storage, []).append(field_file.name)
+            else:
+                field_file.storage.delete(field_file.name)
+
+
+for _model in {model for model, _ in IMAGE_FIELDS}:
+    post_delete.connect(
+        _release_deleted_images, sender=_model, dispatch_uid=f"release-images-{_model.__name__}"
+    )
+
+
+class StoredImageQuerySet(models.QuerySet):
+    def acquire(self, name: str) -> None:
+        self.bulk_create([self.model(name=name, ref_count=0)], ignore_conflicts=True)
+        self.filter(name=name).update(ref_count=F("ref_count") + 1)
+
+    def release(self, name: str) -> bool:
+        """Drop a reference; return ``True`` when the blob is no longer used.
+
+        Files stored before reference counting have no row and count as a
+        single reference.
+        """
+        self.filter(name=name, ref_count__gt=0).update(ref_count=F("ref_count") - 1)
+        return not self.filter(name=name, ref_count__gt=0).exists()
+
+    def release_many(self, names) -> list[str]:
+        """Drop one reference per entry of ``names``; return the unused blobs."""
+        counts = Counter(name for name in names if name)
+        by_count: dict[int, list[str]] = {}
+        for name, count in counts.items():
+            by_count.setdefault(count, []).append(name)
+        for count, group in by_count.items():
+            self.filter(name__in=group).update(
+                ref_count=Greatest(F("ref_count") - count, Value(0))
+            )
+        in_use = set(
+            self.filter(name__in=list(counts), ref_count__gt=0).values_list("name", flat=True)
+        )
+        return [name for name in counts if name not in in_use]
+
+    def purge(self, storage, name: str) -> None:
+        """Remove an unreferenced blob, unless it was taken again meanwhile."""
+        self.purge_many(storage, [name])
+
+    def purge_many(self, storage, names) -> None:
+        """Remove the blobs of ``names`` that are still unreferenced."""
+        with transaction.atomic():
+            ref_counts = dict(
+                self.select_for_update().filter(name__in=names).values_list("name", "ref_count")
             )
-        if self.external_photo:
-            _convert_image_field_to_webp(
-                self.external_photo, field_name="external_photo"
+            unused = [name for name in names if not ref_counts.get(name)]
+            for name in unused:
+                storage.remove(name)
+            self.filter(name__in=unused).delete()
+        ImageRendition.objects.discard(storage, unused)
+
+
+class StoredImage(models.Model):
+    """Reference count of a content-addressed image file."""
+
+    name = models.CharField("Arquivo", max_length=255, unique=True)
+    ref_count = models.PositiveIntegerField("Referências", default=0)
+    created_at = models.DateTimeField("Criado em", auto_now_add=True)
+
+    objects = StoredImageQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "Arquivo de imagem"
+        verbose_name_plural = "Arquivos de imagens"
+
+    def __str__(self) -> str:
+        return f"{self.name} ({self.ref_count})"
+
+
+class ImageConversionJobQuerySet(models.QuerySet):
+    stale_after = timedelta(minutes=15)
+
+    def enqueue(self, instance, field_names) -> None:
+        """Queue the WebP conversion of ``field_names`` of a saved instance."""
+        if not field_names:
+            return
+        content_type = ContentType.objects.get_for_model(instance)
+        self.bulk_create(
+            self.model(
+                content_type=content_type,
+                object_id=instance.pk,
+                field_name=field_name,
+                source_name=getattr(instance, field_name).name,
             )
-        return super().save(*args, **kwargs)
+            for field_name in field_names
+        )
+
+    def claim(self, limit: int) -> list["ImageConversionJob"]:
+        """Mark up to ``limit`` waiting jobs as processing and return them.
+
+        Jobs left in processing by a worker that died are picked up again.
+        """
+        now = timezone.now()
+        waiting = Q(status=ImageConversionJob.Status.PENDING) | Q(
+            status=ImageConversionJob.Status.PROCESSING, started_at__lt=now - self.stale_after
+        )
+        with transaction.atomic(using=self.db):
+            jobs = list(
+                self.select_for_update(skip_locked=True)
+                .filter(waiting)
+                .order_by("created_at", "pk")[:limit]
+            )
+            self.filter(pk__in=[job.pk for job in jobs]).update(
+                status=ImageConversionJob.Status.PROCESSING,
+                started_at=now,
+                attempts=F("attempts") + 1,
+            )
+        for job in jobs:
+            job.status = ImageConversionJob.Status.PROCESSING
+            job.started_at = now
+            job.attempts += 1
+        return jobs
+
+
+class ImageConversionJob(models.Model):
+    """Pending WebP conversion of an uploaded image, run by ``run_image_worker``."""
+
+    MAX_ATTEMPTS = 3
+
+    class Status(models.TextChoices):
+        PENDING = "pendente", "Pendente"
+        PROCESSING = "processando", "Processando"
+        DONE = "concluida", "Concluída"
+        FAILED = "falhou", "Falhou"
+        SKIPPED = "descartada", "Descartada (imagem substituída)"
+
+    content_type = models.ForeignKey(
+        ContentType, on_delete=models.CASCADE, verbose_name="Tipo de registro"
+    )
+    object_id = models.PositiveBigIntegerField("ID do registro")
+    field_name = models.CharField("Campo", max_length=50)
+    source_name = models.CharField("Arquivo original", max_length=255)
+    status = models.CharField(
+        "Situação", max_length=20, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField("Tentativas", default=0)
+    last_error = models.TextField("Último erro", blank=True)
+    created_at = models.DateTimeField("Criado em", auto_now_add=True)
+    started_at = models.DateTimeField("Iniciado em", null=True, blank=True)
+    finished_at = models.DateTimeField("Finalizado em", null=True, blank=True)
+
+    objects = ImageConversionJobQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "Conversão de imagem"
+        verbose_name_plural = "Conversões de imagens"
+        ordering = ["-created_at", "-pk"]
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="image_job_status_created"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.content_type.model} #{self.object_id} · {self.field_name}"
+
+    def _finish(self, status: str, error: str = "") -> None:
+        self.status = status
+        self.last_error = error
+        self.finished_at = None if status == self.Status.PENDING else timezone.now()
+        ImageConversionJob.objects.filter(pk=self.pk).update(
+            status=status, last_error=error, finished_at=self.finished_at
+        )
+
+    def run(self) -> None:
+        """Convert the stored original and swap the field to the WebP file.
+
+        The swap only happens if the field still points to the original, so a
+        photo replaced in the meantime is left untouched.
+        """
+        model = self.content_type.model_class()
+        instance = model._base_manager.filter(pk=self.object_id).first()
+        field_file = getattr(instance, self.field_name, None) if instance else None
+        if not field_file or field_file.name != self.source_name:
+            self._finish(self.Status.SKIPPED)
+            return
+
+        storage = field_file.storage
+        try:
+            with field_file.open("rb") as source:
+                converted = convert_image_to_webp(source, original_name=self.source_name)
+            new_name = storage.save(
+                field_file.field.generate_filename(instance, converted.name), converted
+            )
+        except Exception as exc:  # Recorded on the job and shown in the admin.
+            retry = self.attempts < self.MAX_ATTEMPTS
+            self._finish(
+                self.Status.PENDING if retry else self.Status.FAILED,
+                error=f"{type(exc).__name__}: {exc}",
+            )
+            return
+
+        swapped = model._base_manager.filter(
+            pk=self.object_id, **{self.field_name: self.source_name}
+        ).update(**{self.field_name: new_name})
+        if swapped:
+            storage.delete(self.source_name)
+            self._finish(self.Status.DONE)
+            ImageRendition.objects.generate(storage, new_name)
+        else:
+            storage.delete(new_name)
+            self._finish(self.Status.SKIPPED)
+
+
+class ImageRenditionQuerySet(models.QuerySet):
+    def generate(self, storage, source_name: str) -> int:
+        """Create and record the renditions of a stored image, once."""
+        if self.filter(source_name=source_name).exists():
+            return 0
+        rows = [
+            self.model(source_name=source_name, width=width, name=name)
+            for width, name in store_renditions(storage, source_name)
+        ]
+        self.bulk_create(rows, ignore_conflicts=True)
+        return len(rows)
+
+    def generate_for(self, instance, field_names) -> None:
+        for field_name in field_names:
+            field_file = getattr(instance, field_name)
+            self.generate(field_file.storage, field_file.name)
+
+    def discard(self, storage, source_names) -> None:
+        """Delete the renditions of images that were replaced."""
+        rows = self.filter(source_name__in=list(source_names))
+        for source_name, name in rows.values_list("source_name", "name"):
+            if name != source_name:
+                storage.delete(name)
+        rows.delete()
+
+    def rename_source(self, old_name: str, new_name: str) -> None:
+        """Point the renditions of a moved image at its new name."""
+        if self.filter(source_name=new_name).exists():
+            # The new file already has renditions; the old ones go with the old file.
+            return
+        self.filter(source_name=old_name, name=old_name).update(name=new_name)
+        self.filter(source_name=old_name).update(source_name=new_name)
+
+    def srcsets(self, source_names) -> dict[str, list[tuple[int, str]]]:
+        """Map each source name to its ``(width, url)`` renditions, narrowest first."""
+        renditions: dict[str, list[tuple[int, str]]] = {}
+        rows = (
+            self.filter(source_name__in={name for name in source_names if name})
+            .order_by("source_name", "width")
+            .values_list("source_name", "width", "name")
+        )
+        for source_name, width, name in rows:
+            renditions.setdefault(source_name, []).append((width, image_storage.url(name)))
+        return renditions
+
+
+class ImageRendition(models.Model):
+    """Downscaled WebP copy of a stored image, used in ``srcset`` attributes."""
+
+    source_name = models.CharField("Arquivo original", max_length=255)
+    width = models.PositiveSmallIntegerField("Largura (px)")
+    name = models.CharField("Arquivo", max_length=255)
+    created_at = models.DateTimeField("Criado em", auto_now_add=True)
+
+    objects = ImageRenditionQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "Versão reduzida de imagem"
+        verbose_name_plural = "Versões reduzidas de imagens"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["source_name", "width"], name="image_rendition_source_width"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.source_name} ({self.width}px)"
 
 
 class CreatorNetworkEntry(models.Model):
@@ -773,3 +1928,176 @@ class CreatorNetworkEntry(models.Model):
 
     def __str__(self) -> str:
         return self.name
+
+
+class PersonalDataDeletionJobQuerySet(models.QuerySet):
+    stale_after = timedelta(minutes=15)
+
+    def request(self, user) -> "PersonalDataDeletionJob":
+        """Lock ``user`` out and queue the deletion of everything they own.
+
+        The account is disabled and the public creator listing removed right
+        away; the remaining rows are deleted by ``run_data_deletion_worker``.
+        """
+        with transaction.atomic(using=self.db):
+            user.is_active = False
+            user.set_unusable_password()
+            user.save(update_fields=["is_active", "password"])
+            CreatorNetworkEntry.objects.filter(user=user).delete()
+            job = self.filter(user=user).exclude(status=PersonalDataDeletionJob.Status.DONE).first()
+            if job is None:
+                job = self.create(
+                    user=user,
+                    total_items=sum(
+                        queryset.count() for queryset in PersonalDataDeletionJob.owned_rows(user.pk)
+                    ),
+                )
+        return job
+
+    def claim(self) -> "PersonalDataDeletionJob | None":
+        """Mark the oldest waiting job as processing and return it.
+
+        A job whose worker stopped reporting progress is picked up again; the
+        deletion resumes from the rows that are left.
+        """
+        now = timezone.now()
+        waiting = Q(status=PersonalDataDeletionJob.Status.PENDING) | Q(
+            status=PersonalDataDeletionJob.Status.PROCESSING, updated_at__lt=now - self.stale_after
+        )
+        with transaction.atomic(using=self.db):
+            job = (
+                self.select_for_update(skip_locked=True)
+                .filter(waiting)
+                .order_by("created_at", "pk")
+                .first()
+            )
+            if job is None:
+                return None
+            self.filter(pk=job.pk).update(
+                status=PersonalDataDeletionJob.Status.PROCESSING,
+                started_at=now,
+                updated_at=now,
+                attempts=F("attempts") + 1,
+            )
+        job.status = PersonalDataDeletionJob.Status.PROCESSING
+        job.started_at = job.updated_at = now
+        job.attempts += 1
+        return job
+
+
+class PersonalDataDeletionJob(models.Model):
+    """Deletion of a user's data requested under the LGPD.
+
+    Only the token, the counters and the timestamps are kept: the link to the
+    user is cleared when the account itself is deleted.
+    """
+
+    MAX_ATTEMPTS = 5
+
+    class Status(models.TextChoices):
+        PENDING = "pendente", "Pendente"
+        PROCESSING = "processando", "Processando"
+        DONE = "concluida", "Concluída"
+        FAILED = "falhou", "Falhou"
+
+    token = models.UUIDField("Código", default=uuid.uuid4, unique=True, editable=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        verbose_name="Usuário",
+    )
+    status = models.CharField(
+        "Situação", max_length=20, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField("Tentativas", default=0)
+    total_items = models.PositiveIntegerField("Registros a excluir", default=0)
+    deleted_items = models.PositiveIntegerField("Registros excluídos", default=0)
+    last_error = models.TextField("Último erro", blank=True)
+    created_at = models.DateTimeField("Solicitado em", auto_now_add=True)
+    started_at = models.DateTimeField("Iniciado em", null=True, blank=True)
+    updated_at = models.DateTimeField("Último progresso em", null=True, blank=True)
+    finished_at = models.DateTimeField("Finalizado em", null=True, blank=True)
+
+    objects = PersonalDataDeletionJobQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "Exclusão de dados pessoais"
+        verbose_name_plural = "Exclusões de dados pessoais"
+        ordering = ["-created_at", "-pk"]
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="deletion_job_status_created"),
+        ]
+
+    def __str__(self) -> str:
+        return f"Exclusão {self.token}"
+
+    @property
+    def progress(self) -> int:
+        if self.status == self.Status.DONE:
+            return 100
+        if not self.total_items:
+            return 0
+        return min(99, self.deleted_items * 100 // self.total_items)
+
+    @staticmethod
+    def owned_rows(user_id) -> tuple[models.QuerySet, ...]:
+        """Rows owned by ``user_id``, children first so each delete cascades little."""
+        return (
+            RevisionAttachment.objects.filter(revision__hive__owner_id=user_id),
+            QuickObservation.objects.filter(hive__owner_id=user_id),
+            Revision.objects.filter(hive__owner_id=user_id),
+            Hive.objects.filter(owner_id=user_id),
+            Apiary.objects.filter(owner_id=user_id),
+        )
+
+    def _finish(self, status: str, error: str = "") -> None:
+        self.status = status
+        self.last_error = error
+        self.finished_at = None if status == self.Status.PENDING else timezone.now()
+        PersonalDataDeletionJob.objects.filter(pk=self.pk).update(
+            status=status, last_error=error, finished_at=self.finished_at
+        )
+
+    def _delete_in_batches(self, queryset, batch_size: int) -> None:
+        while True:
+            with transaction.atomic(), batched_image_release():
+                pks = list(queryset.order_by().values_list("pk", flat=True)[:batch_size])
+                if not pks:
+                    return
+                # Plain QuerySet.delete: the per-hive rollups and counters the
+                # custom deletes maintain are about to go away with the account.
+                models.QuerySet.delete(queryset.model.objects.filter(pk__in=pks))
+                bump_data_version([self.user_id])
+                self.deleted_items += len(pks)
+                self.updated_at = timezone.now()
+                PersonalDataDeletionJob.objects.filter(pk=self.pk).update(
+                    deleted_items=F("deleted_items") + len(pks), updated_at=self.updated_at
+                )
+
+    def run(self, batch_size: int = 500) -> None:
+        """Delete the user's rows in batches, then the account itself.
+
+        Each batch is its own transaction, so progress shows up on the status
+        page and a retried job continues where the previous one stopped.
+        """
+        from django.contrib.auth import get_user_model
+
+        try:
+            if self.user_id is not None:
+                for queryset in self.owned_rows(self.user_id):
+                    self._delete_in_batches(queryset, batch_size)
+                with transaction.atomic():
+                    CreatorNetworkEntry.objects.filter(user_id=self.user_id).delete()
+                    get_user_model().objects.filter(pk=self.user_id).delete()
+                self.user_id = None
+        except Exception as exc:  # Recorded on the job and shown in the admin.
+            retry = self.attempts < self.MAX_ATTEMPTS
+            self._finish(
+                self.Status.PENDING if retry else self.Status.FAILED,
+                error=f"{type(exc).__name__}: {exc}",
+            )
+            return
+        self._finish(self.Status.DONE)
@@ -0,0 +1,33 @@
+(function($) {
+  if (!$ || !$.fn || !$.fn.select2) {
+    return;
+  }
+
+  function initializeHiveSelector() {
+    // Seletor de colmeias da história: busca as opções sob demanda
+    var hiveSelect = $('#id_hive[data-autocomplete-url]');
+    if (!hiveSelect.length) {
+      return;
+    }
+
+    hiveSelect.select2({
+      width: '100%',
+      placeholder: hiveSelect.data('placeholder'),
+      minimumInputLength: 0,
+      ajax: {
+        url: hiveSelect.data('autocomplete-url'),
+        dataType: 'json',
+        delay: 250,
+        data: function(params) {
+          return { q: params.term || '', page: params.page || 1 };
+        }
+      }
+    });
+  }
+
+  if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', initializeHiveSelector);
+  } else {
+    initializeHiveSelector();
+  }
+})(typeof django !== 'undefined' ? django.jQuery : window.jQuery);
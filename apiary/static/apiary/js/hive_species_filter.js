@@ -14,14 +14,15 @@
         speciesSelect.select2();
       }
 
+      // Campos com autocomplete do admin já são inicializados pelo Django
       // Select do formulário de revisões de colmeia
-      $('#id_hive').select2();
+      $('#id_hive').not('.admin-autocomplete').select2();
       
       // Select de cidades
-      $('#id_city').select2();
+      $('#id_city').not('.admin-autocomplete').select2();
       
       // Select do formulário de origem de colmeia
-      $('#id_origin_hive').select2();
+      $('#id_origin_hive').not('.admin-autocomplete').select2();
 
       // Select do formulário de caixa de colmeia
       $('#id_box_model').select2();
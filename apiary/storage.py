@@ -0,0 +1,86 @@
+"""Content-addressed storage for uploaded images.
+
+Files are named after the SHA-256 of their content inside the directory given
+by ``upload_to``, so an image uploaded several times is written once. The
+first hex digits of the hash become two levels of subdirectories
+(``hive_photos/3f/a2/3fa2….webp``) to keep directories small. Every
+``save`` takes a reference on the blob in ``StoredImage`` and every ``delete``
+drops one; the file is removed, after the transaction commits, only when no
+reference is left.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import posixpath
+import re
+from pathlib import PurePosixPath
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.core.files.utils import validate_file_name
+from django.db import transaction
+from django.utils.deconstruct import deconstructible
+
+SHARD_DEPTH = 2
+_SHARD = re.compile(r"^[0-9a-f]{2}$")
+_SHARDED_NAME = re.compile(r"(^|/)([0-9a-f]{2})/([0-9a-f]{2})/\2\3[0-9a-f]{60}\.\w+$")
+
+
+def is_sharded(name: str) -> bool:
+    """Whether ``name`` already follows the content-addressed sharded layout."""
+    return bool(_SHARDED_NAME.search(name))
+
+
+@deconstructible(path="apiary.storage.ContentAddressedStorage")
+class ContentAddressedStorage(FileSystemStorage):
+    def content_name(self, name: str, content) -> str:
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        parts = posixpath.dirname(name.replace("\\", "/")).split("/")
+        # Names derived from a stored file (renditions, re-encodes) keep its
+        # field directory, not its shard directories.
+        if len(parts) >= SHARD_DEPTH and all(_SHARD.match(part) for part in parts[-SHARD_DEPTH:]):
+            parts = parts[:-SHARD_DEPTH]
+        hexdigest = digest.hexdigest()
+        shards = [hexdigest[index * 2 : index * 2 + 2] for index in range(SHARD_DEPTH)]
+        return posixpath.join(
+            *parts, *shards, f"{hexdigest}{PurePosixPath(name).suffix.lower()}"
+        )
+
+    def save(self, name, content, max_length=None):
+        from apiary.models import StoredImage
+
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+        name = self.content_name(name, content)
+        validate_file_name(name, allow_relative_path=True)
+        with transaction.atomic():
+            StoredImage.objects.acquire(name)
+            if not self.exists(name):
+                name = self._save(name, content)
+        return name
+
+    def delete(self, name):
+        from apiary.models import StoredImage
+
+        if name and StoredImage.objects.release(name):
+            transaction.on_commit(lambda: StoredImage.objects.purge(self, name))
+
+    def delete_many(self, names) -> None:
+        """Drop one reference per name; unused files go in one hook after commit."""
+        from apiary.models import StoredImage
+
+        unused = StoredImage.objects.release_many(names)
+        if unused:
+            transaction.on_commit(lambda: StoredImage.objects.purge_many(self, unused))
+
+    def remove(self, name) -> None:
+        """Delete the file itself, regardless of references."""
+        super().delete(name)
+
+
+image_storage = ContentAddressedStorage()
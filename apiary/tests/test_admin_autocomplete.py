@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.test import TestCase
+from django.urls import reverse
+
+from apiary.models import Apiary, City, Hive, Species
+
+
+class AdminAutocompleteTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(
+            username="beekeeper",
+            password="testpass123",
+            email="beekeeper@example.com",
+            is_staff=True,
+        )
+        self.user.user_permissions.set(
+            Permission.objects.filter(
+                content_type__app_label="apiary",
+                codename__in=[
+                    "add_apiary",
+                    "change_apiary",
+                    "view_apiary",
+                    "add_hive",
+                    "change_hive",
+                    "view_hive",
+                    "add_revision",
+                    "change_revision",
+                    "view_revision",
+                    "add_creatornetworkentry",
+                    "change_creatornetworkentry",
+                    "view_creatornetworkentry",
+                ],
+            )
+        )
+        other_user = User.objects.create_user(
+            username="neighbour",
+            password="testpass123",
+            email="neighbour@example.com",
+            is_staff=True,
+        )
+        species = Species.objects.create(
+            group=Species.SpeciesGroup.STINGLESS,
+            scientific_name="Melipona rufiventris",
+            popular_name="Uruçu-amarela",
+        )
+        self.hive = Hive.objects.create(
+            owner=self.user,
+            popular_name="Amarela 01",
+            species=species,
+            acquisition_method=Hive.AcquisitionMethod.CAPTURE,
+        )
+        self.foreign_hive = Hive.objects.create(
+            owner=other_user,
+            popular_name="Amarela vizinha",
+            species=species,
+            acquisition_method=Hive.AcquisitionMethod.CAPTURE,
+        )
+        cities = [City(name=f"Cidade {index:03d} - SP") for index in range(60)]
+        for city in cities:
+            city.refresh_search_fields()
+        City.objects.bulk_create(cities)
+        self.client.force_login(self.user)
+        self.url = reverse("admin:autocomplete")
+
+    def _search(self, model_name, field_name, term="", **extra):
+        params = {
+            "app_label": "apiary",
+            "model_name": model_name,
+            "field_name": field_name,
+            "term": term,
+        }
+        params.update(extra)
+        return self.client.get(self.url, params)
+
+    def test_hive_search_is_scoped_to_owner(self):
+        response = self._search("revision", "hive", "Amarela")
+        self.assertEqual(response.status_code, 200)
+        ids = [int(item["id"]) for item in response.json()["results"]]
+        self.assertEqual(ids, [self.hive.pk])
+
+        response = self._search("hive", "origin_hive", "vizinha")
+        self.assertEqual(response.json()["results"], [])
+
+    def test_city_search_is_paginated_without_city_permission(self):
+        first = self._search("apiary", "city", "Cidade").json()
+        self.assertEqual(len(first["results"]), 20)
+        self.assertTrue(first["pagination"]["more"])
+        last = self._search("apiary", "city", "Cidade", page=3).json()
+        self.assertFalse(last["pagination"]["more"])
+
+    def test_city_search_ignores_accents_and_case(self):
+        city = City.objects.create(name="São José dos Campos - SP")
+        City.objects.create(name="São José - SC")
+
+        results = self._search("creatornetworkentry", "city", "sao jose d").json()["results"]
+        self.assertEqual([int(item["id"]) for item in results], [city.pk])
+
+    def test_users_without_source_permission_are_denied(self):
+        self.user.user_permissions.clear()
+        response = self._search("apiary", "city", "Cidade")
+        self.assertEqual(response.status_code, 403)
+
+    def test_change_forms_do_not_render_every_option(self):
+        Apiary.objects.create(name="Apiário Norte", owner=self.user)
+        response = self.client.get(reverse("admin:apiary_apiary_add"))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, "Cidade 001")
+        self.assertContains(response, "admin-autocomplete")
+
+        response = self.client.get(reverse("admin:apiary_revision_add"))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, "Amarela 01")
+        self.assertNotContains(response, "Amarela vizinha")
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apiary.admin import ColmeiaAdmin, RevisaoAdmin
+from apiary.models import Apiary, Hive, Revision, Species
+from apiary.utils.pagination import EstimatedCountPaginator
+
+
+class LargeChangelistTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        User = get_user_model()
+        self.superuser = User.objects.create_superuser(
+            username="root", password="testpass123", email="root@example.com"
+        )
+        self.owners = [
+            User.objects.create_user(
+                username=f"owner-{index}",
+                password="testpass123",
+                email=f"owner-{index}@example.com",
+                is_staff=True,
+            )
+            for index in range(3)
+        ]
+        self.species = [
+            Species.objects.create(
+                group=Species.SpeciesGroup.STINGLESS,
+                scientific_name=f"Melipona lista {index}",
+                popular_name=f"Lista {index}",
+            )
+            for index in range(3)
+        ]
+        self.apiaries = [
+            Apiary.objects.create(name=f"Apiário {owner.username}", owner=owner)
+            for owner in self.owners
+        ]
+        self.client.force_login(self.superuser)
+
+    def _create_hives(self, count):
+        hives = Hive.objects.bulk_create(
+            Hive(
+                owner=self.owners[index % 3],
+                apiary=self.apiaries[index % 3],
+                species=self.species[index % 3],
+                popular_name=f"Colmeia {index:04d}",
+                acquisition_method=Hive.AcquisitionMethod.CAPTURE,
+            )
+            for index in range(count)
+        )
+        Revision.objects.bulk_create(
+            Revision(
+                hive=hive,
+                review_date=timezone.now(),
+                review_type=Revision.RevisionType.ROUTINE,
+            )
+            for hive in hives
+        )
+
+    def _changelist_queries(self, url):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(captured), response
+
+    def test_query_count_does_not_depend_on_page_size(self):
+        urls = [
+            reverse("admin:apiary_hive_changelist"),
+            reverse("admin:apiary_revision_changelist"),
+        ]
+        self._create_hives(10)
+        for url in urls:
+            self.client.get(url)
+        small = [self._changelist_queries(url)[0] for url in urls]
+
+        self._create_hives(990)
+        with mock.patch.object(ColmeiaAdmin, "list_per_page", 1000), mock.patch.object(
+            RevisaoAdmin, "list_per_page", 1000
+        ):
+            large = []
+            for url in urls:
+                queries, response = self._changelist_queries(url)
+                self.assertEqual(len(response.context["cl"].result_list), 1000)
+                large.append(queries)
+        self.assertEqual(large, small)
+
+    def test_filter_choices_are_cached(self):
+        url = reverse("admin:apiary_hive_changelist")
+        self.client.get(url)
+        cache.delete_many(
+            [
+                "admin:filter-choices:apiary.hive:species",
+                "admin:filter-choices:apiary.hive:owner",
+            ]
+        )
+        first, _ = self._changelist_queries(url)
+        second, response = self._changelist_queries(url)
+        self.assertEqual(second, first - 2)
+        self.assertContains(response, "Lista 2")
+
+    def test_changelist_uses_estimated_paginator(self):
+        self._create_hives(5)
+        _, response = self._changelist_queries(reverse("admin:apiary_hive_changelist"))
+        changelist = response.context["cl"]
+        self.assertIsInstance(changelist.paginator, EstimatedCountPaginator)
+        # SQLite has no planner estimate, so the count stays exact.
+        self.assertEqual(changelist.result_count, 5)
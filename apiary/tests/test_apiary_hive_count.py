@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from apiary.models import Apiary, Hive, Species
+from apiary.utils.dashboard_cache import get_data_version
+
+
+class ApiaryHiveCountTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="counter",
+            password="testpass123",
+            email="counter@example.com",
+            is_staff=True,
+        )
+        self.species = Species.objects.create(
+            group=Species.SpeciesGroup.STINGLESS,
+            scientific_name="Scaptotrigona depilis",
+            popular_name="Mandaguari",
+        )
+        self.first = Apiary.objects.create(name="Apiário A", owner=self.user)
+        self.second = Apiary.objects.create(name="Apiário B", owner=self.user)
+
+    def _hive(self, apiary=None, **extra):
+        return Hive(
+            owner=self.user,
+            popular_name=extra.pop("popular_name", "Colmeia"),
+            species=self.species,
+            apiary=apiary,
+            acquisition_method=Hive.AcquisitionMethod.CAPTURE,
+            **extra,
+        )
+
+    def assertCounts(self, first, second):
+        self.first.refresh_from_db()
+        self.second.refresh_from_db()
+        self.assertEqual((self.first.hive_count, self.second.hive_count), (first, second))
+
+    def test_save_and_delete_adjust_counters(self):
+        hive = self._hive(self.first)
+        hive.save()
+        other = self._hive(self.first)
+        other.save()
+        self.assertCounts(2, 0)
+
+        hive.apiary = self.second
+        hive.save()
+        self.assertCounts(1, 1)
+
+        hive.popular_name = "Renomeada"
+        hive.save()
+        self.assertCounts(1, 1)
+
+        hive.apiary = None
+        hive.save()
+        self.assertCounts(1, 0)
+
+        other.delete()
+        self.assertCounts(0, 0)
+
+    def test_stale_instances_do_not_overwrite_each_other(self):
+        hives = [self._hive(popular_name=f"Colmeia {index}") for index in range(3)]
+        for hive in hives:
+            hive.save()
+        # Each instance was loaded before the others moved, as in concurrent requests.
+        stale = [Hive.objects.get(pk=hive.pk) for hive in hives]
+        for hive in stale:
+            hive.apiary = self.first
+            hive.save()
+        self.assertCounts(3, 0)
+
+    def test_bulk_operations_adjust_counters(self):
+        Hive.objects.bulk_create(
+            [self._hive(self.first) for _ in range(3)]
+            + [self._hive(self.second) for _ in range(2)]
+        )
+        self.assertCounts(3, 2)
+
+        Hive.objects.filter(apiary=self.first).update(apiary=self.second)
+        self.assertCounts(0, 5)
+
+        moved = list(Hive.objects.filter(apiary=self.second).values_list("pk", flat=True)[:2])
+        Hive.objects.filter(pk__in=moved).update(apiary_id=self.first.pk)
+        self.assertCounts(2, 3)
+
+        Hive.objects.filter(apiary=self.second).delete()
+        self.assertCounts(2, 0)
+
+    def test_bulk_update_moves_keep_counters_exact(self):
+        # Hive pks far from the apiary pks, so a delta keyed on the wrong
+        # table cannot land on the right apiary by chance.
+        hives = Hive.objects.bulk_create(
+            [self._hive(self.first, pk=5000 + index) for index in range(4)]
+            + [self._hive(None, pk=6000)]
+        )
+        self.assertCounts(4, 0)
+
+        hives[0].apiary = self.second
+        hives[1].apiary = self.second
+        hives[2].apiary = None
+        hives[4].apiary = self.first
+        Hive.objects.bulk_update(hives, ["apiary"])
+        self.assertCounts(2, 2)
+
+        for hive in hives:
+            hive.apiary = self.second
+        Hive.objects.bulk_update(hives, ["apiary"], batch_size=2)
+        self.assertCounts(0, 5)
+
+        new_owner = get_user_model().objects.create_user(username="herdeiro", password="x")
+        version = get_data_version(new_owner)
+        hives[0].owner = new_owner
+        Hive.objects.bulk_update(hives, ["owner"])
+        self.assertNotEqual(get_data_version(new_owner), version)
+
+    def test_reconcile_command_repairs_drift(self):
+        Hive.objects.bulk_create([self._hive(self.first) for _ in range(4)])
+        Apiary.objects.filter(pk=self.first.pk).update(hive_count=9)
+        Apiary.objects.filter(pk=self.second.pk).update(hive_count=2)
+
+        output = StringIO()
+        call_command("reconcile_hive_counts", batch_size=1, stdout=output)
+        self.assertCounts(4, 0)
+        self.assertIn("2 meliponário(s)/apiário(s) corrigido(s)", output.getvalue())
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from django.test import TestCase
+
+from apiary.models import City
+from apiary.utils.text import search_key, split_city_name
+
+
+class CitySearchTests(TestCase):
+    def setUp(self):
+        self.sao_jose_sc = City.objects.create(name="São José - SC")
+        self.sao_jose_campos = City.objects.create(name="São José dos Campos - SP")
+        self.santos = City.objects.create(name="Santos - SP")
+
+    def test_state_and_search_name_are_derived_from_name(self):
+        self.assertEqual(self.sao_jose_campos.state, "SP")
+        self.assertEqual(self.sao_jose_campos.search_name, "sao jose dos campos")
+
+        self.santos.name = "Santo André - SP"
+        self.santos.save(update_fields=["name"])
+        self.santos.refresh_from_db()
+        self.assertEqual(self.santos.search_name, "santo andre")
+
+    def test_search_matches_prefix_without_accents(self):
+        self.assertQuerysetEqual(
+            City.objects.search("SAO JO").order_by("name"),
+            [self.sao_jose_sc, self.sao_jose_campos],
+        )
+        self.assertQuerysetEqual(City.objects.search("jose"), [])
+
+    def test_search_narrows_by_state(self):
+        self.assertQuerysetEqual(City.objects.search("são josé - sc"), [self.sao_jose_sc])
+        self.assertQuerysetEqual(
+            City.objects.search("s", state="sp").order_by("name"),
+            [self.santos, self.sao_jose_campos],
+        )
+
+    def test_helpers(self):
+        self.assertEqual(search_key("  Ribeirão   Preto "), "ribeirao preto")
+        self.assertEqual(split_city_name("Mogi das Cruzes - sp"), ("Mogi das Cruzes", "SP"))
+        self.assertEqual(split_city_name("Sem UF"), ("Sem UF", ""))
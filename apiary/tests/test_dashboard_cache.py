@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import tempfile
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apiary.models import Apiary, Hive, Revision, Species
+from apiary.utils.dashboard_cache import get_cache_stats, reset_cache_stats
+
+
+class DashboardCacheTests(TestCase):
+    def setUp(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        settings_override = override_settings(
+            CACHES={
+                "default": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": cache_dir.name,
+                }
+            }
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        User = get_user_model()
+        self.user = User.objects.create_user(
+            username="cached",
+            password="testpass123",
+            email="cached@example.com",
+            is_staff=True,
+        )
+        self.other_user = User.objects.create_user(
+            username="cached-other",
+            password="testpass123",
+            email="cached-other@example.com",
+            is_staff=True,
+        )
+        self.species = Species.objects.create(
+            group=Species.SpeciesGroup.STINGLESS,
+            scientific_name="Melipona quadrifasciata",
+            popular_name="Mandaçaia",
+        )
+        self.apiary = Apiary.objects.create(name="Apiário Cache", owner=self.user)
+        self.second_apiary = Apiary.objects.create(name="Apiário Extra", owner=self.user)
+        self.hive = Hive.objects.create(
+            owner=self.user,
+            popular_name="Colmeia Cache",
+            species=self.species,
+            apiary=self.apiary,
+            acquisition_method=Hive.AcquisitionMethod.DIVISION,
+        )
+        self.other_hive = Hive.objects.create(
+            owner=self.other_user,
+            popular_name="Colmeia Vizinha",
+            species=self.species,
+            acquisition_method=Hive.AcquisitionMethod.DIVISION,
+        )
+        self._harvest(self.hive, "100")
+        self.client.force_login(self.user)
+        self.url = reverse("production-dashboard")
+
+    def _harvest(self, hive, honey):
+        return Revision.objects.create(
+            hive=hive,
+            review_date=timezone.now(),
+            review_type=Revision.RevisionType.HARVEST,
+            honey_harvest_amount=Decimal(honey),
+        )
+
+    def _honey_total(self, response):
+        return response.context["monthly_table"]["totals"]["honey"]
+
+    def test_repeated_request_is_served_from_cache(self):
+        reset_cache_stats()
+        first = self.client.get(self.url)
+        second = self.client.get(self.url)
+        self.assertEqual(first["X-Dashboard-Cache"], "miss")
+        self.assertEqual(second["X-Dashboard-Cache"], "hit")
+        self.assertEqual(self._honey_total(second), Decimal("100"))
+        self.assertEqual(get_cache_stats(), {"hits": 1, "misses": 1})
+
+    def test_equivalent_filters_share_entry(self):
+        first = self.client.get(
+            f"{self.url}?apiarios={self.apiary.pk}&apiarios={self.second_apiary.pk}"
+        )
+        second = self.client.get(
+            f"{self.url}?apiarios={self.second_apiary.pk}&apiarios={self.apiary.pk}"
+        )
+        self.assertEqual(first["X-Dashboard-Cache"], "miss")
+        self.assertEqual(second["X-Dashboard-Cache"], "hit")
+
+    def test_owner_writes_invalidate_cached_results(self):
+        self.client.get(self.url)
+        self._harvest(self.hive, "50")
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Dashboard-Cache"], "miss")
+        self.assertEqual(self._honey_total(response), Decimal("150"))
+
+        self.hive.status = Hive.HiveStatus.DEAD
+        self.hive.save()
+        self.assertEqual(self.client.get(self.url)["X-Dashboard-Cache"], "miss")
+
+        self.apiary.name = "Apiário Renomeado"
+        self.apiary.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Dashboard-Cache"], "miss")
+        names = [item["name"] for item in response.context["available_filters"]["apiaries"]]
+        self.assertIn("Apiário Renomeado", names)
+
+        Revision.objects.filter(hive=self.hive).delete()
+        response = self.client.get(self.url)
+        self.assertEqual(self._honey_total(response), Decimal("0"))
+
+    def test_other_owner_writes_keep_cache_but_invalidate_superusers(self):
+        superuser = get_user_model().objects.create_superuser(
+            username="root", password="testpass123", email="root@example.com"
+        )
+        self.client.get(self.url)
+        self.client.force_login(superuser)
+        self.client.get(self.url)
+
+        self._harvest(self.other_hive, "70")
+
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Dashboard-Cache"], "miss")
+        self.assertEqual(self._honey_total(response), Decimal("170"))
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(self.url)["X-Dashboard-Cache"], "hit")
+
+    def test_hive_detail_view_is_cached_and_invalidated(self):
+        detail_url = reverse("production-dashboard-hive-detail", args=[self.hive.pk])
+        self.assertEqual(self.client.get(detail_url)["X-Dashboard-Cache"], "miss")
+        self.assertEqual(self.client.get(detail_url)["X-Dashboard-Cache"], "hit")
+        self._harvest(self.hive, "25")
+        response = self.client.get(detail_url)
+        self.assertEqual(response["X-Dashboard-Cache"], "miss")
+        self.assertEqual(response.context["aggregates"]["honey"], Decimal("125"))
+
+    def test_local_memory_backend_is_bypassed(self):
+        backend = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+        with override_settings(CACHES=backend):
+            reset_cache_stats()
+            self.assertEqual(self.client.get(self.url)["X-Dashboard-Cache"], "miss")
+            self.assertEqual(self.client.get(self.url)["X-Dashboard-Cache"], "miss")
+            self.assertEqual(get_cache_stats(), {"hits": 0, "misses": 0})
@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+import random
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import Count, DecimalField, Max, Sum, Value
+from django.db.models.functions import Coalesce, TruncMonth
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from apiary.models import Apiary, Hive, MonthlyHarvestRollup, Revision, Species
+
+
+CENT = Decimal("0.01")
+
+
+def _money(value) -> Decimal:
+    return Decimal(value or 0).quantize(CENT)
+
+
+class MonthlyHarvestRollupTests(TestCase):
+    def setUp(self):
+        self.rng = random.Random(20240611)
+        User = get_user_model()
+        self.user = User.objects.create_user(
+            username="rollup",
+            password="testpass123",
+            email="rollup@example.com",
+            is_staff=True,
+        )
+        other_user = User.objects.create_user(
+            username="rollup-other",
+            password="testpass123",
+            email="rollup-other@example.com",
+            is_staff=True,
+        )
+        self.species = [
+            Species.objects.create(
+                group=Species.SpeciesGroup.STINGLESS,
+                scientific_name=f"Melipona test {index}",
+                popular_name=f"Espécie {index}",
+            )
+            for index in range(2)
+        ]
+        self.apiaries = [
+            Apiary.objects.create(name=f"Apiário {index}", owner=self.user)
+            for index in range(2)
+        ]
+        other_apiary = Apiary.objects.create(name="Apiário Vizinho", owner=other_user)
+        self.hives = []
+        for index in range(5):
+            self.hives.append(
+                Hive.objects.create(
+                    owner=self.user,
+                    popular_name=f"Colmeia {index}",
+                    species=self.species[index % 2],
+                    apiary=self.apiaries[index % 2] if index < 4 else None,
+                    acquisition_method=Hive.AcquisitionMethod.CAPTURE,
+                    transfer_box_date=timezone.localdate(),
+                    status=Hive.HiveStatus.PRODUCTIVE if index % 3 else Hive.HiveStatus.OBSERVATION,
+                )
+            )
+        self.hives.append(
+            Hive.objects.create(
+                owner=other_user,
+                popular_name="Colmeia Vizinha",
+                species=self.species[0],
+                apiary=other_apiary,
+                acquisition_method=Hive.AcquisitionMethod.CAPTURE,
+                transfer_box_date=timezone.localdate(),
+            )
+        )
+        self.year = timezone.localdate().year
+
+    def _random_date(self) -> datetime:
+        year = self.rng.choice([self.year - 1, self.year])
+        month = self.rng.randint(1, 12)
+        # Month edges exercise the timezone handling of the month bucket.
+        day, moment = self.rng.choice(
+            [
+                (1, time(0, 15)),
+                (28, time(23, 45)),
+                (self.rng.randint(1, 28), time(self.rng.randint(0, 23), 30)),
+            ]
+        )
+        return timezone.make_aware(
+            datetime.combine(datetime(year, month, day).date(), moment)
+        )
+
+    def _random_amount(self):
+        if self.rng.random() < 0.25:
+            return None
+        return Decimal(self.rng.randint(0, 500000)) / 100
+
+    def _random_revision(self, **overrides) -> Revision:
+        values = {
+            "hive": self.rng.choice(self.hives),
+            "review_date": self._random_date(),
+            "review_type": self.rng.choice(
+                [Revision.RevisionType.HARVEST] * 3 + [Revision.RevisionType.ROUTINE]
+            ),
+            "honey_harvest_amount": self._random_amount(),
+            "propolis_harvest_amount": self._random_amount(),
+            "wax_harvest_amount": self._random_amount(),
+            "pollen_harvest_amount": self._random_amount(),
+        }
+        values.update(overrides)
+        return Revision(**values)
+
+    def _raw_buckets(self):
+        rows = (
+            Revision.objects.filter(review_type=Revision.RevisionType.HARVEST)
+            .annotate(month=TruncMonth("review_date"))
+            .values("hive_id", "hive__owner_id", "hive__apiary_id", "hive__species_id", "month")
+            .annotate(
+                honey=Coalesce(Sum("honey_harvest_amount"), Value(0), output_field=DecimalField()),
+                propolis=Coalesce(Sum("propolis_harvest_amount"), Value(0), output_field=DecimalField()),
+                wax=Coalesce(Sum("wax_harvest_amount"), Value(0), output_field=DecimalField()),
+                pollen=Coalesce(Sum("pollen_harvest_amount"), Value(0), output_field=DecimalField()),
+                harvests=Count("id"),
+                last=Max("review_date"),
+            )
+            .order_by()
+        )
+        return {
+            (row["hive_id"], timezone.localtime(row["month"]).date()): (
+                row["hive__owner_id"],
+                row["hive__apiary_id"],
+                row["hive__species_id"],
+                _money(row["honey"]),
+                _money(row["propolis"]),
+                _money(row["wax"]),
+                _money(row["pollen"]),
+                row["harvests"],
+                row["last"],
+            )
+            for row in rows
+        }
+
+    def _rollup_buckets(self):
+        return {
+            (row.hive_id, row.month): (
+                row.owner_id,
+                row.apiary_id,
+                row.species_id,
+                _money(row.honey_amount),
+                _money(row.propolis_amount),
+                _money(row.wax_amount),
+                _money(row.pollen_amount),
+                row.harvest_count,
+                row.last_review_date,
+            )
+            for row in MonthlyHarvestRollup.objects.all()
+        }
+
+    def assertRollupMatchesRaw(self):
+        raw = self._raw_buckets()
+        self.assertTrue(raw)
+        self.assertEqual(self._rollup_buckets(), raw)
+
+    def _create_random_revisions(self, count: int):
+        revisions = []
+        for _ in range(count):
+            revision = self._random_revision()
+            revision.save()
+            revisions.append(revision)
+        return revisions
+
+    def test_rollup_matches_raw_after_random_writes(self):
+        revisions = self._create_random_revisions(120)
+        self.assertRollupMatchesRaw()
+
+        for revision in self.rng.sample(revisions, 40):
+            changed = self._random_revision()
+            revision.hive = changed.hive
+            revision.review_date = changed.review_date
+            revision.review_type = changed.review_type
+            revision.honey_harvest_amount = changed.honey_harvest_amount
+            revision.wax_harvest_amount = changed.wax_harvest_amount
+            revision.save()
+        self.assertRollupMatchesRaw()
+
+        for revision in self.rng.sample(revisions, 30):
+            revision.delete()
+        self.assertRollupMatchesRaw()
+
+    def test_bulk_paths_keep_rollup_in_sync(self):
+        self._create_random_revisions(30)
+        Revision.objects.bulk_create([self._random_revision() for _ in range(60)])
+        self.assertRollupMatchesRaw()
+
+        Revision.objects.filter(hive=self.hives[0]).update(
+            review_type=Revision.RevisionType.HARVEST
+        )
+        Revision.objects.filter(hive=self.hives[1]).update(hive=self.hives[2])
+        self.assertRollupMatchesRaw()
+
+        batch = list(Revision.objects.filter(hive=self.hives[3]))
+        for revision in batch:
+            revision.honey_harvest_amount = self._random_amount()
+            revision.review_date = self._random_date()
+        Revision.objects.bulk_update(batch, ["honey_harvest_amount", "review_date"])
+        self.assertRollupMatchesRaw()
+
+        Revision.objects.filter(hive=self.hives[2]).delete()
+        self.assertRollupMatchesRaw()
+
+    def test_hive_changes_propagate_to_rollup(self):
+        self._create_random_revisions(60)
+        hive = self.hives[0]
+        hive.apiary = self.apiaries[1]
+        hive.species = self.species[1]
+        hive.save()
+        Hive.objects.filter(pk=self.hives[1].pk).update(apiary=None)
+        self.assertRollupMatchesRaw()
+
+        self.apiaries[1].delete()
+        self.assertRollupMatchesRaw()
+
+        self.hives[2].delete()
+        self.assertRollupMatchesRaw()
+
+    def test_hive_bulk_update_propagates_to_rollup(self):
+        self._create_random_revisions(60)
+        hives = self.hives[:4]
+        for index, hive in enumerate(hives):
+            hive.apiary = self.apiaries[(index + 1) % 2] if index else None
+            hive.species = self.species[(index + 1) % 2]
+        Hive.objects.bulk_update(hives, ["apiary", "species"])
+        self.assertRollupMatchesRaw()
+
+    def test_rebuild_command_restores_rollup(self):
+        self._create_random_revisions(80)
+        MonthlyHarvestRollup.objects.all().delete()
+        call_command("rebuild_harvest_rollup", stdout=StringIO())
+        self.assertRollupMatchesRaw()
+
+    def test_dashboard_reads_match_raw_aggregates(self):
+        self._create_random_revisions(150)
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("production-dashboard"), {"ano": self.year})
+        self.assertEqual(response.status_code, 200)
+
+        start = timezone.make_aware(datetime(self.year, 1, 1))
+        end = timezone.make_aware(datetime(self.year + 1, 1, 1)) - timedelta(microseconds=1)
+        raw = Revision.objects.filter(
+            hive__owner=self.user,
+            review_type=Revision.RevisionType.HARVEST,
+            review_date__range=(start, end),
+        )
+        totals = raw.aggregate(
+            honey=Sum("honey_harvest_amount"),
+            pollen=Sum("pollen_harvest_amount"),
+            harvests=Count("id"),
+        )
+        cards = response.context["cards"]
+        self.assertEqual(_money(cards["production"]["honey"]), _money(totals["honey"]))
+        self.assertEqual(_money(cards["production"]["pollen"]), _money(totals["pollen"]))
+        self.assertEqual(cards["revision_count"], totals["harvests"])
+
+        monthly = response.context["monthly_table"]
+        self.assertEqual(monthly["totals"]["harvests"], totals["harvests"])
+        for row in monthly["rows"]:
+            month_totals = raw.filter(review_date__month=row["month"]).aggregate(
+                honey=Sum("honey_harvest_amount"), harvests=Count("id")
+            )
+            self.assertEqual(_money(row["honey"]), _money(month_totals["honey"]))
+            self.assertEqual(row["harvests"], month_totals["harvests"])
+
+        by_apiary = {
+            str(row["name"]): _money(row["total"])
+            for row in response.context["production_by_apiary"]
+        }
+        raw_by_apiary = {
+            str(row["hive__apiary__name"] or "Sem meliponário"): _money(row["total"])
+            for row in raw.values("hive__apiary__name").annotate(
+                total=Sum("honey_harvest_amount")
+            )
+        }
+        self.assertEqual(by_apiary, raw_by_apiary)
+
+    def test_partial_month_period_falls_back_to_raw_revisions(self):
+        self._create_random_revisions(60)
+        self.client.force_login(self.user)
+        params = {"inicio": f"{self.year}-03-10", "fim": f"{self.year}-05-20"}
+        response = self.client.get(reverse("production-dashboard"), params)
+        self.assertEqual(response.status_code, 200)
+        start = timezone.make_aware(datetime(self.year, 3, 10))
+        end = timezone.make_aware(datetime.combine(datetime(self.year, 5, 20).date(), time.max))
+        expected = Revision.objects.filter(
+            hive__owner=self.user,
+            review_type=Revision.RevisionType.HARVEST,
+            review_date__range=(start, end),
+        ).count()
+        self.assertEqual(response.context["cards"]["revision_count"], expected)
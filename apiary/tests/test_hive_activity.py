@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import random
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import Count, DecimalField, Max, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from apiary.models import Hive, HiveActivitySummary, Revision, Species
+
+
+CENT = Decimal("0.01")
+HARVEST = Q(review_type=Revision.RevisionType.HARVEST)
+
+
+def _money(value) -> Decimal:
+    return Decimal(value or 0).quantize(CENT)
+
+
+class HiveActivitySummaryTests(TestCase):
+    def setUp(self):
+        self.rng = random.Random(20240612)
+        self.user = get_user_model().objects.create_user(
+            username="activity",
+            password="testpass123",
+            email="activity@example.com",
+            is_staff=True,
+        )
+        species = Species.objects.create(
+            group=Species.SpeciesGroup.STINGLESS,
+            scientific_name="Melipona fasciculata",
+            popular_name="Tiúba",
+        )
+        self.hives = [
+            Hive.objects.create(
+                owner=self.user,
+                popular_name=f"Tiúba {index}",
+                species=species,
+                acquisition_method=Hive.AcquisitionMethod.CAPTURE,
+            )
+            for index in range(4)
+        ]
+        self.now = timezone.now()
+
+    def _random_revision(self) -> Revision:
+        def amount():
+            return None if self.rng.random() < 0.3 else Decimal(self.rng.randint(0, 90000)) / 100
+
+        return Revision(
+            hive=self.rng.choice(self.hives),
+            review_date=self.now - timedelta(hours=self.rng.randint(0, 24 * 400)),
+            review_type=self.rng.choice(
+                [Revision.RevisionType.HARVEST, Revision.RevisionType.ROUTINE]
+            ),
+            honey_harvest_amount=amount(),
+            propolis_harvest_amount=amount(),
+            wax_harvest_amount=amount(),
+            pollen_harvest_amount=amount(),
+        )
+
+    def _expected(self):
+        rows = Revision.objects.values("hive_id").annotate(
+            revisions=Count("id"),
+            harvests=Count("id", filter=HARVEST),
+            last_review=Max("review_date"),
+            last_harvest=Max("review_date", filter=HARVEST),
+            honey=Coalesce(Sum("honey_harvest_amount", filter=HARVEST), Value(0), output_field=DecimalField()),
+            pollen=Coalesce(Sum("pollen_harvest_amount", filter=HARVEST), Value(0), output_field=DecimalField()),
+        )
+        return {
+            row["hive_id"]: (
+                row["revisions"],
+                row["harvests"],
+                row["last_review"],
+                row["last_harvest"],
+                _money(row["honey"]),
+                _money(row["pollen"]),
+            )
+            for row in rows
+        }
+
+    def _summaries(self):
+        return {
+            row.hive_id: (
+                row.revision_count,
+                row.harvest_count,
+                row.last_review_date,
+                row.last_harvest_date,
+                _money(row.honey_total),
+                _money(row.pollen_total),
+            )
+            for row in HiveActivitySummary.objects.filter(revision_count__gt=0)
+        }
+
+    def assertSummaryMatchesRaw(self):
+        expected = self._expected()
+        self.assertEqual(self._summaries(), expected)
+        for hive in Hive.objects.all():
+            self.assertEqual(hive.last_review_date, expected.get(hive.pk, (0, 0, None))[2])
+
+    def test_summary_follows_out_of_order_writes(self):
+        revisions = []
+        for _ in range(80):
+            revision = self._random_revision()
+            revision.save()
+            revisions.append(revision)
+        self.assertSummaryMatchesRaw()
+
+        for revision in self.rng.sample(revisions, 30):
+            changed = self._random_revision()
+            revision.hive = changed.hive
+            revision.review_date = changed.review_date
+            revision.review_type = changed.review_type
+            revision.honey_harvest_amount = changed.honey_harvest_amount
+            revision.save()
+        self.assertSummaryMatchesRaw()
+
+        for revision in self.rng.sample(revisions, 30):
+            revision.delete()
+        self.assertSummaryMatchesRaw()
+
+    def test_bulk_paths_rebuild_summary(self):
+        Revision.objects.bulk_create([self._random_revision() for _ in range(40)])
+        self.assertSummaryMatchesRaw()
+        Revision.objects.filter(hive=self.hives[0]).update(hive=self.hives[1])
+        self.assertSummaryMatchesRaw()
+        Revision.objects.filter(hive=self.hives[1]).delete()
+        self.assertSummaryMatchesRaw()
+
+    def test_backdated_revision_keeps_latest_review_date(self):
+        hive = self.hives[0]
+        latest = Revision.objects.create(hive=hive, review_date=self.now)
+        Revision.objects.create(hive=hive, review_date=self.now - timedelta(days=30))
+        hive.refresh_from_db()
+        self.assertEqual(hive.last_review_date, latest.review_date)
+
+        latest.delete()
+        hive.refresh_from_db()
+        self.assertEqual(hive.last_review_date, self.now - timedelta(days=30))
+
+    def test_rebuild_command_restores_summary(self):
+        for _ in range(30):
+            self._random_revision().save()
+        HiveActivitySummary.objects.all().delete()
+        call_command("rebuild_hive_activity", stdout=StringIO())
+        self.assertSummaryMatchesRaw()
+
+    def test_dashboard_rank_matches_raw_totals(self):
+        for _ in range(60):
+            self._random_revision().save()
+        self.client.force_login(self.user)
+        year = timezone.localdate().year
+        response = self.client.get(reverse("production-dashboard"), {"ano": year})
+        items = response.context["rank"]["items"]
+        self.assertTrue(items)
+        for item in items:
+            expected = Revision.objects.filter(
+                HARVEST, hive_id=item["hive_id"], review_date__year=year
+            ).aggregate(honey=Sum("honey_harvest_amount"), harvests=Count("id"))
+            self.assertEqual(_money(item["honey"]), _money(expected["honey"]))
+            self.assertEqual(item["harvests"], expected["harvests"])
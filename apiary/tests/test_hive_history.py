@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+from datetime import datetime, time, timedelta
 from decimal import Decimal
-from datetime import timedelta
 
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
@@ -59,7 +61,26 @@ class HiveHistoryViewTests(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIsNone(response.context["selected_hive"])
         self.assertIsNone(response.context["timeline_page"])
-        self.assertIn(self.hive, response.context["available_hives"])
+        self.assertTrue(response.context["has_hives"])
+        self.assertNotContains(response, self.hive.popular_name)
+
+    def test_selected_hive_is_the_only_rendered_option(self):
+        response = self.client.get(reverse("hive-history"), {"hive": self.hive.pk})
+        self.assertEqual(response.context["selected_hive"], self.hive)
+        self.assertContains(response, f'<option value="{self.hive.pk}" selected>')
+        self.assertContains(response, reverse("hive-autocomplete"))
+
+    def test_select2_loads_before_jquery_is_namespaced(self):
+        content = self.client.get(reverse("hive-history")).content.decode()
+        scripts = [
+            "admin/js/vendor/jquery/jquery.min.js",
+            "admin/js/vendor/select2/select2.full.min.js",
+            "admin/js/jquery.init.js",
+            "apiary/js/hive_history_selector.js",
+        ]
+        positions = [content.find(script) for script in scripts]
+        self.assertNotIn(-1, positions)
+        self.assertEqual(positions, sorted(positions))
 
     def test_timeline_merges_revision_and_observation(self):
         revision_date = timezone.now() - timedelta(days=2)
@@ -92,3 +113,168 @@ class HiveHistoryViewTests(TestCase):
         url = reverse("hive-history") + f"?hive={self.other_hive.pk}"
         response = self.client.get(url)
         self.assertEqual(response.status_code, 404)
+
+    def _history(self, **params):
+        return self.client.get(reverse("hive-history"), {"hive": self.hive.pk, **params})
+
+    def _create_mixed_timeline(self):
+        today = timezone.localdate()
+        expected = []
+        for offset in range(12):
+            day = today - timedelta(days=offset)
+            observation = QuickObservation.objects.create(
+                hive=self.hive, date=day, notes=f"Observação {offset}"
+            )
+            expected.append(f"observation-{observation.pk}")
+            for hour in (15, 9):
+                revision = Revision.objects.create(
+                    hive=self.hive,
+                    review_date=timezone.make_aware(datetime.combine(day, time(hour, 0))),
+                    review_type=Revision.RevisionType.ROUTINE,
+                )
+                expected.append(f"revision-{revision.pk}")
+        return expected
+
+    def test_keyset_pagination_walks_full_timeline(self):
+        expected = self._create_mixed_timeline()
+        seen = []
+        pages = []
+        params = {}
+        while True:
+            response = self._history(**params)
+            page = response.context["timeline_page"]
+            pages.append(page)
+            seen.extend(item["id"] for item in page.object_list)
+            if not page.has_next:
+                break
+            params = {"depois": page.next_cursor}
+        self.assertEqual(seen, expected)
+        self.assertEqual(response.context["timeline_total"], len(expected))
+        self.assertFalse(pages[0].has_previous)
+        self.assertTrue(pages[-1].has_previous)
+
+        response = self._history(antes=pages[-1].previous_cursor)
+        previous = response.context["timeline_page"]
+        self.assertEqual(
+            [item["id"] for item in previous.object_list],
+            [item["id"] for item in pages[-2].object_list],
+        )
+        self.assertTrue(previous.has_next)
+
+    def test_invalid_cursor_falls_back_to_first_page(self):
+        expected = self._create_mixed_timeline()
+        response = self._history(depois="não-é-um-cursor")
+        self.assertEqual(response.status_code, 200)
+        page = response.context["timeline_page"]
+        self.assertEqual(
+            [item["id"] for item in page.object_list],
+            expected[: len(page.object_list)],
+        )
+        self.assertFalse(page.has_previous)
+
+    def test_timeline_query_count_does_not_grow_with_history(self):
+        self._create_mixed_timeline()
+        # The first request also loads the user's permissions into the cache.
+        self._history()
+        with CaptureQueriesContext(connection) as small_history:
+            self._history()
+        self._create_mixed_timeline()
+        with CaptureQueriesContext(connection) as large_history:
+            response = self._history()
+        self.assertEqual(len(large_history), len(small_history))
+        self.assertEqual(len(response.context["timeline_page"].object_list), 20)
+
+
+class HiveAutocompleteViewTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(
+            username="searcher",
+            password="testpass123",
+            email="searcher@example.com",
+            is_staff=True,
+        )
+        self.other_user = User.objects.create_user(
+            username="searcher-other",
+            password="testpass123",
+            email="searcher-other@example.com",
+            is_staff=True,
+        )
+        self.species = Species.objects.create(
+            group=Species.SpeciesGroup.STINGLESS,
+            scientific_name="Tetragonisca angustula",
+            popular_name="Jataí",
+        )
+        self.apiary = Apiary.objects.create(name="Apiário Sul", owner=self.user)
+        self.hives = [
+            Hive.objects.create(
+                owner=self.user,
+                popular_name=f"Jataí {index:02d}",
+                species=self.species,
+                apiary=self.apiary,
+                acquisition_method=Hive.AcquisitionMethod.CAPTURE,
+            )
+            for index in range(25)
+        ]
+        self.backyard_hive = Hive.objects.create(
+            owner=self.user,
+            popular_name="Uruçu do quintal",
+            species=self.species,
+            acquisition_method=Hive.AcquisitionMethod.CAPTURE,
+        )
+        self.foreign = Hive.objects.create(
+            owner=self.other_user,
+            popular_name="Jataí vizinha",
+            species=self.species,
+            acquisition_method=Hive.AcquisitionMethod.CAPTURE,
+        )
+        self.client.force_login(self.user)
+        self.url = reverse("hive-autocomplete")
+
+    def test_results_are_limited_and_paginated(self):
+        first = self.client.get(self.url, {"q": "jat"}).json()
+        self.assertEqual(len(first["results"]), 20)
+        self.assertTrue(first["pagination"]["more"])
+        self.assertEqual(first["results"][0]["text"], "Jataí 00 · Apiário Sul")
+
+        second = self.client.get(self.url, {"q": "jat", "page": 2}).json()
+        self.assertEqual(len(second["results"]), 5)
+        self.assertFalse(second["pagination"]["more"])
+        ids = {item["id"] for item in first["results"] + second["results"]}
+        self.assertEqual(ids, {hive.pk for hive in self.hives})
+
+    def test_matches_identification_number_prefix(self):
+        prefix = self.backyard_hive.identification_number[:7].lower()
+        data = self.client.get(self.url, {"q": prefix}).json()
+        self.assertIn(self.backyard_hive.pk, [item["id"] for item in data["results"]])
+
+    def test_name_search_ignores_case_and_accents(self):
+        data = self.client.get(self.url, {"q": "URUCU"}).json()
+        self.assertEqual([item["id"] for item in data["results"]], [self.backyard_hive.pk])
+
+        Hive.objects.filter(pk=self.backyard_hive.pk).update(popular_name="Mandaçaia")
+        data = self.client.get(self.url, {"q": "mandacaia"}).json()
+        self.assertEqual([item["id"] for item in data["results"]], [self.backyard_hive.pk])
+
+    def test_name_search_uses_the_normalized_column(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url, {"q": "Jataí"})
+        search = next(query["sql"] for query in queries if "apiary_hive" in query["sql"])
+        self.assertIn('"search_name" LIKE', search)
+        self.assertNotIn('"popular_name" LIKE', search)
+
+    def test_results_respect_owner_scope(self):
+        data = self.client.get(self.url, {"q": "Jataí viz"}).json()
+        self.assertEqual(data["results"], [])
+
+        superuser = get_user_model().objects.create_superuser(
+            username="root", password="testpass123", email="root@example.com"
+        )
+        self.client.force_login(superuser)
+        data = self.client.get(self.url, {"q": "Jataí viz"}).json()
+        self.assertEqual([item["id"] for item in data["results"]], [self.foreign.pk])
+
+    def test_requires_staff_login(self):
+        self.client.logout()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 302)
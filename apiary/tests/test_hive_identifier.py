@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import re
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apiary.models import Hive, HiveIdentifierSequence, Species
+from apiary.utils.identifiers import format_identifier
+
+IDENTIFIER_PATTERN = re.compile(r"^COL-[0-9A-F]{8}$")
+
+
+class HiveIdentifierAllocatorTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="allocator",
+            password="testpass123",
+            email="allocator@example.com",
+        )
+        self.species = Species.objects.create(
+            group=Species.SpeciesGroup.STINGLESS,
+            scientific_name="Frieseomelitta varia",
+            popular_name="Marmelada",
+        )
+
+    def _hives(self, count):
+        return [
+            Hive(
+                owner=self.user,
+                popular_name=f"Marmelada {index}",
+                species=self.species,
+                acquisition_method=Hive.AcquisitionMethod.CAPTURE,
+            )
+            for index in range(count)
+        ]
+
+    def test_unsaved_instances_do_not_query(self):
+        with self.assertNumQueries(0):
+            hives = self._hives(10)
+        self.assertEqual({hive.identification_number for hive in hives}, {""})
+
+    def test_save_assigns_identifier_in_existing_format(self):
+        hive = self._hives(1)[0]
+        hive.save()
+        self.assertRegex(hive.identification_number, IDENTIFIER_PATTERN)
+
+    def test_bulk_create_checks_identifiers_per_block(self):
+        with CaptureQueriesContext(connection) as captured:
+            Hive.objects.bulk_create(self._hives(2000))
+        lookups = [
+            query["sql"]
+            for query in captured.captured_queries
+            if query["sql"].startswith('SELECT "apiary_hive"."identification_number"')
+        ]
+        # A single block is reserved and checked 500 codes at a time.
+        self.assertEqual(len(lookups), 4)
+
+        codes = list(Hive.objects.values_list("identification_number", flat=True))
+        self.assertEqual(len(codes), 2000)
+        self.assertEqual(len(set(codes)), 2000)
+        self.assertTrue(all(IDENTIFIER_PATTERN.match(code) for code in codes))
+
+    def test_codes_from_the_random_allocator_are_skipped(self):
+        start = HiveIdentifierSequence.objects.reserve("COL", 0)
+        legacy = self._hives(1)[0]
+        legacy.identification_number = format_identifier(start)
+        legacy.save()
+
+        created = Hive.objects.bulk_create(self._hives(3))
+        codes = [hive.identification_number for hive in created]
+        self.assertNotIn(legacy.identification_number, codes)
+        self.assertEqual(len(set(codes)), 3)
+
+    def test_blocks_do_not_overlap(self):
+        first = HiveIdentifierSequence.objects.reserve("COL", 50)
+        second = HiveIdentifierSequence.objects.reserve("COL", 50)
+        self.assertEqual(second, first + 50)
+        codes = {format_identifier(number) for number in range(first, second + 50)}
+        self.assertEqual(len(codes), 100)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from io import BytesIO
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from PIL import ExifTags, Image
+
+from apiary.models import Hive, QuickObservation, Species
+from apiary.utils.images import (
+    ImageTooLargeError,
+    _open_image,
+    build_renditions,
+    convert_image_to_webp,
+)
+
+
+def _encoded(size, image_format, **save_options) -> BytesIO:
+    buffer = BytesIO()
+    Image.new("RGB", size, color=(90, 140, 30)).save(buffer, format=image_format, **save_options)
+    buffer.seek(0)
+    return buffer
+
+
+class ImageConversionTests(TestCase):
+    def test_jpeg_is_reduced_while_decoding(self):
+        image, size = _open_image(_encoded((4000, 3000), "JPEG"), target=(1920, 1920))
+        self.assertEqual((image.size, size), ((2000, 1500), (4000, 3000)))
+
+        converted = convert_image_to_webp(_encoded((4000, 3000), "JPEG"), original_name="foto.jpg")
+        with Image.open(converted) as result:
+            self.assertEqual(result.size, (1920, 1440))
+
+    def test_orientation_is_applied_after_downscaling(self):
+        exif = Image.Exif()
+        exif[ExifTags.Base.Orientation] = 6
+        source = _encoded((4000, 2000), "JPEG", exif=exif.tobytes())
+
+        converted = convert_image_to_webp(source, original_name="foto.jpg")
+        with Image.open(converted) as result:
+            self.assertEqual(result.size, (960, 1920))
+        width, renditions = build_renditions(_encoded((4000, 2000), "JPEG", exif=exif.tobytes()))
+        self.assertEqual(width, 2000)
+        self.assertEqual([rendition_width for rendition_width, _ in renditions], [960, 480, 160])
+
+    def test_small_webp_is_kept_as_uploaded(self):
+        source = _encoded((800, 600), "WEBP", quality=95)
+        converted = convert_image_to_webp(source, original_name="foto.webp")
+        self.assertEqual(converted.read(), source.getvalue())
+
+    def test_large_webp_is_still_resized(self):
+        converted = convert_image_to_webp(_encoded((2400, 1200), "WEBP"), original_name="foto.webp")
+        with Image.open(converted) as result:
+            self.assertEqual(result.size, (1920, 960))
+
+    @override_settings(IMAGE_MAX_PIXELS=1_000_000)
+    def test_pixel_budget_rejects_oversized_images(self):
+        with self.assertRaises(ImageTooLargeError):
+            _open_image(_encoded((1200, 1000), "PNG"))
+
+    @override_settings(IMAGE_MAX_DECODE_MB=1)
+    def test_memory_budget_uses_the_reduced_decode_size(self):
+        # 1600x1200 RGB needs 5.5 MB, but a 1/8 JPEG draft only 86 KB.
+        _open_image(_encoded((1600, 1200), "JPEG"), target=(160, 160))
+        with self.assertRaises(ImageTooLargeError):
+            _open_image(_encoded((1600, 1200), "PNG"), target=(160, 160))
+
+    @override_settings(IMAGE_MAX_PIXELS=1_000)
+    def test_oversized_upload_is_a_validation_error(self):
+        user = get_user_model().objects.create_user(username="budget", password="testpass123")
+        species = Species.objects.create(
+            group=Species.SpeciesGroup.STINGLESS,
+            scientific_name="Melipona quadrifasciata",
+            popular_name="Mandaçaia",
+        )
+        hive = Hive.objects.create(
+            owner=user,
+            popular_name="Mandaçaia 01",
+            species=species,
+            acquisition_method=Hive.AcquisitionMethod.CAPTURE,
+        )
+        upload = SimpleUploadedFile("foto.png", _encoded((64, 48), "PNG").getvalue())
+        with self.assertRaises(ValidationError) as raised:
+            QuickObservation(hive=hive, date=timezone.localdate(), internal_photo=upload).save()
+        self.assertIn("internal_photo", raised.exception.message_dict)
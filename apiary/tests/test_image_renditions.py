@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+
+from apiary.models import Hive, ImageRendition, QuickObservation, Species
+
+
+def _png_bytes(size) -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", size, color=(40, 120, 200)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _png_upload(name="foto.png", size=(1200, 900)) -> SimpleUploadedFile:
+    return SimpleUploadedFile(name, _png_bytes(size), content_type="image/png")
+
+
+class ImageRenditionTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = get_user_model().objects.create_superuser(
+            username="renditions", password="testpass123", email="renditions@example.com"
+        )
+        species = Species.objects.create(
+            group=Species.SpeciesGroup.STINGLESS,
+            scientific_name="Tetragonisca angustula",
+            popular_name="Jataí",
+        )
+        self.hive = Hive.objects.create(
+            owner=self.user,
+            popular_name="Jataí 01",
+            species=species,
+            acquisition_method=Hive.AcquisitionMethod.CAPTURE,
+        )
+
+    def _widths(self, source_name):
+        return list(
+            ImageRendition.objects.filter(source_name=source_name)
+            .order_by("width")
+            .values_list("width", flat=True)
+        )
+
+    def test_upload_generates_renditions_next_to_the_file(self):
+        observation = QuickObservation.objects.create(
+            hive=self.hive, date=timezone.localdate(), internal_photo=_png_upload()
+        )
+        name = observation.internal_photo.name
+        self.assertEqual(self._widths(name), [160, 480, 960, 1200])
+
+        rendition = ImageRendition.objects.get(source_name=name, width=160)
+        self.assertEqual(Path(rendition.name).parents[2], Path(name).parents[2])
+        with Image.open(Path(self.media_root, rendition.name)) as image:
+            self.assertEqual((image.format, image.size), ("WEBP", (160, 120)))
+
+    def test_small_images_are_not_upscaled(self):
+        observation = QuickObservation.objects.create(
+            hive=self.hive, date=timezone.localdate(), internal_photo=_png_upload(size=(300, 200))
+        )
+        self.assertEqual(self._widths(observation.internal_photo.name), [160, 300])
+
+    def test_timeline_uses_srcset(self):
+        QuickObservation.objects.create(
+            hive=self.hive, date=timezone.localdate(), internal_photo=_png_upload()
+        )
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("hive-history"), {"hive": self.hive.pk})
+        attachment = response.context["timeline_page"].object_list[0]["attachments"][0]
+        smallest = ImageRendition.objects.get(width=160)
+        self.assertTrue(attachment["src"].endswith(smallest.name))
+        self.assertIn(f"{smallest.name} 160w", attachment["srcset"])
+        self.assertIn(" 480w", attachment["srcset"])
+        self.assertContains(response, 'sizes="150px"')
+
+    def test_backfill_command_processes_existing_media(self):
+        stored = default_storage.save(
+            "quick_observations/internal/legado.png", ContentFile(_png_bytes((800, 600)))
+        )
+        QuickObservation.objects.bulk_create(
+            [QuickObservation(hive=self.hive, date=timezone.localdate(), internal_photo=stored)]
+        )
+
+        output = StringIO()
+        call_command("generate_image_renditions", workers=1, stdout=output)
+        self.assertEqual(self._widths(stored), [160, 480, 800])
+        self.assertIn("1 imagem(ns)", output.getvalue())
+
+        output = StringIO()
+        call_command("generate_image_renditions", workers=1, stdout=output)
+        self.assertIn("0 imagem(ns)", output.getvalue())
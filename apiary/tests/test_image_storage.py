@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from PIL import Image
+
+from apiary.models import (
+    Hive,
+    ImageRendition,
+    PersonalDataDeletionJob,
+    QuickObservation,
+    Species,
+    StoredImage,
+)
+from apiary.storage import image_storage
+
+
+def _upload(color=(10, 80, 160), name="foto.png") -> SimpleUploadedFile:
+    buffer = BytesIO()
+    Image.new("RGB", (600, 400), color=color).save(buffer, format="PNG")
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+
+class ContentAddressedStorageTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.species = Species.objects.create(
+            group=Species.SpeciesGroup.STINGLESS,
+            scientific_name="Nannotrigona testaceicornis",
+            popular_name="Iraí",
+        )
+        self.user = self._user("dedup")
+        self.hive = self._hive(self.user)
+
+    def _user(self, username):
+        return get_user_model().objects.create_user(
+            username=username, password="testpass123", is_staff=True
+        )
+
+    def _hive(self, owner):
+        return Hive.objects.create(
+            owner=owner,
+            popular_name="Iraí",
+            species=self.species,
+            acquisition_method=Hive.AcquisitionMethod.CAPTURE,
+        )
+
+    def _observation(self, hive=None, **photos) -> QuickObservation:
+        return QuickObservation.objects.create(
+            hive=hive or self.hive, date=timezone.localdate(), **photos
+        )
+
+    def _refs(self, name):
+        return StoredImage.objects.filter(name=name).values_list("ref_count", flat=True).first()
+
+    def test_identical_uploads_share_one_file(self):
+        first = self._observation(internal_photo=_upload(name="IMG_0001.png"))
+        second = self._observation(internal_photo=_upload(name="IMG_0001 (1).png"))
+        other = self._observation(internal_photo=_upload(color=(200, 10, 10)))
+
+        name = first.internal_photo.name
+        self.assertEqual(second.internal_photo.name, name)
+        self.assertNotEqual(other.internal_photo.name, name)
+        self.assertRegex(name, r"^quick_observations/internal/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.webp$")
+        self.assertEqual(self._refs(name), 2)
+
+    def test_blob_is_removed_with_its_last_reference(self):
+        first = self._observation(internal_photo=_upload())
+        second = self._observation(internal_photo=_upload())
+        name = first.internal_photo.name
+        renditions = list(ImageRendition.objects.exclude(name=name).values_list("name", flat=True))
+        self.assertTrue(renditions)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertTrue(image_storage.exists(name))
+        self.assertEqual(self._refs(name), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(image_storage.exists(name))
+        self.assertIsNone(self._refs(name))
+        self.assertFalse(any(image_storage.exists(rendition) for rendition in renditions))
+        self.assertFalse(ImageRendition.objects.filter(source_name=name).exists())
+
+    def test_cascaded_deletes_release_images(self):
+        observation = self._observation(external_photo=_upload())
+        name = observation.external_photo.name
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.hive.delete()
+        self.assertFalse(image_storage.exists(name))
+
+    def test_replaced_and_cleared_photos_release_their_blob(self):
+        observation = self._observation(internal_photo=_upload())
+        old_name = observation.internal_photo.name
+
+        with self.captureOnCommitCallbacks(execute=True):
+            observation.internal_photo = _upload(color=(200, 10, 10))
+            observation.save()
+        self.assertNotEqual(observation.internal_photo.name, old_name)
+        self.assertFalse(image_storage.exists(old_name))
+        self.assertIsNone(self._refs(old_name))
+
+        new_name = observation.internal_photo.name
+        with self.captureOnCommitCallbacks(execute=True):
+            observation.internal_photo = _upload(color=(200, 10, 10), name="de novo.png")
+            observation.save()
+        self.assertEqual(observation.internal_photo.name, new_name)
+        self.assertEqual(self._refs(new_name), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            observation.notes = "Sem alteração na foto"
+            observation.save()
+        self.assertEqual(self._refs(new_name), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            observation.internal_photo = None
+            observation.save()
+        self.assertFalse(image_storage.exists(new_name))
+
+    def test_personal_data_deletion_keeps_shared_images(self):
+        other_user = self._user("vizinho")
+        kept = self._observation(hive=self._hive(other_user), internal_photo=_upload())
+        self._observation(internal_photo=_upload())
+        own_name = self._observation(internal_photo=_upload(color=(0, 0, 0))).internal_photo.name
+
+        job = PersonalDataDeletionJob.objects.request(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            job.run()
+
+        self.assertTrue(image_storage.exists(kept.internal_photo.name))
+        self.assertEqual(self._refs(kept.internal_photo.name), 1)
+        self.assertFalse(image_storage.exists(own_name))
+
+    def test_files_stored_before_deduplication_are_deleted(self):
+        name = default_storage.save("quick_observations/internal/antiga.png", _upload())
+        legacy = QuickObservation.objects.bulk_create(
+            [QuickObservation(hive=self.hive, date=timezone.localdate(), internal_photo=name)]
+        )[0]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            legacy.delete()
+        self.assertFalse(image_storage.exists(name))
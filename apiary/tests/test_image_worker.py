@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+
+from apiary.models import (
+    Hive,
+    ImageConversionJob,
+    QuickObservation,
+    Species,
+)
+
+
+def _png_upload(name="foto.png", size=(64, 48)) -> SimpleUploadedFile:
+    buffer = BytesIO()
+    Image.new("RGB", size, color=(200, 160, 40)).save(buffer, format="PNG")
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+
+class ImageWorkerTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = get_user_model().objects.create_superuser(
+            username="worker", password="testpass123", email="worker@example.com"
+        )
+        species = Species.objects.create(
+            group=Species.SpeciesGroup.STINGLESS,
+            scientific_name="Plebeia droryana",
+            popular_name="Mirim",
+        )
+        self.hive = Hive.objects.create(
+            owner=self.user,
+            popular_name="Mirim 01",
+            species=species,
+            acquisition_method=Hive.AcquisitionMethod.CAPTURE,
+        )
+
+    def _observation(self, **photos) -> QuickObservation:
+        observation = QuickObservation(hive=self.hive, date=timezone.localdate(), **photos)
+        observation.save()
+        return observation
+
+    def _run_worker(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("run_image_worker", once=True, stdout=StringIO(), stderr=StringIO())
+
+    def test_synchronous_mode_is_unchanged(self):
+        observation = self._observation(internal_photo=_png_upload())
+        self.assertTrue(observation.internal_photo.name.endswith(".webp"))
+        self.assertFalse(ImageConversionJob.objects.exists())
+
+    @override_settings(IMAGE_CONVERSION_ASYNC=True)
+    def test_worker_swaps_in_the_webp_file(self):
+        observation = self._observation(
+            internal_photo=_png_upload("interna.png"), external_photo=_png_upload("externa.png")
+        )
+        original = observation.internal_photo.name
+        self.assertTrue(original.endswith(".png"))
+        self.assertEqual(
+            ImageConversionJob.objects.filter(status=ImageConversionJob.Status.PENDING).count(), 2
+        )
+
+        self._run_worker()
+
+        observation.refresh_from_db()
+        self.assertTrue(observation.internal_photo.name.endswith(".webp"))
+        self.assertTrue(observation.external_photo.name.endswith(".webp"))
+        self.assertFalse(Path(self.media_root, original).exists())
+        self.assertTrue(Path(self.media_root, observation.internal_photo.name).exists())
+        with Image.open(observation.internal_photo.path) as converted:
+            self.assertEqual(converted.format, "WEBP")
+        self.assertEqual(
+            set(ImageConversionJob.objects.values_list("status", flat=True)),
+            {ImageConversionJob.Status.DONE},
+        )
+
+    @override_settings(IMAGE_CONVERSION_ASYNC=True)
+    def test_invalid_upload_is_still_rejected_on_save(self):
+        upload = SimpleUploadedFile("foto.png", b"not an image", content_type="image/png")
+        with self.assertRaises(ValidationError):
+            self._observation(internal_photo=upload)
+        self.assertFalse(ImageConversionJob.objects.exists())
+
+    @override_settings(IMAGE_CONVERSION_ASYNC=True)
+    def test_replaced_photo_is_not_overwritten(self):
+        observation = self._observation(internal_photo=_png_upload("antiga.png"))
+        with self.settings(IMAGE_CONVERSION_ASYNC=False):
+            observation.internal_photo = _png_upload("nova.png")
+            observation.save()
+        current = observation.internal_photo.name
+
+        self._run_worker()
+
+        observation.refresh_from_db()
+        self.assertEqual(observation.internal_photo.name, current)
+        self.assertEqual(
+            ImageConversionJob.objects.get().status, ImageConversionJob.Status.SKIPPED
+        )
+
+    @override_settings(IMAGE_CONVERSION_ASYNC=True)
+    def test_failures_are_retried_then_reported(self):
+        observation = self._observation(internal_photo=_png_upload())
+        Path(observation.internal_photo.path).write_bytes(b"corrupted")
+
+        self._run_worker()
+
+        job = ImageConversionJob.objects.get()
+        self.assertEqual(job.status, ImageConversionJob.Status.FAILED)
+        self.assertEqual(job.attempts, ImageConversionJob.MAX_ATTEMPTS)
+        self.assertIn("UnidentifiedImageError", job.last_error)
+
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("admin:apiary_imageconversionjob_changelist"))
+        self.assertContains(response, "Falhou")
+
+    @override_settings(IMAGE_CONVERSION_ASYNC=True)
+    def test_retry_action_leaves_running_jobs_alone(self):
+        observation = self._observation(
+            internal_photo=_png_upload("interna.png"), external_photo=_png_upload("externa.png")
+        )
+        running, failed = ImageConversionJob.objects.filter(object_id=observation.pk).order_by("pk")
+        ImageConversionJob.objects.filter(pk=running.pk).update(
+            status=ImageConversionJob.Status.PROCESSING, attempts=1, started_at=timezone.now()
+        )
+        ImageConversionJob.objects.filter(pk=failed.pk).update(
+            status=ImageConversionJob.Status.FAILED, attempts=3, last_error="Erro"
+        )
+
+        self.client.force_login(self.user)
+        self.client.post(
+            reverse("admin:apiary_imageconversionjob_changelist"),
+            {"action": "retry_jobs", "_selected_action": [running.pk, failed.pk]},
+        )
+
+        running.refresh_from_db()
+        failed.refresh_from_db()
+        self.assertEqual(running.status, ImageConversionJob.Status.PROCESSING)
+        self.assertEqual(running.attempts, 1)
+        self.assertEqual(failed.status, ImageConversionJob.Status.PENDING)
+        self.assertEqual(failed.attempts, 0)
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import shutil
+import tempfile
+import uuid
+from datetime import timedelta
+from io import BytesIO, StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+
+from apiary.models import (
+    Apiary,
+    City,
+    CreatorNetworkEntry,
+    Hive,
+    PersonalDataDeletionJob,
+    QuickObservation,
+    Revision,
+    RevisionAttachment,
+    Species,
+    StoredImage,
+)
+from apiary.storage import image_storage
+
+
+def _upload(color=(40, 120, 40)) -> SimpleUploadedFile:
+    buffer = BytesIO()
+    Image.new("RGB", (320, 240), color=color).save(buffer, format="PNG")
+    return SimpleUploadedFile("foto.png", buffer.getvalue(), content_type="image/png")
+
+
+class PersonalDataDeletionTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.species = Species.objects.create(
+            group=Species.SpeciesGroup.STINGLESS,
+            scientific_name="Melipona quadrifasciata",
+            popular_name="Mandaçaia",
+        )
+        self.user = get_user_model().objects.create_user(
+            username="titular", password="testpass123", is_staff=True
+        )
+        self.other = get_user_model().objects.create_user(
+            username="vizinho", password="testpass123", is_staff=True
+        )
+        self.apiary = Apiary.objects.create(name="Sítio", owner=self.user)
+        self.hives = [self._hive(self.user, self.apiary, f"Mandaçaia {index}") for index in range(3)]
+        for hive in self.hives:
+            revision = Revision.objects.create(hive=hive, review_date=timezone.now())
+            RevisionAttachment.objects.create(revision=revision, file=_upload(color=(hive.pk, 0, 0)))
+            QuickObservation.objects.create(
+                hive=hive, date=timezone.localdate(), internal_photo=_upload()
+            )
+        CreatorNetworkEntry.objects.create(
+            user=self.user,
+            name="Titular",
+            city=City.objects.create(name="Campinas - SP"),
+            phone="19999999999",
+        )
+
+        self.other_apiary = Apiary.objects.create(name="Vizinhança", owner=self.other)
+        self.other_hive = self._hive(self.other, self.other_apiary, "Mandaçaia do vizinho")
+        self.shared = QuickObservation.objects.create(
+            hive=self.other_hive, date=timezone.localdate(), internal_photo=_upload()
+        )
+
+    def _hive(self, owner, apiary, name) -> Hive:
+        return Hive.objects.create(
+            owner=owner,
+            apiary=apiary,
+            popular_name=name,
+            species=self.species,
+            acquisition_method=Hive.AcquisitionMethod.CAPTURE,
+        )
+
+    def _run_worker(self, **options) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("run_data_deletion_worker", once=True, stdout=StringIO(), **options)
+
+    def test_request_locks_the_account_and_queues_the_rest(self):
+        self.client.force_login(self.user)
+
+        response = self.client.post(reverse("admin:delete_personal_data"))
+
+        job = PersonalDataDeletionJob.objects.get()
+        self.assertRedirects(response, reverse("privacy-deletion-status", args=[job.token]))
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+        self.assertFalse(self.user.has_usable_password())
+        self.assertNotIn("_auth_user_id", self.client.session)
+        self.assertFalse(CreatorNetworkEntry.objects.exists())
+        self.assertEqual(job.status, PersonalDataDeletionJob.Status.PENDING)
+        # 3 attachments, 3 observations, 3 revisions, 3 hives and 1 apiary.
+        self.assertEqual(job.total_items, 13)
+        self.assertEqual(Hive.objects.filter(owner=self.user).count(), 3)
+        self.assertFalse(self.client.login(username="titular", password="testpass123"))
+
+        self.assertEqual(PersonalDataDeletionJob.objects.request(self.user), job)
+
+    def test_worker_deletes_everything_in_batches(self):
+        own_files = list(RevisionAttachment.objects.values_list("file", flat=True))
+        job = PersonalDataDeletionJob.objects.request(self.user)
+
+        self._run_worker(batch_size=2)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, PersonalDataDeletionJob.Status.DONE)
+        self.assertIsNone(job.user_id)
+        self.assertEqual(job.deleted_items, job.total_items)
+        self.assertFalse(get_user_model().objects.filter(pk=self.user.pk).exists())
+        self.assertFalse(Apiary.objects.filter(name="Sítio").exists())
+        self.assertEqual(list(Hive.objects.all()), [self.other_hive])
+        self.assertFalse(Revision.objects.exists())
+        self.assertFalse(RevisionAttachment.objects.exists())
+        self.assertEqual(list(QuickObservation.objects.all()), [self.shared])
+        self.assertFalse(any(image_storage.exists(name) for name in own_files))
+
+        # The photo was also used by the neighbour, so it stays with one reference.
+        name = self.shared.internal_photo.name
+        self.assertTrue(image_storage.exists(name))
+        self.assertEqual(StoredImage.objects.get(name=name).ref_count, 1)
+        self.other_apiary.refresh_from_db()
+        self.assertEqual(self.other_apiary.hive_count, 1)
+
+    def test_interrupted_job_resumes_where_it_stopped(self):
+        job = PersonalDataDeletionJob.objects.request(self.user)
+        job = PersonalDataDeletionJob.objects.claim()
+        with self.captureOnCommitCallbacks(execute=True):
+            job._delete_in_batches(RevisionAttachment.objects.all(), batch_size=2)
+        PersonalDataDeletionJob.objects.filter(pk=job.pk).update(
+            updated_at=timezone.now() - timedelta(hours=1)
+        )
+
+        self._run_worker()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, PersonalDataDeletionJob.Status.DONE)
+        self.assertEqual(job.attempts, 2)
+        self.assertEqual(job.deleted_items, job.total_items)
+
+    def test_status_page_shows_progress_only(self):
+        job = PersonalDataDeletionJob.objects.request(self.user)
+
+        response = self.client.get(reverse("privacy-deletion-status", args=[job.token]))
+        self.assertContains(response, "0 de 13 registro(s)")
+        self.assertNotContains(response, "titular")
+
+        self._run_worker()
+        response = self.client.get(reverse("privacy-deletion-status", args=[job.token]))
+        self.assertContains(response, "Todos os seus dados foram excluídos")
+
+        response = self.client.get(reverse("privacy-deletion-status", args=[uuid.uuid4()]))
+        self.assertEqual(response.status_code, 404)
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
+from datetime import timedelta
 from decimal import Decimal
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.test import RequestFactory, TestCase
 from django.urls import reverse
 from django.utils import timezone
 
 from apiary.models import Apiary, Hive, Revision, Species
+from apiary.views import ProductionDashboardView
 
 class ProductionDashboardViewTests(TestCase):
     def setUp(self):
@@ -86,6 +88,26 @@ class ProductionDashboardViewTests(TestCase):
         self.assertEqual(response["Content-Type"], "text/csv")
         self.assertIn("producao", response["Content-Disposition"])
 
+    def test_harvest_export_streams_filtered_revisions(self):
+        Revision.objects.create(
+            hive=self.hive,
+            review_date=timezone.now(),
+            review_type=Revision.RevisionType.ROUTINE,
+        )
+        url = reverse("production-dashboard") + "?export=colheitas"
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertIn("colheitas", response["Content-Disposition"])
+        with self.assertNumQueries(1):
+            lines = b"".join(response.streaming_content).decode("utf-8").splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].startswith("Data,Colmeia"))
+        self.assertIn(self.hive.identification_number, lines[1])
+        self.assertIn("1200.00", lines[1])
+        self.assertNotIn("500.00", lines[1])
+
     def test_hive_detail_view_requires_ownership(self):
         detail_url = reverse("production-dashboard-hive-detail", args=[self.hive.pk])
         response = self.client.get(detail_url)
@@ -101,3 +123,38 @@ class ProductionDashboardViewTests(TestCase):
         # The honey total should match only the logged user's revision (1200)
         total_honey = response.context["monthly_table"]["totals"]["honey"]
         self.assertEqual(total_honey, Decimal("1200"))
+
+    def _dashboard_view(self, query=None):
+        request = RequestFactory().get(reverse("production-dashboard"), query or {})
+        request.user = self.user
+        view = ProductionDashboardView()
+        view.setup(request)
+        return view
+
+    def test_cards_use_one_revision_and_one_hive_query(self):
+        Hive.objects.create(
+            owner=self.user,
+            popular_name="Colmeia Morta",
+            species=self.species,
+            apiary=self.apiary,
+            status=Hive.HiveStatus.DEAD,
+            acquisition_method=Hive.AcquisitionMethod.DIVISION,
+        )
+        stale = Hive.objects.create(
+            owner=self.user,
+            popular_name="Colmeia Esquecida",
+            species=self.species,
+            acquisition_method=Hive.AcquisitionMethod.DIVISION,
+        )
+        Hive.objects.filter(pk=stale.pk).update(
+            last_review_date=timezone.now() - timedelta(days=90)
+        )
+        for query in ({}, {"inicio": "2020-01-10", "fim": "2020-02-10"}):
+            view = self._dashboard_view(query)
+            with self.assertNumQueries(2):
+                cards = view._build_cards(view.filtered_revisions)
+        view = self._dashboard_view()
+        cards = view._build_cards(view.filtered_revisions)
+        self.assertEqual(cards["active_hives"], 2)
+        self.assertEqual(cards["overdue_total"], 2)
+        self.assertAlmostEqual(cards["overdue_percentage"], 200 / 3)
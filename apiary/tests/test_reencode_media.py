@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import json
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from PIL import Image
+
+from apiary.models import Hive, QuickObservation, Species
+
+
+def _stored(name, image_format, **save_options) -> str:
+    buffer = BytesIO()
+    Image.effect_noise((400, 300), 60).convert("RGB").save(buffer, format=image_format, **save_options)
+    return default_storage.save(name, ContentFile(buffer.getvalue()))
+
+
+class ReencodeMediaTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.state_file = str(Path(self.media_root, "state.json"))
+
+        user = get_user_model().objects.create_user(username="reencode", password="testpass123")
+        species = Species.objects.create(
+            group=Species.SpeciesGroup.STINGLESS,
+            scientific_name="Melipona rufiventris",
+            popular_name="Uruçu-amarela",
+        )
+        self.hive = Hive.objects.create(
+            owner=user,
+            popular_name="Uruçu 01",
+            species=species,
+            acquisition_method=Hive.AcquisitionMethod.CAPTURE,
+        )
+
+    def _observation(self, name) -> QuickObservation:
+        # bulk_create skips save(), as for media uploaded before the WebP policy.
+        return QuickObservation.objects.bulk_create(
+            [QuickObservation(hive=self.hive, date=timezone.localdate(), internal_photo=name)]
+        )[0]
+
+    def _run(self, **options) -> str:
+        output = StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command(
+                "reencode_media",
+                workers=1,
+                state_file=self.state_file,
+                stdout=output,
+                stderr=StringIO(),
+                **options,
+            )
+        return output.getvalue()
+
+    def test_dry_run_reports_without_changes(self):
+        name = _stored("quick_observations/internal/antiga.png", "PNG")
+        observation = self._observation(name)
+
+        output = self._run(dry_run=True)
+
+        self.assertIn("Simulação: 1 imagem(ns) convertida(s)", output)
+        observation.refresh_from_db()
+        self.assertEqual(observation.internal_photo.name, name)
+        self.assertTrue(default_storage.exists(name))
+
+    def test_legacy_files_are_converted_and_references_updated(self):
+        png = self._observation(_stored("quick_observations/internal/antiga.png", "PNG"))
+        jpeg = self._observation(_stored("quick_observations/internal/antiga.jpg", "JPEG"))
+        Hive.objects.filter(pk=self.hive.pk).update(photo=_stored("hive_photos/colmeia.png", "PNG"))
+
+        output = self._run()
+
+        self.assertIn("3 imagem(ns) convertida(s)", output)
+        for observation in (png, jpeg):
+            old_name = observation.internal_photo.name
+            observation.refresh_from_db()
+            self.assertTrue(observation.internal_photo.name.endswith(".webp"))
+            self.assertFalse(default_storage.exists(old_name))
+            self.assertTrue(default_storage.exists(observation.internal_photo.name))
+        self.hive.refresh_from_db()
+        self.assertTrue(self.hive.photo.name.endswith(".webp"))
+        self.assertFalse(Path(self.state_file).exists())
+
+        self.assertIn("0 imagem(ns) convertida(s)", self._run())
+
+    def test_webp_files_are_only_replaced_when_smaller(self):
+        observation = self._observation(
+            _stored("quick_observations/internal/atual.webp", "WEBP", quality=95)
+        )
+        original = observation.internal_photo.name
+
+        self.assertIn("0 imagem(ns) convertida(s)", self._run())
+        self.assertIn("0 imagem(ns) convertida(s), 1 mantida(s)", self._run(include_webp=True, quality=100))
+
+        self._run(include_webp=True, quality=20)
+        observation.refresh_from_db()
+        self.assertNotEqual(observation.internal_photo.name, original)
+        self.assertFalse(default_storage.exists(original))
+
+    def test_resume_skips_finished_batches(self):
+        done = self._observation(_stored("quick_observations/internal/feita.png", "PNG"))
+        pending = self._observation(_stored("quick_observations/internal/pendente.png", "PNG"))
+        Path(self.state_file).write_text(
+            json.dumps({"apiary.quickobservation.internal_photo": done.pk})
+        )
+
+        self._run(resume=True)
+
+        done.refresh_from_db()
+        pending.refresh_from_db()
+        self.assertTrue(done.internal_photo.name.endswith(".png"))
+        self.assertTrue(pending.internal_photo.name.endswith(".webp"))
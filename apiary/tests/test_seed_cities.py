@@ -0,0 +1,31 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apiary.models import City
+
+
+class SeedCitiesCommandTests(TestCase):
+    def _run(self) -> str:
+        output = StringIO()
+        call_command("seed_cities", stdout=output, stderr=StringIO())
+        return output.getvalue()
+
+    def test_full_seed_uses_bulk_writes_and_is_idempotent(self):
+        with CaptureQueriesContext(connection) as queries:
+            output = self._run()
+
+        created = City.objects.count()
+        self.assertGreater(created, 5000)
+        self.assertIn(f"{created} cidade(s) criada(s)", output)
+        campinas = City.objects.get(name="Campinas - SP")
+        self.assertEqual((campinas.state, campinas.search_name), ("SP", "campinas"))
+        # A handful of insert batches, not one query per city.
+        self.assertLess(len(queries), 40)
+
+        output = self._run()
+        self.assertIn(f"0 cidade(s) criada(s), {created} cidade(s) já cadastrada(s)", output)
+        self.assertEqual(City.objects.count(), created)
@@ -1,5 +1,6 @@
 import json
 import tempfile
+from io import StringIO
 from pathlib import Path
 
 from django.core.management import call_command
@@ -102,3 +103,29 @@ class SeedSpeciesCommandTests(TestCase):
         self.assertEqual(species.group, Species.SpeciesGroup.APIS_MELLIFERA)
         self.assertEqual(species.states, ["RS"])
         self.assertEqual(species.characteristics, "Descrição atualizada.")
+
+    def test_seed_species_skips_unchanged_and_invalid_entries(self):
+        payload = [
+            {
+                "nome_popular": "Abelha Estável",
+                "nome_cientifico": "Testus stabilis",
+                "grupo": "sem_ferrao",
+                "ufs": ["ba"],
+            },
+            {
+                "nome_popular": "Abelha Inválida",
+                "nome_cientifico": "Testus invalidus",
+                "grupo": "sem_ferrao",
+                "ufs": ["xx"],
+            },
+        ]
+        self._write_payload(payload)
+        call_command("seed_species", file=self.temp_file.name, stdout=StringIO(), stderr=StringIO())
+
+        output = StringIO()
+        errors = StringIO()
+        call_command("seed_species", file=self.temp_file.name, stdout=output, stderr=errors)
+
+        self.assertIn("0 criada(s), 0 atualizada(s), 1 sem alteração", output.getvalue())
+        self.assertIn("Testus invalidus", errors.getvalue())
+        self.assertFalse(Species.objects.filter(scientific_name="Testus invalidus").exists())
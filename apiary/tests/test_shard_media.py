@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from PIL import Image
+
+from apiary.models import Hive, ImageRendition, QuickObservation, Species
+from apiary.storage import image_storage, is_sharded
+
+
+def _image_bytes(color=(30, 90, 60), image_format="PNG") -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (700, 500), color=color).save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+class ShardedMediaTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        user = get_user_model().objects.create_user(username="shards", password="testpass123")
+        species = Species.objects.create(
+            group=Species.SpeciesGroup.STINGLESS,
+            scientific_name="Scaptotrigona bipunctata",
+            popular_name="Tubuna",
+        )
+        self.hive = Hive.objects.create(
+            owner=user,
+            popular_name="Tubuna 01",
+            species=species,
+            acquisition_method=Hive.AcquisitionMethod.CAPTURE,
+        )
+
+    def _legacy(self, name, content) -> QuickObservation:
+        stored = default_storage.save(name, ContentFile(content))
+        return QuickObservation.objects.bulk_create(
+            [QuickObservation(hive=self.hive, date=timezone.localdate(), internal_photo=stored)]
+        )[0]
+
+    def _run(self) -> str:
+        output = StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("shard_media", batch_size=1, stdout=output, stderr=StringIO())
+        return output.getvalue()
+
+    def test_uploads_and_renditions_are_sharded(self):
+        observation = QuickObservation.objects.create(
+            hive=self.hive,
+            date=timezone.localdate(),
+            internal_photo=SimpleUploadedFile("foto.png", _image_bytes()),
+        )
+        name = observation.internal_photo.name
+        self.assertRegex(
+            name, r"^quick_observations/internal/([0-9a-f]{2})/([0-9a-f]{2})/\1\2[0-9a-f]{60}\.webp$"
+        )
+        for rendition in ImageRendition.objects.filter(source_name=name):
+            self.assertTrue(rendition.name.startswith("quick_observations/internal/"))
+            self.assertTrue(is_sharded(rendition.name), rendition.name)
+
+    def test_command_moves_flat_files_and_keeps_renditions(self):
+        legacy = self._legacy("quick_observations/internal/antiga.png", _image_bytes())
+        flat = self._legacy(
+            "quick_observations/internal/" + "ab" * 32 + ".webp",
+            _image_bytes(color=(120, 10, 10), image_format="WEBP"),
+        )
+        flat_name = flat.internal_photo.name
+        rendition = default_storage.save("quick_observations/internal/antiga_160w.webp", ContentFile(b"x"))
+        ImageRendition.objects.bulk_create(
+            [
+                ImageRendition(source_name=flat_name, width=700, name=flat_name),
+                ImageRendition(source_name=flat_name, width=160, name=rendition),
+            ]
+        )
+
+        self.assertIn("3 arquivo(s) movido(s)", self._run())
+
+        for observation in (legacy, flat):
+            observation.refresh_from_db()
+            self.assertTrue(is_sharded(observation.internal_photo.name))
+            self.assertTrue(image_storage.exists(observation.internal_photo.name))
+        self.assertFalse(image_storage.exists("quick_observations/internal/antiga.png"))
+        self.assertFalse(image_storage.exists(flat_name))
+
+        renditions = dict(
+            ImageRendition.objects.filter(source_name=flat.internal_photo.name).values_list(
+                "width", "name"
+            )
+        )
+        self.assertEqual(renditions[700], flat.internal_photo.name)
+        self.assertTrue(is_sharded(renditions[160]))
+        self.assertTrue(image_storage.exists(renditions[160]))
+        self.assertFalse(image_storage.exists(rendition))
+
+        self.assertIn("0 arquivo(s) movido(s)", self._run())
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from apiary.forms import ColmeiaForm
+from apiary.models import Apiary, City, Hive, Species, SpeciesState
+
+
+class SpeciesStateTests(TestCase):
+    def setUp(self):
+        self.mandacaia = Species.objects.create(
+            group=Species.SpeciesGroup.STINGLESS,
+            scientific_name="Melipona quadrifasciata",
+            popular_name="Mandaçaia",
+            states=["MG", "SP"],
+        )
+        self.jandaira = Species.objects.create(
+            group=Species.SpeciesGroup.STINGLESS,
+            scientific_name="Melipona subnitida",
+            popular_name="Jandaíra",
+            states=["RN"],
+        )
+        self.owner = get_user_model().objects.create_user(username="uf", password="testpass123")
+        self.apiary = Apiary.objects.create(
+            name="Meliponário Serra",
+            owner=self.owner,
+            city=City.objects.create(name="Belo Horizonte - MG"),
+        )
+
+    def _states(self, species):
+        return set(SpeciesState.objects.filter(species=species).values_list("state", flat=True))
+
+    def test_save_keeps_state_rows_in_sync(self):
+        self.assertEqual(self._states(self.mandacaia), {"MG", "SP"})
+
+        self.mandacaia.states = ["SP", "BA"]
+        self.mandacaia.save()
+        self.assertEqual(self._states(self.mandacaia), {"SP", "BA"})
+
+    def test_found_in_uses_one_query(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(list(Species.objects.found_in("mg")), [self.mandacaia])
+
+    def test_seed_species_syncs_state_rows(self):
+        payload = [
+            {
+                "nome_popular": "Jandaíra",
+                "nome_cientifico": "Melipona subnitida",
+                "grupo": "sem_ferrao",
+                "ufs": ["rn", "pb"],
+            },
+            {
+                "nome_popular": "Borá",
+                "nome_cientifico": "Tetragona clavipes",
+                "grupo": "sem_ferrao",
+                "ufs": ["mg"],
+            },
+        ]
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as handle:
+            json.dump(payload, handle)
+        self.addCleanup(Path(handle.name).unlink)
+
+        call_command("seed_species", file=handle.name, stdout=StringIO(), stderr=StringIO())
+
+        self.assertEqual(self._states(self.jandaira), {"RN", "PB"})
+        self.assertEqual(
+            set(Species.objects.found_in("MG").values_list("popular_name", flat=True)),
+            {"Mandaçaia", "Borá"},
+        )
+
+    def test_hive_form_offers_species_of_the_apiary_state(self):
+        form = ColmeiaForm(initial={"apiary": self.apiary.pk})
+        self.assertEqual(list(form.fields["species"].queryset), [self.mandacaia])
+
+        # The page does not narrow the list when the apiary changes, so a
+        # submitted form accepts any species.
+        form = ColmeiaForm(data={"apiary": str(self.apiary.pk)})
+        self.assertEqual(form.fields["species"].queryset.count(), 2)
+
+        form = ColmeiaForm()
+        self.assertEqual(form.fields["species"].queryset.count(), 2)
+
+    def test_species_without_states_are_offered_everywhere(self):
+        jatai = Species.objects.create(
+            group=Species.SpeciesGroup.STINGLESS,
+            scientific_name="Tetragonisca angustula",
+            popular_name="Jataí",
+            states=[],
+        )
+        form = ColmeiaForm(initial={"apiary": self.apiary.pk})
+        self.assertEqual(set(form.fields["species"].queryset), {self.mandacaia, jatai})
+
+        form = ColmeiaForm(
+            data={
+                "owner": self.owner.pk,
+                "apiary": self.apiary.pk,
+                "species": jatai.pk,
+                "popular_name": "Jataí 01",
+                "acquisition_method": Hive.AcquisitionMethod.CAPTURE,
+                "transfer_box_date": "2024-05-01",
+                "status": Hive.HiveStatus.PRODUCTIVE,
+            }
+        )
+        self.assertNotIn("species", form.errors)
+
+    def test_hive_form_keeps_the_current_species(self):
+        hive = Hive.objects.create(
+            owner=self.owner,
+            apiary=self.apiary,
+            popular_name="Jandaíra 01",
+            species=self.jandaira,
+            acquisition_method=Hive.AcquisitionMethod.CAPTURE,
+        )
+
+        form = ColmeiaForm(instance=hive)
+        self.assertEqual(
+            set(form.fields["species"].queryset), {self.mandacaia, self.jandaira}
+        )
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from django.test import SimpleTestCase
+from django.urls import NoReverseMatch, clear_script_prefix, reverse, set_script_prefix
+
+from apiary.utils.urls import url_template
+
+
+class URLTemplateTests(SimpleTestCase):
+    def test_matches_reverse(self):
+        for route in ("admin:apiary_hive_change", "production-dashboard-hive-detail"):
+            with self.subTest(route=route):
+                self.assertEqual(url_template(route)(42), reverse(route, args=[42]))
+
+    def test_follows_the_script_prefix(self):
+        set_script_prefix("/colmeia-online/")
+        self.addCleanup(clear_script_prefix)
+        self.assertEqual(
+            url_template("admin:apiary_hive_change")(7),
+            "/colmeia-online/admin/apiary/hive/7/change/",
+        )
+
+    def test_routes_without_arguments_are_rejected(self):
+        with self.assertRaises(NoReverseMatch):
+            url_template("admin:apiary_hive_changelist")
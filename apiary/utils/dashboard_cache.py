@@ -0,0 +1,132 @@
+"""Versioned per-user result cache for the production dashboards.
+
+Each owner has a data version stored in the cache. Writes to ``Revision``,
+``Hive`` and ``Apiary`` replace that version, so entries computed for an older
+version are simply never looked up again and expire on their own. Superusers
+see every owner's data and therefore use a global version that changes on any
+write.
+
+Versions only reach every gunicorn worker through a shared backend, so caching
+is bypassed when the configured cache is the per-process ``LocMemCache``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from typing import Callable, Iterable, TypeVar
+from urllib.parse import parse_qsl, urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+T = TypeVar("T")
+
+GLOBAL_SCOPE = "all"
+DEFAULT_TIMEOUT = 300
+
+
+def _cache():
+    return caches[getattr(settings, "DASHBOARD_CACHE_ALIAS", "default")]
+
+
+def is_enabled() -> bool:
+    """Whether the dashboard cache is shared by every process."""
+    return not isinstance(_cache(), LocMemCache)
+
+
+def _timeout() -> int:
+    return getattr(settings, "DASHBOARD_CACHE_TIMEOUT", DEFAULT_TIMEOUT)
+
+
+def _version_key(scope) -> str:
+    return f"dashboard:version:{scope}"
+
+
+def _stats_key(kind: str) -> str:
+    return f"dashboard:stats:{kind}"
+
+
+def normalize_query_string(query_string: str) -> str:
+    """Sort the query parameters so equivalent filters share a cache entry."""
+    return urlencode(sorted(parse_qsl(query_string, keep_blank_values=True)))
+
+
+def get_data_version(user) -> str:
+    scope = GLOBAL_SCOPE if user.is_superuser else user.pk
+    cache = _cache()
+    key = _version_key(scope)
+    version = cache.get(key)
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(key, version, timeout=None):
+            version = cache.get(key, version)
+    return str(version)
+
+
+def bump_data_version(owner_ids: Iterable[int | None]) -> None:
+    """Invalidate the cached dashboards of ``owner_ids`` and of superusers.
+
+    The version is replaced right away and again once the surrounding
+    transaction commits, so a page computed from uncommitted data is never
+    kept under the final version.
+    """
+    keys = [_version_key(owner_id) for owner_id in set(owner_ids) if owner_id is not None]
+    keys.append(_version_key(GLOBAL_SCOPE))
+
+    def _bump() -> None:
+        version = time.time_ns()
+        _cache().set_many({key: version for key in keys}, timeout=None)
+
+    _bump()
+    transaction.on_commit(_bump)
+
+
+def _record(kind: str) -> None:
+    cache = _cache()
+    key = _stats_key(kind)
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def get_cache_stats() -> dict[str, int]:
+    cache = _cache()
+    return {
+        "hits": cache.get(_stats_key("hits"), 0),
+        "misses": cache.get(_stats_key("misses"), 0),
+    }
+
+
+def reset_cache_stats() -> None:
+    _cache().delete_many([_stats_key("hits"), _stats_key("misses")])
+
+
+def cached_result(
+    user,
+    *,
+    namespace: str,
+    query_string: str,
+    builder: Callable[[], T],
+) -> tuple[T, bool]:
+    """Return ``builder()`` from the cache when possible.
+
+    The second item of the tuple tells whether the value came from the cache.
+    """
+    if not is_enabled():
+        return builder(), False
+    digest = hashlib.md5(normalize_query_string(query_string).encode("utf-8")).hexdigest()
+    key = f"dashboard:{namespace}:{user.pk}:{get_data_version(user)}:{digest}"
+    cache = _cache()
+    result = cache.get(key)
+    if result is not None:
+        _record("hits")
+        return result, True
+    _record("misses")
+    result = builder()
+    cache.set(key, result, timeout=_timeout())
+    return result, False
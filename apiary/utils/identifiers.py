@@ -0,0 +1,73 @@
+"""Block allocator for ``COL-XXXXXXXX`` hive identifiers.
+
+Numbers are reserved in blocks from ``HiveIdentifierSequence`` with a row
+lock, so concurrent workers never receive the same range. Each number is
+mapped through a bijection of the 32-bit space to keep the random-looking
+code format, and a whole block is checked against the codes generated by the
+previous random allocator with a single query.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import List
+
+from django.db import transaction
+
+HIVE_IDENTIFIER_PREFIX = "COL"
+BLOCK_SIZE = 100
+
+_MASK = 0xFFFFFFFF
+_MULTIPLIER = 0x9E3779B1  # odd, so multiplication modulo 2**32 is a bijection
+_OFFSET = 0x5BD1E995
+_LOOKUP_CHUNK = 500
+
+
+def format_identifier(number: int, prefix: str = HIVE_IDENTIFIER_PREFIX) -> str:
+    return f"{prefix}-{((number * _MULTIPLIER) & _MASK) ^ _OFFSET:08X}"
+
+
+class HiveIdentifierAllocator:
+    """Hand out unique identifiers, keeping unused codes of committed blocks."""
+
+    def __init__(self, prefix: str = HIVE_IDENTIFIER_PREFIX, block_size: int = BLOCK_SIZE):
+        self.prefix = prefix
+        self.block_size = block_size
+        self._pool: List[str] = []
+        self._lock = threading.Lock()
+
+    def _reserve(self, count: int) -> List[str]:
+        from apiary.models import Hive, HiveIdentifierSequence
+
+        start = HiveIdentifierSequence.objects.reserve(self.prefix, count)
+        codes = [format_identifier(number, self.prefix) for number in range(start, start + count)]
+        taken = set()
+        for index in range(0, len(codes), _LOOKUP_CHUNK):
+            taken.update(
+                Hive.objects.filter(
+                    identification_number__in=codes[index : index + _LOOKUP_CHUNK]
+                ).values_list("identification_number", flat=True)
+            )
+        return [code for code in codes if code not in taken]
+
+    def allocate(self, count: int = 1) -> List[str]:
+        with self._lock:
+            codes = self._pool[:count]
+            del self._pool[:count]
+        while len(codes) < count:
+            fresh = self._reserve(max(self.block_size, count - len(codes)))
+            missing = count - len(codes)
+            codes.extend(fresh[:missing])
+            leftovers = fresh[missing:]
+            if leftovers:
+                # A rolled back reservation may be handed out again, so only
+                # codes from committed blocks are kept for later calls.
+                transaction.on_commit(lambda leftovers=leftovers: self._release(leftovers))
+        return codes
+
+    def _release(self, codes: List[str]) -> None:
+        with self._lock:
+            self._pool.extend(codes)
+
+
+hive_identifiers = HiveIdentifierAllocator()
@@ -1,15 +1,28 @@
 from __future__ import annotations
 
+import math
+import sys
 from io import BytesIO
 from pathlib import Path
-from typing import Tuple
+from typing import Iterable, List, Tuple
 
-from PIL import Image, ImageOps
+from PIL import ExifTags, Image, ImageOps
 
+from django.conf import settings
 from django.core.files.base import ContentFile
 
 DEFAULT_WEBP_MAX_SIZE: Tuple[int, int] = (1920, 1920)
 DEFAULT_WEBP_QUALITY: int = 80
+RENDITION_WIDTHS: Tuple[int, ...] = (160, 480, 960)
+DEFAULT_IMAGE_MAX_PIXELS: int = 50_000_000
+DEFAULT_IMAGE_MAX_DECODE_MB: int = 200
+REDUCING_GAP: float = 3.0
+
+_ROTATED_ORIENTATIONS = {5, 6, 7, 8}
+
+
+class ImageTooLargeError(ValueError):
+    """The image exceeds the configured pixel or decoding memory budget."""
 
 
 def _normalize_image_mode(image: Image.Image) -> Image.Image:
@@ -25,28 +38,181 @@ def _normalize_image_mode(image: Image.Image) -> Image.Image:
     return image.convert("RGB") if image.mode != "RGB" else image
 
 
+def _open_image(
+    source, *, target: Tuple[int, int] | None = None
+) -> Tuple[Image.Image, Tuple[int, int]]:
+    """Open ``source`` without decoding it and enforce the image budget.
+
+    Only the header is read here. For JPEG, ``draft`` makes the decoder scale
+    the image down by 1/2, 1/4 or 1/8 while decoding, as long as the result
+    can still fill the ``target`` box (given in display orientation); the
+    memory budget applies to that reduced size. Returns the image and its
+    full size in display orientation.
+    """
+    source.seek(0)
+    try:
+        image = Image.open(source)
+    except Image.DecompressionBombError as exc:
+        raise ImageTooLargeError(str(exc)) from exc
+
+    max_pixels = getattr(settings, "IMAGE_MAX_PIXELS", DEFAULT_IMAGE_MAX_PIXELS)
+    if image.width * image.height > max_pixels:
+        raise ImageTooLargeError(
+            f"{image.width}x{image.height} excede o limite de {max_pixels} pixels"
+        )
+    oriented_size = _oriented_size(image)
+    if target and image.format == "JPEG":
+        if oriented_size != image.size:
+            target = (target[1], target[0])
+        # Ask for the size the image will have once it fits in ``target``.
+        scale = min(target[0] / image.width, target[1] / image.height, 1)
+        image.draft("RGB", (math.ceil(image.width * scale), math.ceil(image.height * scale)))
+    max_bytes = getattr(settings, "IMAGE_MAX_DECODE_MB", DEFAULT_IMAGE_MAX_DECODE_MB) * 1024 * 1024
+    if image.width * image.height * len(image.getbands()) > max_bytes:
+        raise ImageTooLargeError(
+            f"{image.width}x{image.height} excede o limite de memória para decodificação"
+        )
+    return image, oriented_size
+
+
+def _oriented_size(image: Image.Image) -> Tuple[int, int]:
+    """Return the size of ``image`` once its EXIF orientation is applied."""
+    if image.getexif().get(ExifTags.Base.Orientation) in _ROTATED_ORIENTATIONS:
+        return image.height, image.width
+    return image.size
+
+
+def ensure_image(uploaded_file) -> None:
+    """Raise ``UnidentifiedImageError`` or ``ImageTooLargeError`` for bad uploads."""
+    _open_image(uploaded_file, target=DEFAULT_WEBP_MAX_SIZE)
+    uploaded_file.seek(0)
+
+
+def _encode_webp(image: Image.Image, quality: int) -> bytes:
+    buffer = BytesIO()
+    image.save(buffer, format="WEBP", quality=quality, method=6)
+    return buffer.getvalue()
+
+
+def rendition_name(source_name: str, width: int) -> str:
+    """Return the storage name of a rendition, next to the source file."""
+    path = Path(source_name)
+    return str(path.with_name(f"{path.stem}_{width}w.webp"))
+
+
+def build_renditions(
+    source,
+    *,
+    widths: Iterable[int] = RENDITION_WIDTHS,
+    quality: int = DEFAULT_WEBP_QUALITY,
+) -> Tuple[int, List[Tuple[int, bytes]]]:
+    """Downscale ``source`` to each width narrower than the image itself.
+
+    The image is decoded once and every rendition is resized from the next
+    larger one, so the cost is dominated by the first resize. Returns the
+    source width along with the encoded renditions.
+    """
+    widths = sorted(set(widths), reverse=True)
+    image, (source_width, _) = _open_image(
+        source, target=(widths[0] if widths else sys.maxsize, sys.maxsize)
+    )
+    image = ImageOps.exif_transpose(image)
+    image = _normalize_image_mode(image)
+
+    renditions: List[Tuple[int, bytes]] = []
+    for width in widths:
+        if width >= source_width:
+            continue
+        height = max(1, round(image.height * width / image.width))
+        image = image.resize((width, height), Image.Resampling.LANCZOS)
+        renditions.append((width, _encode_webp(image, quality)))
+    return source_width, renditions
+
+
+def store_renditions(
+    storage, source_name: str, *, widths: Iterable[int] = RENDITION_WIDTHS
+) -> List[Tuple[int, str]]:
+    """Write the renditions of a stored image; return ``(width, name)`` pairs.
+
+    The source itself is listed at its own width so it can be offered in a
+    ``srcset`` and marks the image as processed.
+    """
+    with storage.open(source_name, "rb") as source:
+        source_width, renditions = build_renditions(source, widths=widths)
+    stored = [(source_width, source_name)]
+    for width, content in renditions:
+        stored.append((width, storage.save(rendition_name(source_name, width), ContentFile(content))))
+    return stored
+
+
+def render_stored_image(source_name: str) -> Tuple[str, List[Tuple[int, str]], str]:
+    """Process pool entry point for ``generate_image_renditions``."""
+    from apiary.storage import image_storage
+
+    try:
+        return source_name, store_renditions(image_storage, source_name), ""
+    except Exception as exc:  # Reported by the command, the batch goes on.
+        return source_name, [], f"{type(exc).__name__}: {exc}"
+
+
+def should_replace(source_name: str, original_size: int, new_size: int) -> bool:
+    """Other formats always become WebP; WebP files only if the result is smaller."""
+    return not source_name.lower().endswith(".webp") or new_size < original_size
+
+
+def reencode_stored_image(
+    source_name: str, quality: int, dry_run: bool
+) -> Tuple[str, str, int, int, str]:
+    """Process pool entry point for ``reencode_media``.
+
+    Returns the source name, the stored WebP name (empty when nothing was
+    written), the sizes before and after and an error message.
+    """
+    from apiary.storage import image_storage
+
+    try:
+        original_size = image_storage.size(source_name)
+        with image_storage.open(source_name, "rb") as source:
+            converted = convert_image_to_webp(
+                source, original_name=source_name, quality=quality, keep_webp=False
+            )
+        new_size = converted.size
+        if dry_run or not should_replace(source_name, original_size, new_size):
+            return source_name, "", original_size, new_size, ""
+        new_name = image_storage.save(str(Path(source_name).with_suffix(".webp")), converted)
+        return source_name, new_name, original_size, new_size, ""
+    except Exception as exc:  # Reported by the command, the batch goes on.
+        return source_name, "", 0, 0, f"{type(exc).__name__}: {exc}"
+
+
 def convert_image_to_webp(
     uploaded_file,
     *,
     original_name: str,
     max_size: Tuple[int, int] = DEFAULT_WEBP_MAX_SIZE,
     quality: int = DEFAULT_WEBP_QUALITY,
+    keep_webp: bool = True,
 ) -> ContentFile:
-    """Convert an uploaded image to an optimized WebP representation."""
-    uploaded_file.seek(0)
-    image = Image.open(uploaded_file)
-    image = ImageOps.exif_transpose(image)
-    image = _normalize_image_mode(image)
-    image.thumbnail(max_size, Image.Resampling.LANCZOS)
-
-    buffer = BytesIO()
-    image.save(
-        buffer,
-        format="WEBP",
-        quality=quality,
-        method=6,
-    )
-    buffer.seek(0)
+    """Convert an uploaded image to an optimized WebP representation.
 
+    The image is shrunk before the orientation and mode conversions so they
+    never run at full resolution. Unless ``keep_webp`` is false, a WebP upload
+    that already fits ``max_size`` and needs no rotation is stored without
+    re-encoding.
+    """
+    image, _ = _open_image(uploaded_file, target=max_size)
     name = f"{Path(original_name).stem}.webp"
-    return ContentFile(buffer.getvalue(), name=name)
+    if (
+        keep_webp
+        and image.format == "WEBP"
+        and image.width <= max_size[0]
+        and image.height <= max_size[1]
+        and image.getexif().get(ExifTags.Base.Orientation, 1) == 1
+    ):
+        uploaded_file.seek(0)
+        return ContentFile(uploaded_file.read(), name=name)
+
+    image.thumbnail(max_size, Image.Resampling.LANCZOS, reducing_gap=REDUCING_GAP)
+    image = ImageOps.exif_transpose(image)
+    image = _normalize_image_mode(image)
+    return ContentFile(_encode_webp(image, quality), name=name)
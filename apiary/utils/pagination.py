@@ -0,0 +1,57 @@
+"""Paginator that avoids exact ``COUNT(*)`` queries on large PostgreSQL tables."""
+
+from __future__ import annotations
+
+import json
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+
+def estimate_count(queryset) -> int | None:
+    """Return the planner's row estimate for ``queryset`` or ``None``.
+
+    Unfiltered querysets read ``pg_class.reltuples``; filtered ones use the
+    ``Plan Rows`` of ``EXPLAIN``. Other database backends have no estimate.
+    """
+    if not isinstance(queryset, QuerySet):
+        return None
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+            if row and row[0] is not None and row[0] >= 0:
+                return int(row[0])
+            return None
+
+        sql, params = queryset.order_by().query.sql_with_params()
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class EstimatedCountPaginator(Paginator):
+    """Use the estimated row count when it is above ``exact_threshold``.
+
+    Small results are still counted exactly so the last pages stay accurate.
+    """
+
+    exact_threshold = 10_000
+
+    @cached_property
+    def count(self) -> int:
+        estimate = estimate_count(self.object_list)
+        if estimate is not None and estimate >= self.exact_threshold:
+            return estimate
+        return super().count
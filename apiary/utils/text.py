@@ -0,0 +1,27 @@
+"""Text normalization shared by models, seeds and migrations."""
+
+from __future__ import annotations
+
+import unicodedata
+
+CITY_STATE_SEPARATOR = " - "
+
+
+def search_key(value: str) -> str:
+    """Lowercase ``value`` without accents and with collapsed whitespace.
+
+    ``"São  José"`` becomes ``"sao jose"``, so a prefix typed without accents
+    matches with a plain ``LIKE 'prefix%'`` on an indexed column.
+    """
+    decomposed = unicodedata.normalize("NFKD", value or "")
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.casefold().split())
+
+
+def split_city_name(name: str) -> tuple[str, str]:
+    """Split ``"Cidade - UF"`` into the city name and the upper-case UF."""
+    city, separator, state = (name or "").rpartition(CITY_STATE_SEPARATOR)
+    state = state.strip().upper()
+    if not separator or len(state) != 2:
+        return (name or "").strip(), ""
+    return city.strip(), state
@@ -0,0 +1,33 @@
+"""URL templates for routes that take a single primary key.
+
+``reverse()`` walks the resolver on every call, which adds up when a page
+builds links for hundreds of rows. ``url_template`` reverses a route once per
+process with a placeholder argument and returns a function that formats the
+primary key into the cached prefix and suffix.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Callable
+
+from django.urls import get_script_prefix, get_urlconf, reverse
+
+_PLACEHOLDER = "8675309421"
+
+
+@lru_cache(maxsize=None)
+def _url_parts(viewname: str, script_prefix: str, urlconf) -> tuple[str, str]:
+    url = reverse(viewname, urlconf=urlconf, args=[_PLACEHOLDER])
+    prefix, placeholder, suffix = url.partition(_PLACEHOLDER)
+    if not placeholder:
+        raise ValueError(f"A URL {viewname!r} não usa o argumento informado.")
+    return prefix, suffix
+
+
+def url_template(viewname: str) -> Callable[[object], str]:
+    """Return ``pk -> reverse(viewname, args=[pk])`` without re-reversing."""
+    # The script prefix and URLconf are part of the key, as they change what
+    # reverse() returns.
+    prefix, suffix = _url_parts(viewname, get_script_prefix(), get_urlconf())
+    return lambda pk: f"{prefix}{pk}{suffix}"
@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
+import base64
 import csv
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date, datetime, time, timedelta
 from decimal import Decimal
 from typing import Dict, Iterable, List, Sequence
@@ -11,18 +12,43 @@ from urllib.parse import urlencode
 
 from django.contrib import admin
 from django.contrib.admin.views.decorators import staff_member_required
-from django.core.paginator import Paginator
-from django.db.models import Count, DecimalField, Max, Q, Sum, Value
-from django.db.models.functions import Coalesce, TruncMonth
-from django.http import Http404, HttpRequest, HttpResponse
+from django.db.models import (
+    Count,
+    DateTimeField,
+    DecimalField,
+    F,
+    IntegerField,
+    Max,
+    Q,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Coalesce, TruncDate, TruncMonth
+from django.http import (
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
-from django.views.generic import TemplateView
+from django.views.generic import TemplateView, View
 
-from .models import Apiary, Hive, QuickObservation, Revision
+from .models import (
+    Apiary,
+    Hive,
+    ImageRendition,
+    MonthlyHarvestRollup,
+    QuickObservation,
+    Revision,
+)
+from .utils.dashboard_cache import cached_result
+from .utils.urls import url_template
+from .utils.text import search_key
 
 
 MONTH_LABELS = [
@@ -113,6 +139,17 @@ RANK_METRICS = {
 }
 
 
+class _EchoBuffer:
+    """File-like object that hands back whatever ``csv.writer`` writes to it."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _format_amount(value) -> str:
+    return "" if value is None else f"{value:.2f}"
+
+
 def _decimal_or_zero(value) -> Decimal:
     if value is None:
         return Decimal("0")
@@ -247,6 +284,29 @@ class DashboardFilters:
             qs = qs.filter(hive__status__in=self.statuses)
         return qs
 
+    def covers_whole_months(self) -> bool:
+        """Whether the period starts and ends on calendar month boundaries."""
+        start = timezone.localtime(self.period_start)
+        end = timezone.localtime(self.period_end)
+        return (
+            start.day == 1
+            and start.time() == time.min
+            and end.time() == time.max
+            and (end.date() + timedelta(days=1)).day == 1
+        )
+
+    def apply_rollup_filters(self, queryset):
+        start = timezone.localtime(self.period_start).date()
+        end = timezone.localtime(self.period_end).date()
+        qs = queryset.filter(month__range=(start, end))
+        if self.apiary_ids:
+            qs = qs.filter(apiary_id__in=self.apiary_ids)
+        if self.species_ids:
+            qs = qs.filter(species_id__in=self.species_ids)
+        if self.statuses:
+            qs = qs.filter(hive__status__in=self.statuses)
+        return qs
+
     def apply_hive_filters(self, queryset):
         qs = queryset
         if self.apiary_ids:
@@ -317,9 +377,19 @@ class DashboardFilters:
                 query_items.append((key, value))
         return urlencode(query_items, doseq=True)
 
+    def cache_query_string(self) -> str:
+        """Query string identifying the computed data, including the resolved period."""
+        return self.query_string(
+            extra={
+                "periodo": f"{self.period_start.isoformat()}/{self.period_end.isoformat()}",
+                "hoje": timezone.localdate().isoformat(),
+            }
+        )
+
 
 class ProductionDashboardView(TemplateView):
     template_name = "admin/production_dashboard.html"
+    export_chunk_size = 2000
 
     @method_decorator(staff_member_required)
     def dispatch(self, request: HttpRequest, *args, **kwargs):
@@ -339,10 +409,23 @@ class ProductionDashboardView(TemplateView):
     def filtered_revisions(self):
         return self.filters.apply_revision_filters(self.base_revisions)
 
+    @cached_property
+    def filtered_rollups(self):
+        """Monthly rollup rows for the filters, or ``None`` when the period splits a month."""
+        if not self.filters.covers_whole_months():
+            return None
+        return self.filters.apply_rollup_filters(
+            MonthlyHarvestRollup.objects.owned_by(self.request.user)
+        )
+
     def get(self, request: HttpRequest, *args, **kwargs):
         if request.GET.get("export") == "meses":
             return self._export_monthly_csv()
-        return super().get(request, *args, **kwargs)
+        if request.GET.get("export") == "colheitas":
+            return self._export_harvests_csv()
+        response = super().get(request, *args, **kwargs)
+        response["X-Dashboard-Cache"] = "hit" if self.cache_hit else "miss"
+        return response
 
     def _export_monthly_csv(self) -> HttpResponse:
         rows = self._build_monthly_table()
@@ -382,38 +465,122 @@ class ProductionDashboardView(TemplateView):
         )
         return response
 
+    def _export_harvests_csv(self) -> StreamingHttpResponse:
+        rows = (
+            self.filtered_revisions.order_by("review_date", "pk")
+            .values_list(
+                "review_date",
+                "hive__identification_number",
+                "hive__popular_name",
+                "hive__apiary__name",
+                "hive__species__popular_name",
+                "hive__species__scientific_name",
+                "honey_harvest_amount",
+                "propolis_harvest_amount",
+                "wax_harvest_amount",
+                "pollen_harvest_amount",
+                "energetic_food_type",
+                "energetic_food_amount",
+                "protein_food_type",
+                "protein_food_amount",
+            )
+            .iterator(chunk_size=self.export_chunk_size)
+        )
+        writer = csv.writer(_EchoBuffer())
+
+        def stream():
+            yield writer.writerow([
+                "Data",
+                "Colmeia",
+                "Nome popular",
+                "Meliponário",
+                "Espécie",
+                "Nome científico",
+                "Mel (ml)",
+                "Própolis (g)",
+                "Cera (g)",
+                "Pólen (g)",
+                "Alimento energético",
+                "Alimento energético (ml/g)",
+                "Alimento proteico",
+                "Alimento proteico (g)",
+            ])
+            for (
+                review_date,
+                identification_number,
+                popular_name,
+                apiary_name,
+                species_name,
+                scientific_name,
+                honey,
+                propolis,
+                wax,
+                pollen,
+                energetic_type,
+                energetic_amount,
+                protein_type,
+                protein_amount,
+            ) in rows:
+                yield writer.writerow([
+                    timezone.localtime(review_date).strftime("%d/%m/%Y %H:%M"),
+                    identification_number,
+                    popular_name,
+                    apiary_name or "",
+                    species_name,
+                    scientific_name,
+                    _format_amount(honey),
+                    _format_amount(propolis),
+                    _format_amount(wax),
+                    _format_amount(pollen),
+                    energetic_type,
+                    _format_amount(energetic_amount),
+                    protein_type,
+                    _format_amount(protein_amount),
+                ])
+
+        response = StreamingHttpResponse(stream(), content_type="text/csv")
+        filename = f"colheitas-{self.filters.reference_year}.csv"
+        response["Content-Disposition"] = f"attachment; filename={filename}"
+        return response
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context.update(admin.site.each_context(self.request))
         filters = self.filters
-        revisions = self.filtered_revisions
-
-        cards = self._build_cards(revisions)
-        monthly = self._build_monthly_table()
-        chart = self._build_chart_data(monthly)
-        rank = self._build_rank(revisions)
-        season = self._current_season_card()
-        availability = self._build_filters_availability()
+        data, self.cache_hit = cached_result(
+            self.request.user,
+            namespace="production",
+            query_string=filters.cache_query_string(),
+            builder=self._build_dashboard_data,
+        )
 
+        context.update(data)
         context.update(
             {
                 "filters": filters,
                 "filter_errors": filters.errors,
-                "available_filters": availability,
-                "cards": cards,
-                "monthly_table": monthly,
-                "chart": chart,
-                "rank": rank,
-                "season": season,
+                "season": self._current_season_card(),
                 "period_label": filters.period_display(),
                 "rank_metrics": RANK_METRICS,
                 "query_string": filters.query_string(),
                 "selected_year": filters.selected_year or filters.reference_year,
             }
         )
-        context.update(self._build_complementary_tables(revisions))
         return context
 
+    def _build_dashboard_data(self) -> Dict[str, object]:
+        revisions = self.filtered_revisions
+        monthly = self._build_monthly_table()
+        data = {
+            "available_filters": self._build_filters_availability(),
+            "cards": self._build_cards(revisions),
+            "monthly_table": monthly,
+            "chart": self._build_chart_data(monthly),
+            "rank": self._build_rank(revisions),
+        }
+        data.update(self._build_complementary_tables(revisions))
+        return data
+
     def _build_filters_availability(self) -> Dict[str, List[Dict[str, object]]]:
         user = self.request.user
         hives = Hive.objects.owned_by(user)
@@ -442,16 +609,24 @@ class ProductionDashboardView(TemplateView):
         }
 
     def _build_cards(self, revisions):
-        aggregates = revisions.aggregate(
-            honey=Coalesce(Sum("honey_harvest_amount"), Value(0), output_field=DecimalField()),
-            propolis=Coalesce(Sum("propolis_harvest_amount"), Value(0), output_field=DecimalField()),
-            wax=Coalesce(Sum("wax_harvest_amount"), Value(0), output_field=DecimalField()),
-            pollen=Coalesce(Sum("pollen_harvest_amount"), Value(0), output_field=DecimalField()),
-            revisions_count=Count("id"),
-            last_review=Max("review_date"),
-        )
-        hives_qs = self.filters.apply_hive_filters(Hive.objects.owned_by(self.request.user))
-        active_hives = hives_qs.exclude(status__in=[Hive.HiveStatus.DEAD, Hive.HiveStatus.LOST]).count()
+        if self.filtered_rollups is not None:
+            aggregates = self.filtered_rollups.aggregate(
+                honey=Coalesce(Sum("honey_amount"), Value(0), output_field=DecimalField()),
+                propolis=Coalesce(Sum("propolis_amount"), Value(0), output_field=DecimalField()),
+                wax=Coalesce(Sum("wax_amount"), Value(0), output_field=DecimalField()),
+                pollen=Coalesce(Sum("pollen_amount"), Value(0), output_field=DecimalField()),
+                revisions_count=Coalesce(Sum("harvest_count"), Value(0)),
+                last_review=Max("last_review_date"),
+            )
+        else:
+            aggregates = revisions.aggregate(
+                honey=Coalesce(Sum("honey_harvest_amount"), Value(0), output_field=DecimalField()),
+                propolis=Coalesce(Sum("propolis_harvest_amount"), Value(0), output_field=DecimalField()),
+                wax=Coalesce(Sum("wax_harvest_amount"), Value(0), output_field=DecimalField()),
+                pollen=Coalesce(Sum("pollen_harvest_amount"), Value(0), output_field=DecimalField()),
+                revisions_count=Count("id"),
+                last_review=Max("review_date"),
+            )
         revisions_total = aggregates.get("revisions_count", 0)
         last_review_date = aggregates.get("last_review")
         last_review_display = None
@@ -459,13 +634,22 @@ class ProductionDashboardView(TemplateView):
             last_review_display = timezone.localtime(last_review_date).strftime("%d/%m/%Y %H:%M")
 
         sixty_days_ago = timezone.now() - timedelta(days=60)
-        overdue_hives = self.filters.apply_hive_filters(
-            Hive.objects.owned_by(self.request.user).filter(
-                Q(last_review_date__lt=sixty_days_ago) | Q(last_review_date__isnull=True)
-            )
+        hive_counts = self.filters.apply_hive_filters(
+            Hive.objects.owned_by(self.request.user)
+        ).aggregate(
+            total=Count("id"),
+            active=Count(
+                "id",
+                filter=~Q(status__in=[Hive.HiveStatus.DEAD, Hive.HiveStatus.LOST]),
+            ),
+            overdue=Count(
+                "id",
+                filter=Q(last_review_date__lt=sixty_days_ago) | Q(last_review_date__isnull=True),
+            ),
         )
-        overdue_total = overdue_hives.count()
-        total_filtered_hives = hives_qs.count()
+        active_hives = hive_counts["active"]
+        overdue_total = hive_counts["overdue"]
+        total_filtered_hives = hive_counts["total"]
         overdue_percentage = 0.0
         if total_filtered_hives:
             overdue_percentage = (overdue_total / total_filtered_hives) * 100
@@ -486,17 +670,30 @@ class ProductionDashboardView(TemplateView):
 
     def _build_monthly_table(self):
         month_keys = self.filters.month_sequence()
-        monthly_data = (
-            self.filtered_revisions.annotate(month=TruncMonth("review_date"))
-            .values("month")
-            .annotate(
-                honey=Coalesce(Sum("honey_harvest_amount"), Value(0), output_field=DecimalField()),
-                propolis=Coalesce(Sum("propolis_harvest_amount"), Value(0), output_field=DecimalField()),
-                wax=Coalesce(Sum("wax_harvest_amount"), Value(0), output_field=DecimalField()),
-                pollen=Coalesce(Sum("pollen_harvest_amount"), Value(0), output_field=DecimalField()),
-                harvests=Count("id"),
+        if self.filtered_rollups is not None:
+            monthly_data = (
+                self.filtered_rollups.values("month")
+                .annotate(
+                    honey=Coalesce(Sum("honey_amount"), Value(0), output_field=DecimalField()),
+                    propolis=Coalesce(Sum("propolis_amount"), Value(0), output_field=DecimalField()),
+                    wax=Coalesce(Sum("wax_amount"), Value(0), output_field=DecimalField()),
+                    pollen=Coalesce(Sum("pollen_amount"), Value(0), output_field=DecimalField()),
+                    harvests=Coalesce(Sum("harvest_count"), Value(0)),
+                )
+                .order_by()
+            )
+        else:
+            monthly_data = (
+                self.filtered_revisions.annotate(month=TruncMonth("review_date"))
+                .values("month")
+                .annotate(
+                    honey=Coalesce(Sum("honey_harvest_amount"), Value(0), output_field=DecimalField()),
+                    propolis=Coalesce(Sum("propolis_harvest_amount"), Value(0), output_field=DecimalField()),
+                    wax=Coalesce(Sum("wax_harvest_amount"), Value(0), output_field=DecimalField()),
+                    pollen=Coalesce(Sum("pollen_harvest_amount"), Value(0), output_field=DecimalField()),
+                    harvests=Count("id"),
+                )
             )
-        )
         month_lookup = {
             (item["month"].year, item["month"].month): item for item in monthly_data if item["month"]
         }
@@ -548,40 +745,57 @@ class ProductionDashboardView(TemplateView):
 
     def _build_rank(self, revisions):
         metric_field = RANK_METRICS[self.filters.rank_metric]["field"]
+        if self.filtered_rollups is not None:
+            source = self.filtered_rollups
+            amount_fields = ("honey_amount", "propolis_amount", "wax_amount", "pollen_amount")
+            harvests = Sum("harvest_count")
+            last_harvest = Max("last_review_date")
+            species_key, apiary_key = "species__popular_name", "apiary__name"
+        else:
+            source = revisions
+            amount_fields = (
+                "honey_harvest_amount",
+                "propolis_harvest_amount",
+                "wax_harvest_amount",
+                "pollen_harvest_amount",
+            )
+            harvests = Count("id")
+            last_harvest = Max("review_date")
+            species_key, apiary_key = "hive__species__popular_name", "hive__apiary__name"
+        totals = {
+            name: Coalesce(Sum(field), Value(0), output_field=DecimalField())
+            for name, field in zip(
+                ("total_honey", "total_propolis", "total_wax", "total_pollen"), amount_fields
+            )
+        }
         ranked = (
-            revisions.values(
+            source.values(
                 "hive_id",
                 "hive__identification_number",
                 "hive__popular_name",
-                "hive__species__popular_name",
-                "hive__apiary__name",
-            )
-            .annotate(
-                total_honey=Coalesce(Sum("honey_harvest_amount"), Value(0), output_field=DecimalField()),
-                total_propolis=Coalesce(Sum("propolis_harvest_amount"), Value(0), output_field=DecimalField()),
-                total_wax=Coalesce(Sum("wax_harvest_amount"), Value(0), output_field=DecimalField()),
-                total_pollen=Coalesce(Sum("pollen_harvest_amount"), Value(0), output_field=DecimalField()),
-                harvests=Count("id"),
-                last_harvest=Max("review_date"),
+                species_name=F(species_key),
+                apiary_name=F(apiary_key),
             )
+            .annotate(harvests=harvests, last_harvest=last_harvest, **totals)
             .order_by(f"-{metric_field}", "hive__identification_number")[: self.filters.rank_limit]
         )
         items = []
         query_string = self.filters.query_string()
+        detail_url_for = url_template("production-dashboard-hive-detail")
         for entry in ranked:
             last_harvest = entry["last_harvest"]
             last_harvest_display = _("Sem colheitas no período")
             if last_harvest:
                 last_harvest_display = timezone.localtime(last_harvest).strftime("%d/%m/%Y %H:%M")
-            detail_url = reverse("production-dashboard-hive-detail", args=[entry["hive_id"]])
+            detail_url = detail_url_for(entry["hive_id"])
             if query_string:
                 detail_url = f"{detail_url}?{query_string}"
             items.append(
                 {
                     "hive_id": entry["hive_id"],
                     "name": f"{entry['hive__identification_number']} · {entry['hive__popular_name']}",
-                    "species": entry["hive__species__popular_name"],
-                    "apiary": entry["hive__apiary__name"] or _("Sem meliponário"),
+                    "species": entry["species_name"],
+                    "apiary": entry["apiary_name"] or _("Sem meliponário"),
                     "honey": _decimal_or_zero(entry["total_honey"]),
                     "propolis": _decimal_or_zero(entry["total_propolis"]),
                     "wax": _decimal_or_zero(entry["total_wax"]),
@@ -617,26 +831,32 @@ class ProductionDashboardView(TemplateView):
         }
 
     def _build_complementary_tables(self, revisions):
+        if self.filtered_rollups is not None:
+            source = self.filtered_rollups
+            apiary_key = "apiary__name"
+            species_key = "species__popular_name"
+            honey_total = Coalesce(Sum("honey_amount"), Value(0), output_field=DecimalField())
+        else:
+            source = revisions
+            apiary_key = "hive__apiary__name"
+            species_key = "hive__species__popular_name"
+            honey_total = Coalesce(Sum("honey_harvest_amount"), Value(0), output_field=DecimalField())
         production_by_apiary = (
-            revisions.values("hive__apiary__name")
-            .annotate(total=Coalesce(Sum("honey_harvest_amount"), Value(0), output_field=DecimalField()))
-            .order_by("-total")
+            source.values(apiary_key).annotate(total=honey_total).order_by("-total")
         )
         production_by_species = (
-            revisions.values("hive__species__popular_name")
-            .annotate(total=Coalesce(Sum("honey_harvest_amount"), Value(0), output_field=DecimalField()))
-            .order_by("-total")
+            source.values(species_key).annotate(total=honey_total).order_by("-total")
         )
         apiary_rows = [
             {
-                "name": entry["hive__apiary__name"] or _("Sem meliponário"),
+                "name": entry[apiary_key] or _("Sem meliponário"),
                 "total": _decimal_or_zero(entry["total"]),
             }
             for entry in production_by_apiary
         ]
         species_rows = [
             {
-                "name": entry["hive__species__popular_name"],
+                "name": entry[species_key],
                 "total": _decimal_or_zero(entry["total"]),
             }
             for entry in production_by_species
@@ -647,6 +867,98 @@ class ProductionDashboardView(TemplateView):
         }
 
 
+TIMELINE_REVISION = 0
+TIMELINE_OBSERVATION = 1
+
+
+@dataclass(frozen=True)
+class TimelineCursor:
+    """Position of a timeline entry in the ``(date, kind, time, pk)`` ordering.
+
+    Observations sort after every revision of the same day (they represent the
+    end of the day), so ``kind`` is 1 for observations and 0 for revisions.
+    """
+
+    sort_date: date
+    kind: int
+    sort_time: datetime | None
+    pk: int
+
+    def encode(self) -> str:
+        raw = "~".join(
+            [
+                self.sort_date.isoformat(),
+                str(self.kind),
+                self.sort_time.isoformat() if self.sort_time else "",
+                str(self.pk),
+            ]
+        )
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @classmethod
+    def decode(cls, value: str | None) -> "TimelineCursor | None":
+        if not value:
+            return None
+        try:
+            padded = value + "=" * (-len(value) % 4)
+            raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+            sort_date, kind, sort_time, pk = raw.split("~")
+            kind_value = int(kind)
+            if kind_value not in (TIMELINE_REVISION, TIMELINE_OBSERVATION):
+                return None
+            return cls(
+                sort_date=date.fromisoformat(sort_date),
+                kind=kind_value,
+                sort_time=datetime.fromisoformat(sort_time) if sort_time else None,
+                pk=int(pk),
+            )
+        except (TypeError, ValueError, UnicodeError):
+            return None
+
+    def revision_filter(self, *, older: bool) -> Q:
+        """Revisions that sort after (``older``) or before this position."""
+        date_lookup = "lt" if older else "gt"
+        condition = Q(**{f"sort_date__{date_lookup}": self.sort_date})
+        if self.kind == TIMELINE_OBSERVATION:
+            if older:
+                condition |= Q(sort_date=self.sort_date)
+            return condition
+        return condition | Q(
+            Q(**{f"review_date__{date_lookup}": self.sort_time})
+            | Q(review_date=self.sort_time, **{f"pk__{date_lookup}": self.pk}),
+            sort_date=self.sort_date,
+        )
+
+    def observation_filter(self, *, older: bool) -> Q:
+        """Observations that sort after (``older``) or before this position."""
+        date_lookup = "lt" if older else "gt"
+        condition = Q(**{f"date__{date_lookup}": self.sort_date})
+        if self.kind == TIMELINE_REVISION:
+            if not older:
+                condition |= Q(date=self.sort_date)
+            return condition
+        return condition | Q(date=self.sort_date, **{f"pk__{date_lookup}": self.pk})
+
+
+@dataclass
+class TimelinePage:
+    object_list: List[Dict[str, object]] = field(default_factory=list)
+    next_cursor: str | None = None
+    previous_cursor: str | None = None
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    @property
+    def has_other_pages(self) -> bool:
+        return self.has_next or self.has_previous
+
+
 class HiveHistoryView(TemplateView):
     template_name = "admin/hive_history.html"
     paginate_by = 20
@@ -659,12 +971,8 @@ class HiveHistoryView(TemplateView):
         context = super().get_context_data(**kwargs)
         context.update(admin.site.each_context(self.request))
 
-        available_hives = list(
-            Hive.objects.owned_by(self.request.user)
-            .select_related("apiary", "species")
-            .order_by("popular_name")
-        )
-        selected_hive = self._get_selected_hive(available_hives)
+        selected_hive = self._get_selected_hive()
+        has_hives = selected_hive is not None or Hive.objects.owned_by(self.request.user).exists()
 
         timeline_page = None
         timeline_items: List[Dict[str, object]] = []
@@ -672,38 +980,28 @@ class HiveHistoryView(TemplateView):
         timeline_total = 0
 
         if selected_hive:
-            revisions_qs = (
-                Revision.objects.filter(hive=selected_hive)
-                .select_related("hive")
-                .prefetch_related("attachments")
-                .order_by("-review_date")
-            )
-            observations_qs = QuickObservation.objects.filter(hive=selected_hive).order_by(
-                "-date", "-pk"
-            )
+            revisions_qs = Revision.objects.filter(hive=selected_hive)
+            observations_qs = QuickObservation.objects.filter(hive=selected_hive)
             summary = self._build_summary(revisions_qs)
-            revisions = list(revisions_qs)
-            observations = list(observations_qs)
-            timeline_items = self._build_timeline(revisions, observations)
-            paginator = Paginator(timeline_items, self.paginate_by)
-            page_number = self.request.GET.get("page") or 1
-            timeline_page = paginator.get_page(page_number)
-            timeline_total = paginator.count
+            timeline_page = self._build_timeline_page(revisions_qs, observations_qs)
+            timeline_items = timeline_page.object_list
+            timeline_total = revisions_qs.count() + observations_qs.count()
 
         context.update(
             {
-                "available_hives": available_hives,
+                "has_hives": has_hives,
                 "selected_hive": selected_hive,
+                "hive_autocomplete_url": reverse("hive-autocomplete"),
                 "timeline_page": timeline_page,
                 "timeline_total": timeline_total,
                 "timeline_items": timeline_items,
                 "summary": summary,
-                "pagination_query": self._build_query_string(exclude=["page"]),
+                "pagination_query": self._build_query_string(exclude=["depois", "antes"]),
             }
         )
         return context
 
-    def _get_selected_hive(self, available_hives: List[Hive]) -> Hive | None:
+    def _get_selected_hive(self) -> Hive | None:
         hive_id = self.request.GET.get("hive")
         if not hive_id:
             return None
@@ -711,10 +1009,15 @@ class HiveHistoryView(TemplateView):
             hive_id_int = int(hive_id)
         except (TypeError, ValueError) as exc:
             raise Http404("Colmeia não disponível para este usuário") from exc
-        for hive in available_hives:
-            if hive.pk == hive_id_int:
-                return hive
-        raise Http404("Colmeia não disponível para este usuário")
+        hive = (
+            Hive.objects.owned_by(self.request.user)
+            .select_related("apiary", "species")
+            .filter(pk=hive_id_int)
+            .first()
+        )
+        if hive is None:
+            raise Http404("Colmeia não disponível para este usuário")
+        return hive
 
     def _build_summary(self, revisions_qs):
         aggregates = revisions_qs.aggregate(
@@ -750,15 +1053,84 @@ class HiveHistoryView(TemplateView):
             },
         }
 
+    def _build_timeline_page(self, revisions_qs, observations_qs) -> TimelinePage:
+        """Merge revisions and observations in the database and slice one page.
+
+        Pagination is keyset based: ``depois`` holds the cursor of the last entry
+        of the previous page and ``antes`` the first entry of the next page.
+        """
+        after = TimelineCursor.decode(self.request.GET.get("depois"))
+        before = None if after else TimelineCursor.decode(self.request.GET.get("antes"))
+        revision_keys = revisions_qs.order_by().annotate(
+            sort_date=TruncDate("review_date"),
+            kind=Value(TIMELINE_REVISION, output_field=IntegerField()),
+            sort_time=F("review_date"),
+        )
+        observation_keys = observations_qs.order_by().annotate(
+            sort_date=F("date"),
+            kind=Value(TIMELINE_OBSERVATION, output_field=IntegerField()),
+            sort_time=Value(None, output_field=DateTimeField()),
+        )
+        cursor = after or before
+        if cursor:
+            older = before is None
+            revision_keys = revision_keys.filter(cursor.revision_filter(older=older))
+            observation_keys = observation_keys.filter(cursor.observation_filter(older=older))
+
+        ordering = ["sort_date", "kind", "sort_time", "pk"]
+        if not before:
+            ordering = [f"-{name}" for name in ordering]
+        merged = revision_keys.values_list("pk", "sort_date", "kind", "sort_time").union(
+            observation_keys.values_list("pk", "sort_date", "kind", "sort_time"),
+            all=True,
+        )
+        rows = merged.order_by(*ordering)[: self.paginate_by + 1]
+        keys = [
+            TimelineCursor(sort_date=sort_date, kind=kind, sort_time=sort_time, pk=pk)
+            for pk, sort_date, kind, sort_time in rows
+        ]
+        has_more = len(keys) > self.paginate_by
+        keys = keys[: self.paginate_by]
+        if before:
+            keys.reverse()
+
+        revisions = Revision.objects.filter(
+            pk__in=[key.pk for key in keys if key.kind == TIMELINE_REVISION]
+        ).prefetch_related("attachments")
+        observations = QuickObservation.objects.filter(
+            pk__in=[key.pk for key in keys if key.kind == TIMELINE_OBSERVATION]
+        )
+        entries = {(TIMELINE_REVISION, revision.pk): revision for revision in revisions}
+        entries.update(
+            {(TIMELINE_OBSERVATION, observation.pk): observation for observation in observations}
+        )
+        page = TimelinePage(
+            object_list=self._build_timeline(
+                [entries[(key.kind, key.pk)] for key in keys if (key.kind, key.pk) in entries]
+            )
+        )
+        if keys:
+            if has_more or before:
+                page.next_cursor = keys[-1].encode()
+            if (has_more and before) or after:
+                page.previous_cursor = keys[0].encode()
+        return page
+
     def _build_timeline(
-        self,
-        revisions: List[Revision],
-        observations: List[QuickObservation],
+        self, entries: List[Revision | QuickObservation]
     ) -> List[Dict[str, object]]:
+        """Render already ordered timeline entries into template dicts."""
         items: List[Dict[str, object]] = []
         current_tz = timezone.get_current_timezone()
+        self._renditions = ImageRendition.objects.srcsets(self._image_names(entries))
+        self._revision_change_url = url_template("admin:apiary_revision_change")
+        self._observation_change_url = url_template("admin:apiary_quickobservation_change")
 
-        for revision in revisions:
+        for entry in entries:
+            if isinstance(entry, QuickObservation):
+                items.append(self._build_observation_item(entry, current_tz))
+                continue
+            revision = entry
             timestamp = timezone.localtime(revision.review_date)
             attachments = self._build_revision_attachments(revision)
             text_sections = [
@@ -789,71 +1161,71 @@ class HiveHistoryView(TemplateView):
                     "has_more": has_more,
                     "attachments": attachments,
                     "sections": sections,
-                    "admin_url": reverse("admin:apiary_revision_change", args=[revision.pk]),
-                    "_sort_timestamp": timestamp,
-                    "_sort_priority": 1,
-                    "_sort_id": revision.pk,
-                }
-            )
-
-        for observation in observations:
-            timestamp = datetime.combine(observation.date, time.max)
-            if timezone.is_naive(timestamp):
-                timestamp = timezone.make_aware(timestamp, current_tz)
-            timestamp = timezone.localtime(timestamp)
-            attachments = self._build_observation_attachments(observation)
-            notes = (observation.notes or "").strip()
-            preview, full_text_clean, has_more = self._prepare_preview(
-                notes, bool(attachments)
-            )
-            items.append(
-                {
-                    "id": f"observation-{observation.pk}",
-                    "type": "observation",
-                    "title": _("Observação rápida"),
-                    "badge_label": None,
-                    "date": timestamp,
-                    "preview": preview,
-                    "full_text": full_text_clean,
-                    "has_more": has_more,
-                    "attachments": attachments,
-                    "sections": [],
-                    "admin_url": reverse(
-                        "admin:apiary_quickobservation_change", args=[observation.pk]
-                    ),
-                    "_sort_timestamp": timestamp,
-                    "_sort_priority": 0,
-                    "_sort_id": observation.pk,
+                    "admin_url": self._revision_change_url(revision.pk),
                 }
             )
+        return items
 
-        items.sort(
-            key=lambda item: (item["_sort_timestamp"], item["_sort_priority"], item["_sort_id"]),
-            reverse=True,
+    def _build_observation_item(self, observation: QuickObservation, current_tz) -> Dict[str, object]:
+        timestamp = datetime.combine(observation.date, time.max)
+        if timezone.is_naive(timestamp):
+            timestamp = timezone.make_aware(timestamp, current_tz)
+        timestamp = timezone.localtime(timestamp)
+        attachments = self._build_observation_attachments(observation)
+        notes = (observation.notes or "").strip()
+        preview, full_text_clean, has_more = self._prepare_preview(
+            notes, bool(attachments)
         )
-        for item in items:
-            item.pop("_sort_timestamp", None)
-            item.pop("_sort_priority", None)
-            item.pop("_sort_id", None)
-        return items
+        return {
+            "id": f"observation-{observation.pk}",
+            "type": "observation",
+            "title": _("Observação rápida"),
+            "badge_label": None,
+            "date": timestamp,
+            "preview": preview,
+            "full_text": full_text_clean,
+            "has_more": has_more,
+            "attachments": attachments,
+            "sections": [],
+            "admin_url": self._observation_change_url(observation.pk),
+        }
+
+    @staticmethod
+    def _image_names(entries: List[Revision | QuickObservation]) -> List[str]:
+        names: List[str] = []
+        for entry in entries:
+            if isinstance(entry, QuickObservation):
+                names.extend([entry.internal_photo.name, entry.external_photo.name])
+            else:
+                names.extend(attachment.file.name for attachment in entry.attachments.all())
+        return names
+
+    def _build_image_attachment(self, file, *, alt: str, caption: str) -> Dict[str, str] | None:
+        if not file:
+            return None
+        try:
+            url = file.url
+        except ValueError:  # pragma: no cover - defensive for missing files
+            return None
+        renditions = getattr(self, "_renditions", {}).get(file.name, [])
+        return {
+            "url": url,
+            "src": renditions[0][1] if renditions else url,
+            "srcset": ", ".join(f"{rendition_url} {width}w" for width, rendition_url in renditions),
+            "alt": alt,
+            "caption": caption,
+        }
 
     def _build_revision_attachments(self, revision: Revision) -> List[Dict[str, str]]:
         attachments: List[Dict[str, str]] = []
         for index, attachment in enumerate(revision.attachments.all(), start=1):
-            file = getattr(attachment, "file", None)
-            if not file:
-                continue
-            try:
-                url = file.url
-            except ValueError:  # pragma: no cover - defensive for missing files
-                continue
-            attachments.append(
-                {
-                    "url": url,
-                    "alt": _("Anexo da revisão"),
-                    "caption": _("Anexo %(number)s") % {"number": index},
-                }
+            item = self._build_image_attachment(
+                getattr(attachment, "file", None),
+                alt=_("Anexo da revisão"),
+                caption=_("Anexo %(number)s") % {"number": index},
             )
+            if item:
+                attachments.append(item)
         return attachments
 
     def _build_observation_attachments(
@@ -865,19 +1237,9 @@ class HiveHistoryView(TemplateView):
             (observation.external_photo, _("Foto externa")),
         ]
         for photo, caption in photos:
-            if not photo:
-                continue
-            try:
-                url = photo.url
-            except ValueError:  # pragma: no cover - defensive for missing files
-                continue
-            attachments.append(
-                {
-                    "url": url,
-                    "alt": caption,
-                    "caption": caption,
-                }
-            )
+            item = self._build_image_attachment(photo, alt=caption, caption=caption)
+            if item:
+                attachments.append(item)
         return attachments
 
     def _build_revision_sections(self, revision: Revision) -> List[Dict[str, object]]:
@@ -935,6 +1297,58 @@ class HiveHistoryView(TemplateView):
         return data.urlencode()
 
 
+def hive_option_label(popular_name: str, apiary_name) -> str:
+    if apiary_name:
+        return f"{popular_name} · {apiary_name}"
+    return popular_name
+
+
+class HiveAutocompleteView(View):
+    """JSON hive search in the Select2 ``ajax`` format.
+
+    Matches the beginning of the identification number or of the popular name,
+    ignoring case and accents through the indexed ``search_name``, and returns
+    at most ``limit`` hives per page, scoped with ``owned_by``.
+    """
+
+    limit = 20
+
+    @method_decorator(staff_member_required)
+    def dispatch(self, request: HttpRequest, *args, **kwargs):
+        return super().dispatch(request, *args, **kwargs)
+
+    def get(self, request: HttpRequest, *args, **kwargs) -> JsonResponse:
+        term = (request.GET.get("q") or "").strip()
+        try:
+            page = max(int(request.GET.get("page") or 1), 1)
+        except ValueError:
+            page = 1
+
+        hives = Hive.objects.owned_by(request.user)
+        if term:
+            hives = hives.filter(
+                Q(identification_number__startswith=term.upper())
+                | Q(search_name__startswith=search_key(term))
+            )
+        offset = (page - 1) * self.limit
+        rows = list(
+            hives.order_by("popular_name", "pk").values_list(
+                "pk", "identification_number", "popular_name", "apiary__name"
+            )[offset : offset + self.limit + 1]
+        )
+        results = [
+            {
+                "id": pk,
+                "text": hive_option_label(popular_name, apiary_name),
+                "identification_number": identification_number,
+            }
+            for pk, identification_number, popular_name, apiary_name in rows[: self.limit]
+        ]
+        return JsonResponse(
+            {"results": results, "pagination": {"more": len(rows) > self.limit}}
+        )
+
+
 class HiveProductionDetailView(TemplateView):
     template_name = "admin/production_dashboard_hive_detail.html"
 
@@ -947,6 +1361,11 @@ class HiveProductionDetailView(TemplateView):
     def filters(self) -> DashboardFilters:
         return DashboardFilters.from_request(self.request)
 
+    def get(self, request: HttpRequest, *args, **kwargs):
+        response = super().get(request, *args, **kwargs)
+        response["X-Dashboard-Cache"] = "hit" if self.cache_hit else "miss"
+        return response
+
     def get_hive(self) -> Hive:
         try:
             hive = Hive.objects.select_related("species", "apiary", "owner").get(pk=self.kwargs["pk"])
@@ -961,18 +1380,12 @@ class HiveProductionDetailView(TemplateView):
         context = super().get_context_data(**kwargs)
         context.update(admin.site.each_context(self.request))
         filters = self.filters
-        revisions_qs = filters.apply_revision_filters(
-            self.hive.revisions.filter(review_type=Revision.RevisionType.HARVEST)
-        ).order_by("-review_date")
-        aggregates = revisions_qs.aggregate(
-            honey=Coalesce(Sum("honey_harvest_amount"), Value(0), output_field=DecimalField()),
-            propolis=Coalesce(Sum("propolis_harvest_amount"), Value(0), output_field=DecimalField()),
-            wax=Coalesce(Sum("wax_harvest_amount"), Value(0), output_field=DecimalField()),
-            pollen=Coalesce(Sum("pollen_harvest_amount"), Value(0), output_field=DecimalField()),
-            harvests=Count("id"),
+        data, self.cache_hit = cached_result(
+            self.request.user,
+            namespace=f"hive-detail:{self.hive.pk}",
+            query_string=filters.cache_query_string(),
+            builder=self._build_detail_data,
         )
-        monthly = self._build_monthly_overview(revisions_qs)
-        revisions = list(revisions_qs[:200])
         back_url = reverse("production-dashboard")
         query_string = filters.query_string(exclude=["top", "rank_metric"])
         if query_string:
@@ -982,9 +1395,9 @@ class HiveProductionDetailView(TemplateView):
                 "hive": self.hive,
                 "filters": filters,
                 "period_label": filters.period_display(),
-                "aggregates": {k: _decimal_or_zero(v) for k, v in aggregates.items()},
-                "revisions": revisions,
-                "monthly": monthly,
+                "aggregates": data["aggregates"],
+                "revisions": data["revisions"],
+                "monthly": data["monthly"],
                 "back_url": back_url,
                 "filter_errors": filters.errors,
                 "create_revision_url": f"{reverse('admin:apiary_revision_add')}?hive={self.hive.pk}",
@@ -993,6 +1406,23 @@ class HiveProductionDetailView(TemplateView):
         )
         return context
 
+    def _build_detail_data(self) -> Dict[str, object]:
+        revisions_qs = self.filters.apply_revision_filters(
+            self.hive.revisions.filter(review_type=Revision.RevisionType.HARVEST)
+        ).order_by("-review_date")
+        aggregates = revisions_qs.aggregate(
+            honey=Coalesce(Sum("honey_harvest_amount"), Value(0), output_field=DecimalField()),
+            propolis=Coalesce(Sum("propolis_harvest_amount"), Value(0), output_field=DecimalField()),
+            wax=Coalesce(Sum("wax_harvest_amount"), Value(0), output_field=DecimalField()),
+            pollen=Coalesce(Sum("pollen_harvest_amount"), Value(0), output_field=DecimalField()),
+            harvests=Count("id"),
+        )
+        return {
+            "aggregates": {k: _decimal_or_zero(v) for k, v in aggregates.items()},
+            "monthly": self._build_monthly_overview(revisions_qs),
+            "revisions": list(revisions_qs[:200]),
+        }
+
     def _build_monthly_overview(self, revisions):
         monthly = (
             revisions.annotate(month=TruncMonth("review_date"))
@@ -1022,4 +1452,5 @@ class HiveProductionDetailView(TemplateView):
 
 production_dashboard = ProductionDashboardView.as_view()
 hive_history = HiveHistoryView.as_view()
+hive_autocomplete = HiveAutocompleteView.as_view()
 hive_production_detail = HiveProductionDetailView.as_view()
@@ -4,16 +4,15 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import timedelta
-from typing import Dict, List
+from typing import Callable, Dict, List
 
 from django.contrib import admin
 from django.contrib.admin.sites import AdminSite
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth import logout
-from django.db import transaction
-from django.http import HttpRequest, HttpResponse
+from django.http import Http404, HttpRequest, HttpResponse
 from django.shortcuts import redirect
-from django.db.models import F, Q
+from django.db.models import Count, F, Q
 from django.template.response import TemplateResponse
 from django.urls import path, reverse
 from django.utils import timezone
@@ -22,9 +21,11 @@ from apiary.models import (
     Apiary,
     CreatorNetworkEntry,
     Hive,
+    PersonalDataDeletionJob,
     Revision,
     RevisionAttachment,
 )
+from apiary.utils.urls import url_template
 
 
 @dataclass(frozen=True)
@@ -90,12 +91,15 @@ def _format_datetime(value) -> tuple[str, str]:
     return local_value.strftime("%d/%m/%Y %H:%M"), local_value.isoformat()
 
 
-def _build_recent_revisions(user) -> List[RevisionEntry]:
+def _build_recent_revisions(user, offset: int = 0, limit: int = 10) -> List[RevisionEntry]:
     revisions = (
         Revision.objects.owned_by(user)
         .select_related("hive", "hive__species", "hive__apiary")
-        .order_by("-review_date")[:10]
+        .order_by("-review_date", "-pk")[offset : offset + limit]
     )
+    revision_change_url = url_template("admin:apiary_revision_change")
+    hive_change_url = url_template("admin:apiary_hive_change")
+    apiary_change_url = url_template("admin:apiary_apiary_change")
     entries: List[RevisionEntry] = []
     for revision in revisions:
         formatted_datetime, iso_datetime = _format_datetime(revision.review_date)
@@ -104,13 +108,13 @@ def _build_recent_revisions(user) -> List[RevisionEntry]:
         review_type = revision.review_type or None
         entries.append(
             RevisionEntry(
-                change_url=reverse("admin:apiary_revision_change", args=[revision.pk]),
+                change_url=revision_change_url(revision.pk),
                 hive_name=str(hive),
-                hive_url=reverse("admin:apiary_hive_change", args=[hive.pk]),
+                hive_url=hive_change_url(hive.pk),
                 species_name=hive.species.popular_name,
                 species_scientific_name=hive.species.scientific_name or None,
                 apiary_name=apiary.name if apiary else None,
-                apiary_url=reverse("admin:apiary_apiary_change", args=[apiary.pk]) if apiary else None,
+                apiary_url=apiary_change_url(apiary.pk) if apiary else None,
                 review_date_display=formatted_datetime,
                 review_time_iso=iso_datetime,
                 review_type=review_type,
@@ -127,15 +131,19 @@ def _build_revision_type_filters() -> List[RevisionTypeFilterOption]:
     ]
 
 
-def _build_overdue_hives(user) -> List[HiveEntry]:
+def _build_overdue_hives(user, offset: int = 0, limit: int = 50) -> List[HiveEntry]:
     now = timezone.now()
     cutoff = now - timedelta(days=7)
     hives = (
         Hive.objects.owned_by(user)
         .filter(Q(last_review_date__lt=cutoff) | Q(last_review_date__isnull=True))
         .select_related("species", "apiary")
-        .order_by(F("last_review_date").asc(nulls_first=True), "identification_number")[:50]
+        .order_by(F("last_review_date").asc(nulls_first=True), "identification_number")[
+            offset : offset + limit
+        ]
     )
+    hive_change_url = url_template("admin:apiary_hive_change")
+    apiary_change_url = url_template("admin:apiary_apiary_change")
     entries: List[HiveEntry] = []
     add_revision_base_url = reverse("admin:apiary_revision_add")
     for hive in hives:
@@ -148,11 +156,11 @@ def _build_overdue_hives(user) -> List[HiveEntry]:
         apiary = hive.apiary
         entries.append(
             HiveEntry(
-                change_url=reverse("admin:apiary_hive_change", args=[hive.pk]),
+                change_url=hive_change_url(hive.pk),
                 name=str(hive),
                 species_name=hive.species.popular_name,
                 apiary_name=apiary.name if apiary else None,
-                apiary_url=reverse("admin:apiary_apiary_change", args=[apiary.pk]) if apiary else None,
+                apiary_url=apiary_change_url(apiary.pk) if apiary else None,
                 status_display=status_display,
                 add_revision_url=f"{add_revision_base_url}?hive={hive.pk}",
             )
@@ -160,28 +168,41 @@ def _build_overdue_hives(user) -> List[HiveEntry]:
     return entries
 
 
-def _build_observation_hives(user) -> List[ObservationHiveEntry]:
+def _build_observation_hives(
+    user, offset: int = 0, limit: int = 50
+) -> List[ObservationHiveEntry]:
     hives = (
         Hive.objects.owned_by(user)
         .filter(status=Hive.HiveStatus.OBSERVATION)
         .select_related("species", "apiary")
-        .order_by("popular_name", "identification_number")
+        .annotate(
+            revision_total=F("activity_summary__revision_count"),
+            last_harvest_date=F("activity_summary__last_harvest_date"),
+        )
+        .order_by("popular_name", "identification_number")[offset : offset + limit]
     )
+    hive_change_url = url_template("admin:apiary_hive_change")
+    apiary_change_url = url_template("admin:apiary_apiary_change")
     entries: List[ObservationHiveEntry] = []
     for hive in hives:
         if hive.last_review_date:
             last_review_display, _ = _format_datetime(hive.last_review_date)
             last_review = f"Última revisão em {last_review_display}"
+            if hive.revision_total:
+                last_review += f" · {hive.revision_total} revisão(ões)"
+            if hive.last_harvest_date:
+                last_harvest_display, _ = _format_datetime(hive.last_harvest_date)
+                last_review += f" · última colheita em {last_harvest_display}"
         else:
             last_review = "Nunca revisada"
         apiary = hive.apiary
         entries.append(
             ObservationHiveEntry(
-                change_url=reverse("admin:apiary_hive_change", args=[hive.pk]),
+                change_url=hive_change_url(hive.pk),
                 name=str(hive),
                 species_name=hive.species.popular_name,
                 apiary_name=apiary.name if apiary else None,
-                apiary_url=reverse("admin:apiary_apiary_change", args=[apiary.pk]) if apiary else None,
+                apiary_url=apiary_change_url(apiary.pk) if apiary else None,
                 status_display=hive.get_status_display(),
                 last_review_display=last_review,
             )
@@ -189,14 +210,18 @@ def _build_observation_hives(user) -> List[ObservationHiveEntry]:
     return entries
 
 
-def _build_upcoming_divisions(user) -> List[UpcomingDivisionEntry]:
+def _build_upcoming_divisions(
+    user, offset: int = 0, limit: int = 50
+) -> List[UpcomingDivisionEntry]:
     today = timezone.localdate()
     hives = (
         Hive.objects.owned_by(user)
         .filter(next_division_date__isnull=False)
         .select_related("species", "apiary")
-        .order_by("next_division_date", "identification_number")
+        .order_by("next_division_date", "identification_number")[offset : offset + limit]
     )
+    hive_change_url = url_template("admin:apiary_hive_change")
+    apiary_change_url = url_template("admin:apiary_apiary_change")
     entries: List[UpcomingDivisionEntry] = []
     for hive in hives:
         next_date = hive.next_division_date
@@ -205,11 +230,11 @@ def _build_upcoming_divisions(user) -> List[UpcomingDivisionEntry]:
         apiary = hive.apiary
         entries.append(
             UpcomingDivisionEntry(
-                change_url=reverse("admin:apiary_hive_change", args=[hive.pk]),
+                change_url=hive_change_url(hive.pk),
                 name=str(hive),
                 species_name=hive.species.popular_name,
                 apiary_name=apiary.name if apiary else None,
-                apiary_url=reverse("admin:apiary_apiary_change", args=[apiary.pk]) if apiary else None,
+                apiary_url=apiary_change_url(apiary.pk) if apiary else None,
                 next_division_display=next_date.strftime("%d/%m/%Y"),
                 next_division_iso=next_date.isoformat(),
                 is_overdue=next_date < today,
@@ -219,69 +244,115 @@ def _build_upcoming_divisions(user) -> List[UpcomingDivisionEntry]:
 
 
 def _build_cards(user) -> Dict[str, Dict[str, int | str]]:
-    apiaries = Apiary.objects.owned_by(user)
-    hives = Hive.objects.owned_by(user)
-    species_count = hives.values_list("species_id", flat=True).distinct().count()
+    hive_counts = Hive.objects.owned_by(user).aggregate(
+        hives=Count("id"),
+        species=Count("species_id", distinct=True),
+    )
     return {
         "apiaries": {
-            "count": apiaries.count(),
+            "count": Apiary.objects.owned_by(user).count(),
             "url": reverse("admin:apiary_apiary_changelist"),
         },
         "hives": {
-            "count": hives.count(),
+            "count": hive_counts["hives"],
             "url": reverse("admin:apiary_hive_changelist"),
         },
         "species": {
-            "count": species_count,
+            "count": hive_counts["species"],
             "url": reverse("admin:apiary_species_changelist"),
         },
     }
 
 
+@dataclass(frozen=True)
+class DashboardPanel:
+    """A dashboard list loaded on its own, one page at a time."""
+
+    key: str
+    slug: str
+    template_name: str
+    builder: Callable[..., list]
+    page_size: int = 20
+
+
+DASHBOARD_PANELS: Dict[str, DashboardPanel] = {
+    panel.slug: panel
+    for panel in (
+        DashboardPanel(
+            "recent_revisions",
+            "revisoes-recentes",
+            "admin/dashboard_panels/recent_revisions.html",
+            _build_recent_revisions,
+            page_size=10,
+        ),
+        DashboardPanel(
+            "overdue_hives",
+            "colmeias-sem-revisao",
+            "admin/dashboard_panels/overdue_hives.html",
+            _build_overdue_hives,
+        ),
+        DashboardPanel(
+            "observation_hives",
+            "colmeias-em-observacao",
+            "admin/dashboard_panels/observation_hives.html",
+            _build_observation_hives,
+        ),
+        DashboardPanel(
+            "upcoming_divisions",
+            "proximas-divisoes",
+            "admin/dashboard_panels/upcoming_divisions.html",
+            _build_upcoming_divisions,
+        ),
+    )
+}
+
+
+def _panel_url(panel: DashboardPanel, page: int = 1) -> str:
+    url = reverse("admin:dashboard_panel", args=[panel.slug])
+    return f"{url}?pagina={page}" if page > 1 else url
+
+
 def _build_dashboard_context(user) -> Dict[str, object]:
+    # The lists are fetched by the page itself, so the index only runs the
+    # card counts whatever the number of hives.
     return {
         "cards": _build_cards(user),
-        "recent_revisions": _build_recent_revisions(user),
-        "revision_type_filters": _build_revision_type_filters(),
-        "overdue_hives": _build_overdue_hives(user),
-        "observation_hives": _build_observation_hives(user),
-        "upcoming_divisions": _build_upcoming_divisions(user),
+        "panel_urls": {panel.key: _panel_url(panel) for panel in DASHBOARD_PANELS.values()},
         "create_revision_url": reverse("admin:apiary_revision_add"),
     }
 
 
-def _delete_user_owned_data(user) -> None:
-    attachments_qs = RevisionAttachment.objects.filter(
-        revision__hive__owner=user
+@staff_member_required
+def dashboard_panel_view(request: HttpRequest, panel: str) -> HttpResponse:
+    config = DASHBOARD_PANELS.get(panel)
+    if config is None:
+        raise Http404("Painel não encontrado.")
+    try:
+        page = max(int(request.GET.get("pagina") or 1), 1)
+    except ValueError:
+        page = 1
+
+    entries = config.builder(
+        request.user, offset=(page - 1) * config.page_size, limit=config.page_size + 1
     )
-    for attachment in attachments_qs.iterator(chunk_size=100):
-        if attachment.file:
-            attachment.file.delete(save=False)
-        attachment.delete()
-
-    revisions_qs = Revision.objects.filter(hive__owner=user)
-    for revision in revisions_qs.iterator(chunk_size=100):
-        revision.delete()
-
-    hives_qs = Hive.objects.filter(owner=user)
-    for hive in hives_qs.iterator(chunk_size=50):
-        if hive.photo:
-            hive.photo.delete(save=False)
-        hive.delete()
-
-    Apiary.objects.filter(owner=user).delete()
-    CreatorNetworkEntry.objects.filter(user=user).delete()
+    context = {
+        "entries": entries[: config.page_size],
+        "page": page,
+        "previous_url": _panel_url(config, page - 1) if page > 1 else None,
+        "next_url": _panel_url(config, page + 1) if len(entries) > config.page_size else None,
+    }
+    if config.key == "recent_revisions":
+        context["revision_type_filters"] = _build_revision_type_filters()
+    return TemplateResponse(request, config.template_name, context)
 
 
 @staff_member_required
 def delete_personal_data_view(request: HttpRequest) -> HttpResponse:
     if request.method == "POST":
-        user = request.user
-        with transaction.atomic():
-            _delete_user_owned_data(user)
-            user.delete()
+        # The account is locked right away; the data goes in the background.
+        job = PersonalDataDeletionJob.objects.request(request.user)
         logout(request)
-        return redirect(f"{reverse('admin:login')}?deleted=1")
+        return redirect("privacy-deletion-status", token=job.token)
 
     context = {
         **admin.site.each_context(request),
@@ -331,7 +402,12 @@ if not getattr(admin.site, "_colmeia_delete_data_url", False):
                 "excluir-meus-dados/",
                 admin.site.admin_view(delete_personal_data_view),
                 name="delete_personal_data",
-            )
+            ),
+            path(
+                "painel/<slug:panel>/",
+                admin.site.admin_view(dashboard_panel_view),
+                name="dashboard_panel",
+            ),
         ]
         return custom_urls + urls
 
@@ -58,6 +58,38 @@ else:
         }
     }
 
+# ===== Cache =====
+# O cache precisa ser compartilhado entre os workers do gunicorn; em PROD, sem
+# CACHE_DIR, usa o diretório "cache" do projeto. O cache em memória local (DEV)
+# desativa o cache dos dashboards.
+CACHE_DIR = os.getenv('CACHE_DIR', '').strip()
+if PRODUCTION and not CACHE_DIR:
+    CACHE_DIR = str(BASE_DIR / 'cache')
+if CACHE_DIR:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': CACHE_DIR,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'colmeia-online',
+        }
+    }
+
+# Tempo (segundos) que os resultados dos dashboards de produção ficam em cache
+DASHBOARD_CACHE_TIMEOUT = int(os.getenv('DASHBOARD_CACHE_TIMEOUT', '300'))
+
+# Converte as fotos enviadas para WebP em segundo plano (requer `manage.py run_image_worker`)
+IMAGE_CONVERSION_ASYNC = strtobool(os.getenv('IMAGE_CONVERSION_ASYNC', 'False'))
+
+# Limites para aceitar uma imagem: total de pixels e memória (MB) usada para decodificá-la
+IMAGE_MAX_PIXELS = int(os.getenv('IMAGE_MAX_PIXELS', '50000000'))
+IMAGE_MAX_DECODE_MB = int(os.getenv('IMAGE_MAX_DECODE_MB', '200'))
+
 # Application definition
 INSTALLED_APPS = [
     "admin_menu.apps.AdminMenuConfig",
@@ -85,6 +117,15 @@ if PRODUCTION:
     CSRF_COOKIE_SECURE    = False
     SESSION_COOKIE_SAMESITE = "Lax"
 
+# Permissões dos usuários ficam em cache entre requisições (ver accounts/backends.py).
+# O ModelBackend continua listado para que as sessões abertas com ele sigam
+# válidas; ele reaproveita as permissões já carregadas pelo backend com cache.
+AUTHENTICATION_BACKENDS = [
+    "accounts.backends.CachedPermissionBackend",
+    "django.contrib.auth.backends.ModelBackend",
+]
+PERMISSION_CACHE_TIMEOUT = int(os.getenv('PERMISSION_CACHE_TIMEOUT', '3600'))
+
 X_FRAME_OPTIONS = "SAMEORIGIN"
 SILENCED_SYSTEM_CHECKS = ["security.W019"]
 
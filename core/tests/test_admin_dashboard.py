@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apiary.models import Apiary, Hive, Species
+from core.admin_dashboard import DASHBOARD_PANELS, _build_cards
+
+
+class AdminDashboardCardsTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(
+            username="keeper",
+            password="testpass123",
+            email="keeper@example.com",
+            is_staff=True,
+        )
+        other_user = User.objects.create_user(
+            username="neighbour",
+            password="testpass123",
+            email="neighbour@example.com",
+            is_staff=True,
+        )
+        species = [
+            Species.objects.create(
+                group=Species.SpeciesGroup.STINGLESS,
+                scientific_name=f"Melipona cards {index}",
+                popular_name=f"Espécie {index}",
+            )
+            for index in range(3)
+        ]
+        apiary = Apiary.objects.create(name="Apiário Cards", owner=self.user)
+        Apiary.objects.create(name="Apiário Vazio", owner=self.user)
+        Apiary.objects.create(name="Apiário Vizinho", owner=other_user)
+        for index in range(4):
+            Hive.objects.create(
+                owner=self.user,
+                popular_name=f"Colmeia {index}",
+                species=species[index % 2],
+                apiary=apiary,
+                acquisition_method=Hive.AcquisitionMethod.DIVISION,
+            )
+        Hive.objects.create(
+            owner=other_user,
+            popular_name="Colmeia Vizinha",
+            species=species[2],
+            acquisition_method=Hive.AcquisitionMethod.DIVISION,
+        )
+
+    def test_cards_counts_use_two_queries(self):
+        with self.assertNumQueries(2):
+            cards = _build_cards(self.user)
+        self.assertEqual(cards["apiaries"]["count"], 2)
+        self.assertEqual(cards["hives"]["count"], 4)
+        self.assertEqual(cards["species"]["count"], 2)
+
+    def test_superuser_cards_cover_all_owners(self):
+        superuser = get_user_model().objects.create_superuser(
+            username="root", password="testpass123", email="root@example.com"
+        )
+        with self.assertNumQueries(2):
+            cards = _build_cards(superuser)
+        self.assertEqual(cards["apiaries"]["count"], 3)
+        self.assertEqual(cards["hives"]["count"], 5)
+        self.assertEqual(cards["species"]["count"], 3)
+
+
+class AdminDashboardPanelTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(
+            username="panels", password="testpass123", is_staff=True
+        )
+        self.other_user = User.objects.create_user(
+            username="other-panels", password="testpass123", is_staff=True
+        )
+        self.species = Species.objects.create(
+            group=Species.SpeciesGroup.STINGLESS,
+            scientific_name="Melipona panels",
+            popular_name="Espécie Painel",
+        )
+        self.client.force_login(self.user)
+
+    def _observation_hives(self, owner, count):
+        for index in range(count):
+            Hive.objects.create(
+                owner=owner,
+                popular_name=f"Observada {owner.username} {index:02d}",
+                species=self.species,
+                status=Hive.HiveStatus.OBSERVATION,
+                acquisition_method=Hive.AcquisitionMethod.DIVISION,
+            )
+
+    def _panel(self, slug, **params):
+        return self.client.get(reverse("admin:dashboard_panel", args=[slug]), params)
+
+    def test_index_renders_placeholders_only(self):
+        self._observation_hives(self.user, 3)
+        self.client.get(reverse("admin:index"))
+        with CaptureQueriesContext(connection) as few_hives:
+            response = self.client.get(reverse("admin:index"))
+        self.assertNotContains(response, "Observada")
+        self.assertContains(response, reverse("admin:dashboard_panel", args=["colmeias-em-observacao"]))
+
+        self._observation_hives(self.user, 30)
+        with CaptureQueriesContext(connection) as many_hives:
+            self.client.get(reverse("admin:index"))
+        self.assertEqual(len(many_hives), len(few_hives))
+
+    def test_panels_are_paginated_and_scoped_to_owner(self):
+        self._observation_hives(self.user, 25)
+        self._observation_hives(self.other_user, 2)
+
+        first = self._panel("colmeias-em-observacao")
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(len(first.context["entries"]), 20)
+        self.assertIsNotNone(first.context["next_url"])
+        self.assertIsNone(first.context["previous_url"])
+
+        second = self._panel("colmeias-em-observacao", pagina=2)
+        self.assertEqual(len(second.context["entries"]), 5)
+        self.assertIsNone(second.context["next_url"])
+        self.assertNotContains(second, "Observada other-panels")
+
+    def test_every_panel_renders(self):
+        self._observation_hives(self.user, 1)
+        Hive.objects.filter(owner=self.user).update(next_division_date="2020-01-01")
+        for slug in DASHBOARD_PANELS:
+            with self.subTest(slug=slug):
+                response = self._panel(slug)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotContains(response, "<html")
+
+    def test_unknown_panel_returns_404(self):
+        self.assertEqual(self._panel("inexistente").status_code, 404)
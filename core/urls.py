@@ -4,8 +4,13 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.views.generic import TemplateView
 from core import admin_dashboard  # noqa: F401  # Importa para aplicar o dashboard customizado
-from apiary.views import hive_history, hive_production_detail, production_dashboard
-from core.views import PrivacyPolicyView, DeleteDataRedirectView
+from apiary.views import (
+    hive_autocomplete,
+    hive_history,
+    hive_production_detail,
+    production_dashboard,
+)
+from core.views import PrivacyPolicyView, DeleteDataRedirectView, DeletionStatusView
 
 
 urlpatterns = [
@@ -25,6 +30,11 @@ urlpatterns = [
         hive_history,
         name="hive-history",
     ),
+    path(
+        "admin/dashboard/colmeias/buscar/",
+        hive_autocomplete,
+        name="hive-autocomplete",
+    ),
     path(
         "politica-de-privacidade/",
         PrivacyPolicyView.as_view(),
@@ -35,6 +45,11 @@ urlpatterns = [
         DeleteDataRedirectView.as_view(),
         name="privacy-delete-entry",
     ),
+    path(
+        "politica-de-privacidade/exclusao/<uuid:token>/",
+        DeletionStatusView.as_view(),
+        name="privacy-deletion-status",
+    ),
     path('admin/', admin.site.urls),
     path('accounts/', include('accounts.urls', namespace='accounts')),
 ]
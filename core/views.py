@@ -2,11 +2,13 @@ from __future__ import annotations
 
 from urllib.parse import urlencode
 
-from django.shortcuts import redirect
+from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse
 from django.views import View
 from django.views.generic import TemplateView
 
+from apiary.models import PersonalDataDeletionJob
+
 
 class PrivacyPolicyView(TemplateView):
     template_name = "privacy_policy.html"
@@ -27,3 +29,17 @@ class DeleteDataRedirectView(View):
         login_url = reverse("admin:login")
         query = urlencode({"next": target_url})
         return redirect(f"{login_url}?{query}")
+
+
+class DeletionStatusView(TemplateView):
+    """Public progress of a deletion request, reachable only through its token."""
+
+    template_name = "personal_data_deletion_status.html"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        job = get_object_or_404(PersonalDataDeletionJob, token=kwargs["token"])
+        context["job"] = job
+        context["is_done"] = job.status == PersonalDataDeletionJob.Status.DONE
+        context["is_failed"] = job.status == PersonalDataDeletionJob.Status.FAILED
+        return context